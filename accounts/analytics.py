@@ -0,0 +1,58 @@
+"""
+Dashboard metrics computed with conditional aggregation.
+
+Each table is read once: every metric of a table is a ``COUNT`` with an
+optional ``FILTER``/``CASE`` condition in the same ``SELECT``, either
+aggregated for one college or grouped by ``college_id`` for all of them.
+"""
+from django.db.models import Count, Q
+
+from .models import Batch, Student, Faculty, Subject, QuestionBank
+
+
+# (model, {metric: aggregate}) for every table the dashboard reads
+COLLEGE_METRICS = (
+    (Student, {
+        'total_students': Count('id'),
+        'active_students': Count('id', filter=Q(is_active=True)),
+    }),
+    (Faculty, {
+        'total_faculty': Count('id'),
+        'active_faculty': Count('id', filter=Q(status='active')),
+    }),
+    (Batch, {'total_batches': Count('id')}),
+    (Subject, {'total_subjects': Count('id')}),
+    (QuestionBank, {'total_questions': Count('id')}),
+)
+
+# Metric names in the order the dashboard has always returned them
+METRIC_NAMES = (
+    'total_students', 'total_faculty', 'total_batches', 'total_subjects',
+    'total_questions', 'active_students', 'active_faculty',
+)
+
+
+def college_metrics(college_id):
+    """Return the dashboard metrics of one college, one query per table."""
+    metrics = {}
+    for model, aggregates in COLLEGE_METRICS:
+        metrics.update(model.objects.filter(college_id=college_id).aggregate(**aggregates))
+    return {name: metrics[name] for name in METRIC_NAMES}
+
+
+def metrics_by_college(college_ids):
+    """
+    Return ``{college_id: metrics}`` for every id in ``college_ids``, with one
+    ``GROUP BY college_id`` query per table. Colleges without rows in a table
+    get zeros.
+    """
+    metrics = {college_id: dict.fromkeys(METRIC_NAMES, 0) for college_id in college_ids}
+    for model, aggregates in COLLEGE_METRICS:
+        rows = model.objects.filter(college_id__in=college_ids).values('college_id').annotate(
+            **aggregates
+        ).order_by()
+        for row in rows:
+            college_metrics = metrics.get(row.pop('college_id'))
+            if college_metrics is not None:
+                college_metrics.update(row)
+    return metrics
@@ -0,0 +1,722 @@
+"""
+Set-based CSV importers used by the bulk upload endpoints.
+
+Rows are validated in memory, every lookup the file needs is resolved with a
+handful of queries, and the surviving rows are written with ``bulk_create`` in
+fixed-size chunks, each in its own short transaction.
+"""
+import datetime
+from collections import defaultdict, deque
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator, validate_email
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Max
+
+from .cache import bump_curriculum_version
+from .counters import record_created
+from .models import User, Batch, Student, Faculty, Subject, Module, QuestionBank, ActivationToken
+from .passwords import PasswordHasher
+
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class RowError(Exception):
+    """Raised while cleaning a row that cannot be imported."""
+
+
+class ImportResult:
+    """
+    Running totals of an import. ``created`` holds ``(row number, id)``
+    pairs and ``errors`` ``(row number, message)`` pairs; callers that stream
+    them elsewhere may clear both lists, the counts are kept separately.
+    """
+
+    def __init__(self):
+        self.total_rows = 0
+        self.created_count = 0
+        self.failed_count = 0
+        self.created = []
+        self.errors = []
+
+    def add_created(self, row_num, pk):
+        self.created_count += 1
+        self.created.append((row_num, pk))
+
+    def add_error(self, row_num, message):
+        self.failed_count += 1
+        self.errors.append((row_num, str(message)))
+
+    @property
+    def error_messages(self):
+        return [f"Row {row_num}: {message}" for row_num, message in self.errors]
+
+
+def chunked(iterable, size):
+    """Yield lists of at most ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _value(row, column):
+    value = row.get(column)
+    return value.strip() if isinstance(value, str) else (value or '')
+
+
+def _parse_date(value, column):
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise RowError(f"{column} must be a date in YYYY-MM-DD format")
+
+
+def _parse_int(value, column, default=None):
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise RowError(f"{column} must be a number")
+
+
+def _check_lengths(data, model, fields):
+    """
+    Reject values longer than their model field allows: MySQL in strict mode
+    refuses them with ``DataError`` instead of truncating. ``fields`` maps
+    keys of ``data`` to field names of ``model``.
+    """
+    for key, field_name in fields.items():
+        value = data.get(key)
+        max_length = model._meta.get_field(field_name).max_length
+        if value and len(value) > max_length:
+            raise RowError(f"{field_name} must be at most {max_length} characters")
+
+
+def _parse_choice(value, column, choices, default=None):
+    if not value:
+        return default
+    value = value.lower()
+    if value not in dict(choices):
+        raise RowError(f"{column} must be one of: {', '.join(dict(choices))}")
+    return value
+
+
+class BulkImporter:
+    """
+    Base class for importing CSV dict rows into one college.
+
+    Subclasses implement ``clean_row`` and ``write_chunk`` and may override
+    ``prepare`` to load per-file lookups and ``check_existing`` to reject
+    rows that clash with the database.
+    """
+    required_columns = ()
+    template_columns = ()
+    # (model, {data key: field name}) pairs whose max_length is enforced per row
+    length_checks = ()
+
+    def __init__(self, college, chunk_size=DEFAULT_CHUNK_SIZE, uploaded_by=None):
+        self.college = college
+        self.chunk_size = chunk_size
+        self.uploaded_by = uploaded_by
+
+    @classmethod
+    def from_job(cls, job):
+        return cls(job.college, uploaded_by=job.uploaded_by)
+
+    @classmethod
+    def get_required_columns(cls, **options):
+        return cls.required_columns
+
+    def run(self, rows, start=2, on_chunk=None, dry_run=False):
+        """
+        Import ``rows`` and return an ``ImportResult``. ``start`` is the line
+        number of the first data row, used in error messages. ``on_chunk`` is
+        called with the running result after every chunk, inside the chunk's
+        transaction. With ``dry_run``
+        every row is validated against the file and the database but nothing
+        is written.
+        """
+        return self.process(enumerate(rows, start=start), self.clean_row, on_chunk, dry_run)
+
+    def run_validated(self, items):
+        """
+        Import ``(index, validated_data)`` pairs that have already been
+        through a registration serializer, checking uniqueness for the whole
+        batch at once. Errors and created ids are keyed by index.
+        """
+        return self.process(items, self.clean_validated)
+
+    def process(self, items, clean, on_chunk=None, dry_run=False):
+        result = ImportResult()
+        self.prepare()
+
+        for chunk in chunked(items, self.chunk_size):
+            result.total_rows += len(chunk)
+            cleaned = []
+            for row_num, item in chunk:
+                try:
+                    cleaned.append((row_num, clean(item)))
+                except RowError as e:
+                    result.add_error(row_num, e)
+
+            # Progress is recorded in the chunk's transaction, so a job resumed
+            # after a crash neither repeats nor skips rows
+            with transaction.atomic():
+                cleaned = self.check_existing(cleaned, result)
+                if cleaned and not dry_run:
+                    self.write_chunk(cleaned, result)
+                if on_chunk:
+                    on_chunk(result)
+
+        return result
+
+    def prepare(self):
+        pass
+
+    def clean_row(self, row):
+        raise NotImplementedError
+
+    def clean_validated(self, validated_data):
+        raise NotImplementedError
+
+    def check_existing(self, cleaned, result):
+        return cleaned
+
+    def write_chunk(self, cleaned, result):
+        raise NotImplementedError
+
+    def row_required_columns(self):
+        return self.get_required_columns()
+
+    def check_required(self, row):
+        for column in self.row_required_columns():
+            if not _value(row, column):
+                raise RowError(f"{column} is required")
+
+    def check_lengths(self, data):
+        for model, fields in self.length_checks:
+            _check_lengths(data, model, fields)
+        return data
+
+
+class AccountImporter(BulkImporter):
+    """
+    Base class for importers that create a ``User`` plus a profile per row.
+
+    With ``password_mode='invite'`` the password column is ignored: accounts
+    get an unusable password and an ``ActivationToken`` row instead, so no
+    hashing is done at all. The token itself is issued later, by the pending
+    activations download.
+    """
+    role = None
+    profile_model = None
+    # (column, label) pairs that must be unique in the file and the database
+    unique_columns = (('username', 'username'), ('email', 'email'))
+    length_checks = ((User, {
+        'username': 'username', 'email': 'email', 'first_name': 'first_name',
+        'last_name': 'last_name', 'user_phone_number': 'phone_number',
+    }),)
+
+    def __init__(self, college, chunk_size=DEFAULT_CHUNK_SIZE, uploaded_by=None,
+                 password_mode='password', hash_workers=None, hasher=None):
+        super().__init__(college, chunk_size, uploaded_by)
+        self.password_mode = password_mode
+        self.hasher = hasher or PasswordHasher(workers=hash_workers)
+        self.seen = {column: set() for column, _ in self.unique_columns}
+
+    @classmethod
+    def from_job(cls, job):
+        return cls(job.college, uploaded_by=job.uploaded_by, password_mode=job.password_mode)
+
+    @classmethod
+    def get_required_columns(cls, password_mode='password', **options):
+        if password_mode == 'invite':
+            return cls.required_columns
+        return cls.required_columns + ('password',)
+
+    def row_required_columns(self):
+        return self.get_required_columns(password_mode=self.password_mode)
+
+    def process(self, items, clean, on_chunk=None, dry_run=False):
+        with self.hasher:
+            return super().process(items, clean, on_chunk, dry_run)
+
+    def clean_account(self, row):
+        """
+        Clean the user columns of ``row``.
+        """
+        self.check_required(row)
+
+        email = User.objects.normalize_email(_value(row, 'email'))
+        try:
+            validate_email(email)
+        except ValidationError:
+            raise RowError("Enter a valid email address.")
+
+        return {
+            'username': User.normalize_username(_value(row, 'username')),
+            'email': email,
+            'first_name': _value(row, 'first_name'),
+            'last_name': _value(row, 'last_name'),
+            'password': _value(row, 'password'),
+        }
+
+    def clean_validated_account(self, validated_data):
+        """
+        Map the user fields of a registration serializer's validated data.
+        """
+        return {
+            'username': User.normalize_username(validated_data['username']),
+            'email': User.objects.normalize_email(validated_data['email']),
+            'first_name': validated_data['first_name'],
+            'last_name': validated_data['last_name'],
+            'password': validated_data['password'],
+        }
+
+    def check_duplicates(self, data):
+        """
+        Reject ``data`` if a value is too long for its column or a unique
+        column repeats a value seen earlier in the file or batch, otherwise
+        remember its values and return it.
+        """
+        self.check_lengths(data)
+        for column, label in self.unique_columns:
+            if data[column] in self.seen[column]:
+                raise RowError(f"Duplicate {label} '{data[column]}'")
+        for column, _ in self.unique_columns:
+            self.seen[column].add(data[column])
+        return data
+
+    def existing_values(self, cleaned):
+        """
+        Return ``(column, taken values, message)`` triples for the chunk,
+        using one ``IN`` query per unique column.
+        """
+        return [
+            ('username', set(User.objects.filter(
+                username__in=[data['username'] for _, data in cleaned]
+            ).values_list('username', flat=True)), "A user with this username already exists."),
+            ('email', set(User.objects.filter(
+                email__in=[data['email'] for _, data in cleaned]
+            ).values_list('email', flat=True)), "A user with this email already exists."),
+        ]
+
+    def check_existing(self, cleaned, result):
+        """
+        Drop rows that clash with existing users or profiles.
+        """
+        if not cleaned:
+            return cleaned
+
+        checks = self.existing_values(cleaned)
+        remaining = []
+        for row_num, data in cleaned:
+            for column, taken, message in checks:
+                if data[column] in taken:
+                    result.add_error(row_num, message)
+                    break
+            else:
+                remaining.append((row_num, data))
+        return remaining
+
+    def hash_passwords(self, cleaned):
+        """
+        Replace each row's raw password with its encoded hash, hashing the
+        whole chunk at once so the work can be spread over several cores.
+        """
+        if self.password_mode == 'invite':
+            for _, data in cleaned:
+                data['password'] = make_password(None)
+            return
+
+        hashed = self.hasher.hash_many([data['password'] for _, data in cleaned])
+        for (_, data), password in zip(cleaned, hashed):
+            data['password'] = password
+
+    def build_user(self, data):
+        return User(
+            username=data['username'],
+            email=data['email'],
+            first_name=data['first_name'],
+            last_name=data['last_name'],
+            password=data['password'],
+            phone_number=data.get('user_phone_number') or None,
+            role=self.role,
+        )
+
+    def build_profile(self, data, user_id):
+        raise NotImplementedError
+
+    def after_create(self, cleaned, profile_ids):
+        """
+        Hook for writing related rows once the chunk's profiles exist.
+        ``profile_ids`` maps each row's username to its new profile id.
+        """
+
+    def write_chunk(self, cleaned, result):
+        self.hash_passwords(cleaned)
+        users = [self.build_user(data) for _, data in cleaned]
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                # MySQL does not return primary keys from bulk inserts.
+                user_ids = dict(User.objects.filter(
+                    username__in=[user.username for user in users]
+                ).values_list('username', 'id'))
+                if self.password_mode == 'invite':
+                    # Issued when the admin downloads the pending activations
+                    ActivationToken.objects.bulk_create([
+                        ActivationToken(user_id=user_id) for user_id in user_ids.values()
+                    ])
+                profiles = [self.build_profile(data, user_ids[data['username']]) for _, data in cleaned]
+                self.profile_model.objects.bulk_create(profiles)
+                # bulk_create sends no post_save, so count the new rows here
+                record_created(profiles)
+                usernames = {user_id: username for username, user_id in user_ids.items()}
+                profile_ids = {
+                    usernames[user_id]: profile_id
+                    for user_id, profile_id in self.profile_model.objects.filter(
+                        user_id__in=user_ids.values()
+                    ).values_list('user_id', 'id')
+                }
+                self.after_create(cleaned, profile_ids)
+        except DatabaseError:
+            # Another request inserted a clashing row since check_existing ran,
+            # or the database rejected a value; fall back to row-by-row inserts
+            # so the error lands on the right row.
+            for row_num, data in cleaned:
+                self.write_row(row_num, data, result)
+            return
+
+        for row_num, data in cleaned:
+            result.add_created(row_num, profile_ids[data['username']])
+
+    def write_row(self, row_num, data, result):
+        try:
+            with transaction.atomic():
+                user = self.build_user(data)
+                user.save()
+                if self.password_mode == 'invite':
+                    ActivationToken.objects.create(user=user)
+                profile = self.build_profile(data, user.pk)
+                profile.save()
+                self.after_create([(row_num, data)], {user.username: profile.pk})
+        except DatabaseError as e:
+            result.add_error(row_num, e)
+            return
+
+        result.add_created(row_num, profile.pk)
+
+
+class StudentImporter(AccountImporter):
+    """
+    Import students for one college from an iterable of CSV dict rows
+    """
+    role = 'student'
+    profile_model = Student
+    required_columns = ('username', 'email', 'first_name', 'last_name', 'roll_no')
+    unique_columns = AccountImporter.unique_columns + (('roll_no', 'roll number'),)
+    length_checks = AccountImporter.length_checks + ((Student, {
+        'roll_no': 'roll_no', 'phone_number': 'phone_number', 'emergency_contact': 'emergency_contact',
+        'emergency_contact_name': 'emergency_contact_name',
+    }),)
+    template_columns = (
+        'username', 'email', 'first_name', 'last_name', 'password',
+        'roll_no', 'phone_number', 'date_of_birth', 'address',
+        'emergency_contact', 'emergency_contact_name', 'admission_date', 'batch_id'
+    )
+
+    def prepare(self):
+        self.batch_ids = set(
+            Batch.objects.filter(college=self.college).values_list('id', flat=True)
+        )
+
+    def clean_row(self, row):
+        data = self.clean_account(row)
+
+        batch_id = _parse_int(_value(row, 'batch_id'), 'batch_id')
+        if batch_id is not None and batch_id not in self.batch_ids:
+            raise RowError(f"Batch {batch_id} does not exist in your college")
+
+        data.update({
+            'roll_no': _value(row, 'roll_no'),
+            'batch_id': batch_id,
+            'phone_number': _value(row, 'phone_number'),
+            'date_of_birth': _parse_date(_value(row, 'date_of_birth'), 'date_of_birth'),
+            'address': _value(row, 'address'),
+            'emergency_contact': _value(row, 'emergency_contact'),
+            'emergency_contact_name': _value(row, 'emergency_contact_name'),
+            'admission_date': _parse_date(_value(row, 'admission_date'), 'admission_date'),
+        })
+        return self.check_duplicates(data)
+
+    def clean_validated(self, validated_data):
+        data = self.clean_validated_account(validated_data)
+
+        batch_id = validated_data.get('batch_id')
+        if batch_id is not None and batch_id not in self.batch_ids:
+            raise RowError(f"Batch {batch_id} does not exist in your college")
+
+        data.update({
+            'roll_no': validated_data['roll_no'],
+            'batch_id': batch_id,
+            'phone_number': validated_data.get('phone_number') or '',
+            'date_of_birth': validated_data.get('date_of_birth'),
+            'address': validated_data.get('address') or '',
+            'emergency_contact': validated_data.get('emergency_contact') or '',
+            'emergency_contact_name': validated_data.get('emergency_contact_name') or '',
+            'admission_date': validated_data.get('admission_date'),
+        })
+        return self.check_duplicates(data)
+
+    def existing_values(self, cleaned):
+        return super().existing_values(cleaned) + [
+            ('roll_no', set(Student.objects.filter(
+                roll_no__in=[data['roll_no'] for _, data in cleaned]
+            ).values_list('roll_no', flat=True)), "A student with this roll number already exists."),
+        ]
+
+    def build_profile(self, data, user_id):
+        return Student(
+            user_id=user_id,
+            college=self.college,
+            batch_id=data['batch_id'],
+            roll_no=data['roll_no'],
+            phone_number=data['phone_number'],
+            date_of_birth=data['date_of_birth'],
+            address=data['address'],
+            emergency_contact=data['emergency_contact'],
+            emergency_contact_name=data['emergency_contact_name'],
+            admission_date=data['admission_date'],
+        )
+
+
+class FacultyImporter(AccountImporter):
+    """
+    Import faculty for one college. The ``subjects`` column holds subject
+    names separated by semicolons.
+    """
+    role = 'faculty'
+    profile_model = Faculty
+    length_checks = AccountImporter.length_checks + ((Faculty, {
+        'specialization': 'specialization', 'department': 'department',
+    }),)
+    required_columns = ('username', 'email', 'first_name', 'last_name', 'designation')
+    template_columns = (
+        'username', 'email', 'first_name', 'last_name', 'password', 'phone_number',
+        'designation', 'status', 'education_details', 'experience_years',
+        'specialization', 'department', 'subjects'
+    )
+
+    def prepare(self):
+        self.subject_ids = {
+            name.lower(): subject_id
+            for subject_id, name in Subject.objects.filter(college=self.college).values_list('id', 'name')
+        }
+
+    def clean_row(self, row):
+        data = self.clean_account(row)
+
+        subject_ids = []
+        for name in _value(row, 'subjects').split(';'):
+            name = name.strip()
+            if not name:
+                continue
+            if name.lower() not in self.subject_ids:
+                raise RowError(f"Subject '{name}' does not exist in your college")
+            subject_ids.append(self.subject_ids[name.lower()])
+
+        experience_years = _parse_int(_value(row, 'experience_years'), 'experience_years', default=0)
+        if experience_years < 0:
+            raise RowError("experience_years must not be negative")
+
+        data.update({
+            'user_phone_number': _value(row, 'phone_number'),
+            'designation': _parse_choice(_value(row, 'designation'), 'designation', Faculty.DESIGNATION_CHOICES),
+            'status': _parse_choice(_value(row, 'status'), 'status', Faculty.STATUS_CHOICES, default='active'),
+            'education_details': _value(row, 'education_details'),
+            'experience_years': experience_years,
+            'specialization': _value(row, 'specialization'),
+            'department': _value(row, 'department'),
+            'subject_ids': list(dict.fromkeys(subject_ids)),
+        })
+        return self.check_duplicates(data)
+
+    def clean_validated(self, validated_data):
+        data = self.clean_validated_account(validated_data)
+
+        # Like FacultyRegistrationSerializer, ignore subjects of other colleges
+        college_subject_ids = set(self.subject_ids.values())
+        subject_ids = [
+            subject_id for subject_id in validated_data.get('subject_ids', [])
+            if subject_id in college_subject_ids
+        ]
+
+        data.update({
+            'user_phone_number': validated_data.get('phone_number') or '',
+            'designation': validated_data['designation'],
+            'status': validated_data.get('status', 'active'),
+            'education_details': validated_data.get('education_details') or '',
+            'experience_years': validated_data.get('experience_years', 0),
+            'specialization': validated_data.get('specialization') or '',
+            'department': validated_data.get('department') or '',
+            'subject_ids': list(dict.fromkeys(subject_ids)),
+        })
+        return self.check_duplicates(data)
+
+    def build_profile(self, data, user_id):
+        return Faculty(
+            user_id=user_id,
+            college=self.college,
+            designation=data['designation'],
+            status=data['status'],
+            education_details=data['education_details'],
+            experience_years=data['experience_years'],
+            specialization=data['specialization'],
+            department=data['department'],
+        )
+
+    def after_create(self, cleaned, profile_ids):
+        FacultySubject = Faculty.subjects.through
+        FacultySubject.objects.bulk_create([
+            FacultySubject(faculty_id=profile_ids[data['username']], subject_id=subject_id)
+            for _, data in cleaned
+            for subject_id in data['subject_ids']
+        ])
+
+
+class QuestionImporter(BulkImporter):
+    """
+    Import question bank entries for one college. Subjects and modules are
+    given by name and resolved to ids once per file.
+    """
+    required_columns = ('subject', 'question_text')
+    template_columns = (
+        'subject', 'module', 'question_text', 'question_type', 'difficulty',
+        'option_a', 'option_b', 'option_c', 'option_d', 'correct_answer',
+        'explanation', 'video_url', 'image_url'
+    )
+    validate_url = URLValidator()
+    length_checks = ((QuestionBank, {'video_url': 'video_url', 'image_url': 'image_url'}),)
+
+    def prepare(self):
+        self.subject_ids = {
+            name.lower(): subject_id
+            for subject_id, name in Subject.objects.filter(college=self.college).values_list('id', 'name')
+        }
+        self.module_ids = {
+            (subject_id, name.lower()): module_id
+            for module_id, subject_id, name in Module.objects.filter(
+                subject__college=self.college
+            ).values_list('id', 'subject_id', 'name')
+        }
+
+    def clean_row(self, row):
+        self.check_required(row)
+
+        subject_name = _value(row, 'subject')
+        subject_id = self.subject_ids.get(subject_name.lower())
+        if subject_id is None:
+            raise RowError(f"Subject '{subject_name}' does not exist in your college")
+
+        module_id = None
+        module_name = _value(row, 'module')
+        if module_name:
+            module_id = self.module_ids.get((subject_id, module_name.lower()))
+            if module_id is None:
+                raise RowError(f"Module '{module_name}' does not exist in subject '{subject_name}'")
+
+        correct_answer = _value(row, 'correct_answer').upper() or None
+        if correct_answer and correct_answer not in ('A', 'B', 'C', 'D'):
+            raise RowError("correct_answer must be one of: A, B, C, D")
+
+        data = {
+            'subject_id': subject_id,
+            'module_id': module_id,
+            'question_text': _value(row, 'question_text'),
+            'question_type': _parse_choice(
+                _value(row, 'question_type'), 'question_type', QuestionBank.QUESTION_TYPE_CHOICES, default='mcq'
+            ),
+            'difficulty': _parse_choice(
+                _value(row, 'difficulty'), 'difficulty', QuestionBank.DIFFICULTY_CHOICES, default='medium'
+            ),
+            'option_a': _value(row, 'option_a') or None,
+            'option_b': _value(row, 'option_b') or None,
+            'option_c': _value(row, 'option_c') or None,
+            'option_d': _value(row, 'option_d') or None,
+            'correct_answer': correct_answer,
+            'explanation': _value(row, 'explanation') or None,
+        }
+        for column in ('video_url', 'image_url'):
+            data[column] = _value(row, column) or None
+            if data[column]:
+                try:
+                    self.validate_url(data[column])
+                except ValidationError:
+                    raise RowError(f"{column} must be a valid URL")
+        return self.check_lengths(data)
+
+    def build_question(self, data):
+        return QuestionBank(college=self.college, created_by=self.uploaded_by, **data)
+
+    def write_chunk(self, cleaned, result):
+        try:
+            with transaction.atomic():
+                questions = [self.build_question(data) for _, data in cleaned]
+                if connection.features.can_return_rows_from_bulk_insert:
+                    QuestionBank.objects.bulk_create(questions)
+                else:
+                    last_id = QuestionBank.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+                    QuestionBank.objects.bulk_create(questions)
+                    self.fetch_ids(questions, last_id)
+                # bulk_create sends no post_save, so count the new rows and
+                # invalidate the module lists here
+                record_created(questions)
+        except DatabaseError:
+            # The database rejected a value; insert row by row so only that
+            # row fails
+            for row_num, data in cleaned:
+                self.write_row(row_num, data, result)
+            return
+
+        bump_curriculum_version(self.college.id)
+        for (row_num, _), question in zip(cleaned, questions):
+            result.add_created(row_num, question.pk)
+
+    def fetch_ids(self, questions, last_id):
+        """
+        Set the ids of ``questions`` just inserted on a backend whose bulk
+        inserts return none (MySQL): rows of the college above ``last_id``
+        are matched on subject, module and text, in insertion order.
+        """
+        ids = defaultdict(deque)
+        inserted = QuestionBank.objects.filter(
+            college=self.college, id__gt=last_id,
+            question_text__in={question.question_text for question in questions},
+        ).order_by('id').values_list('id', 'subject_id', 'module_id', 'question_text')
+        for pk, *key in inserted:
+            ids[tuple(key)].append(pk)
+        for question in questions:
+            matches = ids[(question.subject_id, question.module_id, question.question_text)]
+            question.pk = matches.popleft() if matches else None
+
+    def write_row(self, row_num, data, result):
+        # save() sends post_save, which updates the counters and the cache
+        try:
+            with transaction.atomic():
+                question = self.build_question(data)
+                question.save()
+        except DatabaseError as e:
+            result.add_error(row_num, e)
+            return
+
+        result.add_created(row_num, question.pk)
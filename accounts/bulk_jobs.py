@@ -0,0 +1,145 @@
+"""
+Background processing of ``BulkUploadTemplate`` jobs.
+
+The upload endpoints only store the file and create a pending job; the
+``process_bulk_uploads`` management command claims pending jobs and runs the
+matching importer, recording progress after every chunk. The outcome of every
+row is written to a CSV report attached to the job, so the API only ever
+returns counts.
+
+Recording progress doubles as the worker's heartbeat: a ``processing`` job
+whose ``updated_at`` is older than ``BULK_UPLOAD_STALE_AFTER`` belongs to a
+worker that died, and is put back in the queue to resume after its last
+recorded chunk.
+"""
+import csv
+import io
+import tempfile
+from itertools import islice
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+
+from .bulk_import import StudentImporter, FacultyImporter, QuestionImporter
+from .csv_stream import iter_csv_rows, scan_csv
+from .models import BulkUploadTemplate
+
+
+IMPORTERS = {
+    'student': StudentImporter,
+    'faculty': FacultyImporter,
+    'question': QuestionImporter,
+}
+
+
+def requeue_stale_jobs():
+    """
+    Move ``processing`` jobs without a heartbeat for ``BULK_UPLOAD_STALE_AFTER``
+    back to ``pending`` and return how many there were.
+    """
+    now = timezone.now()
+    return BulkUploadTemplate.objects.filter(
+        status='processing', updated_at__lt=now - settings.BULK_UPLOAD_STALE_AFTER
+    ).update(status='pending', updated_at=now)
+
+
+def claim_next_job():
+    """
+    Atomically move the oldest pending job to ``processing`` and return it,
+    or return None when there is nothing to do. Stale jobs are requeued
+    first. Safe to call from several workers at once.
+    """
+    requeue_stale_jobs()
+    pending = BulkUploadTemplate.objects.filter(status='pending').order_by('id')
+    for job_id in pending.values_list('id', flat=True)[:10]:
+        now = timezone.now()
+        claimed = BulkUploadTemplate.objects.filter(id=job_id, status='pending').update(
+            status='processing', started_at=now, updated_at=now
+        )
+        if claimed:
+            return BulkUploadTemplate.objects.select_related('college', 'uploaded_by').get(id=job_id)
+    return None
+
+
+class ReportWriter:
+    """
+    Write the per-row outcome of a job (created id or error) to a temporary
+    CSV file as the import runs, then attach it to the job.
+    """
+    header = ['row', 'status', 'id', 'error']
+
+    def __init__(self):
+        self.file = tempfile.TemporaryFile()
+        self.text = io.TextIOWrapper(self.file, encoding='utf-8', newline='')
+        self.writer = csv.writer(self.text)
+        self.writer.writerow(self.header)
+
+    def write(self, result):
+        """
+        Write the rows recorded in ``result`` since the last call, in file
+        order, and drop them from the result to keep memory flat.
+        """
+        rows = [(row_num, 'created', pk, '') for row_num, pk in result.created]
+        rows += [(row_num, 'failed', '', message) for row_num, message in result.errors]
+        rows.sort(key=lambda row: row[0])
+        self.writer.writerows(rows)
+        result.created.clear()
+        result.errors.clear()
+
+    def save(self, job):
+        self.text.flush()
+        self.file.seek(0)
+        job.report_file.save(f'upload_{job.id}_report.csv', File(self.file), save=False)
+        BulkUploadTemplate.objects.filter(id=job.id).update(report_file=job.report_file.name)
+
+    def close(self):
+        self.text.close()
+
+
+def process_job(job):
+    """
+    Run the importer for ``job`` and record progress, the per-row report and
+    the final status. A requeued job skips the rows it already processed;
+    its report only lists the rows processed after it resumed.
+    """
+    importer_class = IMPORTERS.get(job.template_type)
+    if importer_class is None:
+        _finish(job, 'failed', f"Unsupported template type: {job.template_type}")
+        return
+
+    # Rows committed before the job was requeued
+    done_rows, done_failed = job.processed_rows, job.failed_rows
+    report = ReportWriter()
+    try:
+        with job.file_path.open('rb') as f:
+            encoding, total_rows = scan_csv(f)
+        BulkUploadTemplate.objects.filter(id=job.id).update(total_rows=total_rows, updated_at=timezone.now())
+
+        def record_progress(result):
+            report.write(result)
+            BulkUploadTemplate.objects.filter(id=job.id).update(
+                processed_rows=done_rows + result.total_rows,
+                failed_rows=done_failed + result.failed_count,
+                updated_at=timezone.now(),
+            )
+
+        with job.file_path.open('rb') as f:
+            rows = islice(iter_csv_rows(f, encoding), done_rows, None)
+            importer_class.from_job(job).run(rows, start=2 + done_rows, on_chunk=record_progress)
+    except Exception as e:
+        status, error_log = 'failed', str(e)
+    else:
+        status, error_log = 'completed', None
+
+    try:
+        report.save(job)
+    finally:
+        report.close()
+    _finish(job, status, error_log)
+
+
+def _finish(job, status, error_log):
+    BulkUploadTemplate.objects.filter(id=job.id).update(
+        status=status, error_log=error_log, finished_at=timezone.now()
+    )
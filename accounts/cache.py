@@ -0,0 +1,41 @@
+"""
+Per-college cache of the serialized subject and module lists.
+
+Every cached response is keyed by a per-college version number. Changing a
+subject, module or question bumps the version (see ``signals``), which makes
+all of the college's cached pages unreachable at once; they then expire on
+their own. Only ``add``, ``get``, ``set`` and ``incr`` are used, so any cache
+backend works, including the default local-memory one.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+
+
+def _version_key(college_id):
+    return f'curriculum:version:{college_id}'
+
+
+def curriculum_version(college_id):
+    key = _version_key(college_id)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock rather than 1, so a version evicted from the
+        # cache is never reused while pages cached under it are still alive.
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_curriculum_version(college_id):
+    try:
+        cache.incr(_version_key(college_id))
+    except ValueError:
+        # Not cached yet (or evicted): any fresh version will do
+        curriculum_version(college_id)
+
+
+def curriculum_cache_key(namespace, college_id, url):
+    digest = hashlib.md5(url.encode()).hexdigest()
+    return f'curriculum:{namespace}:{college_id}:{curriculum_version(college_id)}:{digest}'
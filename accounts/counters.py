@@ -0,0 +1,185 @@
+"""
+Incrementally maintained dashboard counters.
+
+``CollegeCounters`` holds one row of running totals per college and
+``QuestionCounter`` one count per (college, subject, difficulty), so the
+analytics endpoints read a few rows instead of counting the source tables.
+Saves and deletes adjust them with ``F()`` increments (see ``signals``);
+bulk inserts call ``record_created``. A college's counters are built from the
+source tables the first time they are read, and ``reconcile_counters``
+rebuilds them to correct any drift, e.g. from queryset ``update()`` calls,
+which send no signals.
+"""
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .analytics import METRIC_NAMES, metrics_by_college
+from .models import College, Batch, Student, Faculty, Subject, QuestionBank, CollegeCounters, QuestionCounter
+
+
+# The fields of each counted model that decide what it counts towards
+TRACKED_FIELDS = {
+    Student: ('college_id', 'is_active'),
+    Faculty: ('college_id', 'status'),
+    Batch: ('college_id',),
+    Subject: ('college_id',),
+    QuestionBank: ('college_id', 'subject_id', 'difficulty'),
+}
+
+
+def tracked_state(instance):
+    return {field: getattr(instance, field) for field in TRACKED_FIELDS[type(instance)]}
+
+
+def stored_state(instance):
+    """The tracked fields of ``instance`` as currently saved, or None."""
+    model = type(instance)
+    return model.objects.filter(pk=instance.pk).values(*TRACKED_FIELDS[model]).first()
+
+
+def contributions(model, state):
+    """
+    Return the counters one row in ``state`` adds 1 to: ``(college_id,
+    metric)`` and, for questions, ``(college_id, subject_id, difficulty)``.
+    """
+    college_id = state['college_id']
+    if model is Student:
+        keys = [(college_id, 'total_students')]
+        if state['is_active']:
+            keys.append((college_id, 'active_students'))
+    elif model is Faculty:
+        keys = [(college_id, 'total_faculty')]
+        if state['status'] == 'active':
+            keys.append((college_id, 'active_faculty'))
+    elif model is Batch:
+        keys = [(college_id, 'total_batches')]
+    elif model is Subject:
+        keys = [(college_id, 'total_subjects')]
+    else:
+        keys = [(college_id, 'total_questions'), (college_id, state['subject_id'], state['difficulty'])]
+    return keys
+
+
+def counter_deltas(model, before=None, after=None):
+    """The counter changes from a row moving from ``before`` to ``after``."""
+    deltas = Counter()
+    if after is not None:
+        deltas.update(contributions(model, after))
+    if before is not None:
+        deltas.subtract(contributions(model, before))
+    return deltas
+
+
+def removed_deltas(queryset):
+    """
+    The counter changes from deleting every row of ``queryset``, counted with
+    one grouped query instead of row by row.
+    """
+    model = queryset.model
+    deltas = Counter()
+    for row in queryset.values(*TRACKED_FIELDS[model]).annotate(rows=Count('pk')).order_by():
+        rows = row.pop('rows')
+        for key in contributions(model, row):
+            deltas[key] -= rows
+    return deltas
+
+
+def apply_deltas(deltas):
+    """
+    Apply ``counter_deltas`` with one ``UPDATE ... SET x = x + n`` per
+    college and per question counter. Colleges whose counters have not been
+    built yet are skipped; they are counted from scratch on first read.
+    """
+    by_college = {}
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        if len(key) == 2:
+            college_id, metric = key
+            by_college.setdefault(college_id, {})[metric] = F(metric) + delta
+            continue
+        college_id, subject_id, difficulty = key
+        updated = QuestionCounter.objects.filter(
+            college_id=college_id, subject_id=subject_id, difficulty=difficulty
+        ).update(count=F('count') + delta)
+        # A missing row counts zero; rows of a deleted subject are not recreated
+        if not updated and delta > 0:
+            counter, created = QuestionCounter.objects.get_or_create(
+                college_id=college_id, subject_id=subject_id, difficulty=difficulty,
+                defaults={'count': delta}
+            )
+            if not created:
+                QuestionCounter.objects.filter(pk=counter.pk).update(count=F('count') + delta)
+
+    now = timezone.now()
+    for college_id, updates in by_college.items():
+        CollegeCounters.objects.filter(college_id=college_id).update(updated_at=now, **updates)
+
+
+def record_created(instances):
+    """Count rows inserted with ``bulk_create``, which sends no signals."""
+    deltas = Counter()
+    for instance in instances:
+        deltas.update(counter_deltas(type(instance), after=tracked_state(instance)))
+    apply_deltas(deltas)
+
+
+def reconcile_counters(college_ids=None):
+    """
+    Rebuild the counters of ``college_ids`` (default: every college) from the
+    source tables and return ``{college_id: metrics}``.
+    """
+    if college_ids is None:
+        college_ids = list(College.objects.values_list('id', flat=True))
+    metrics = metrics_by_college(college_ids)
+    question_counts = QuestionBank.objects.filter(college_id__in=college_ids).values(
+        'college_id', 'subject_id', 'difficulty'
+    ).annotate(count=Count('id')).order_by()
+
+    with transaction.atomic():
+        CollegeCounters.objects.filter(college_id__in=college_ids).delete()
+        CollegeCounters.objects.bulk_create([
+            CollegeCounters(college_id=college_id, **values) for college_id, values in metrics.items()
+        ])
+        QuestionCounter.objects.filter(college_id__in=college_ids).delete()
+        QuestionCounter.objects.bulk_create([QuestionCounter(**row) for row in question_counts])
+    return metrics
+
+
+def college_counters(college_id):
+    """Return the dashboard metrics of one college, building them if needed."""
+    counters = CollegeCounters.objects.filter(college_id=college_id).values(*METRIC_NAMES)
+    metrics = counters.first()
+    if metrics is None:
+        try:
+            metrics = reconcile_counters([college_id])[college_id]
+        except IntegrityError:
+            # Another request built them first
+            metrics = counters.get()
+    return metrics
+
+
+def counters_by_college(college_ids):
+    """Return ``{college_id: metrics}``, building any missing counters."""
+    metrics = {
+        row.pop('college_id'): row
+        for row in CollegeCounters.objects.filter(college_id__in=college_ids).values('college_id', *METRIC_NAMES)
+    }
+    missing = [college_id for college_id in college_ids if college_id not in metrics]
+    if missing:
+        metrics.update(reconcile_counters(missing))
+    return metrics
+
+
+def question_breakdown(college_id):
+    """The college's question counts by subject and difficulty."""
+    rows = QuestionCounter.objects.filter(college_id=college_id, count__gt=0).order_by(
+        'subject__name', 'difficulty'
+    ).values_list('subject_id', 'subject__name', 'difficulty', 'count')
+    return [
+        {'subject': subject_id, 'subject_name': name, 'difficulty': difficulty, 'count': count}
+        for subject_id, name, difficulty, count in rows
+    ]
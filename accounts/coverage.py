@@ -0,0 +1,82 @@
+"""
+Question-bank coverage matrix: how many questions a college has for every
+subject, module, difficulty and question type.
+
+The counts come from one ``GROUP BY`` over ``QuestionBank``, served by the
+``(college, subject, module, difficulty, question_type)`` index, and are laid
+onto the college's subjects and modules so empty ones show up as zeros. The
+result is cached with the curriculum lists (see ``cache``), whose version is
+bumped by every question, subject and module write.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from .cache import curriculum_cache_key
+from .models import Subject, Module, QuestionBank
+
+
+DIFFICULTIES = [value for value, _ in QuestionBank.DIFFICULTY_CHOICES]
+QUESTION_TYPES = [value for value, _ in QuestionBank.QUESTION_TYPE_CHOICES]
+
+
+def _empty_counts():
+    return [[0] * len(QUESTION_TYPES) for _ in DIFFICULTIES]
+
+
+def _cell(name, cell_id=None):
+    return {'id': cell_id, 'name': name, 'total': 0, 'counts': _empty_counts()}
+
+
+def build_coverage(college_id):
+    """
+    Return the coverage matrix of a college. Every subject and module has a
+    ``counts`` grid indexed ``[difficulty][question_type]`` in the order of
+    the top-level ``difficulties`` and ``question_types`` lists. Questions
+    without a module are counted under a module with a null id.
+    """
+    subject_rows = Subject.objects.filter(college_id=college_id).order_by('name').values_list('id', 'name')
+    subjects = {subject_id: dict(_cell(name, subject_id), modules={}) for subject_id, name in subject_rows}
+    for module_id, name, subject_id in Module.objects.filter(
+        subject__college_id=college_id
+    ).values_list('id', 'name', 'subject_id'):
+        subjects[subject_id]['modules'][module_id] = _cell(name, module_id)
+
+    counts = QuestionBank.objects.filter(college_id=college_id).values_list(
+        'subject_id', 'module_id', 'difficulty', 'question_type'
+    ).annotate(count=Count('id')).order_by()
+    difficulty_index = {value: i for i, value in enumerate(DIFFICULTIES)}
+    type_index = {value: i for i, value in enumerate(QUESTION_TYPES)}
+    for subject_id, module_id, difficulty, question_type, count in counts:
+        subject = subjects.get(subject_id)
+        row, column = difficulty_index.get(difficulty), type_index.get(question_type)
+        if subject is None or row is None or column is None:
+            # The subject belongs to another college, or the value is not a valid choice
+            continue
+        module = subject['modules'].get(module_id)
+        if module is None:
+            # Questions without a module (or with one from another subject)
+            module = subject['modules'][module_id] = _cell(None, module_id)
+        for cell in (subject, module):
+            cell['total'] += count
+            cell['counts'][row][column] += count
+
+    for subject in subjects.values():
+        subject['modules'] = list(subject['modules'].values())
+    return {
+        'college': college_id,
+        'difficulties': DIFFICULTIES,
+        'question_types': QUESTION_TYPES,
+        'total': sum(subject['total'] for subject in subjects.values()),
+        'subjects': list(subjects.values()),
+    }
+
+
+def college_coverage(college_id):
+    """``build_coverage``, cached until the college's curriculum changes."""
+    key = curriculum_cache_key('coverage', college_id, 'matrix')
+    coverage = cache.get(key)
+    if coverage is None:
+        coverage = build_coverage(college_id)
+        cache.set(key, coverage, settings.CURRICULUM_CACHE_TIMEOUT)
+    return coverage
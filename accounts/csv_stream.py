@@ -0,0 +1,137 @@
+"""
+Streaming CSV reading for uploaded files.
+
+Uploads are decoded incrementally from ``File.chunks()`` so only one chunk of
+raw bytes and one parsed row are held at a time, whatever the file size.
+"""
+import codecs
+import csv
+import io
+from itertools import chain
+
+
+CHUNK_SIZE = 64 * 1024
+
+# Checked in order: the UTF-32 LE BOM starts with the UTF-16 LE BOM.
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# Spreadsheet exports without a BOM are either UTF-8 or Windows-1252.
+FALLBACK_ENCODING = 'cp1252'
+
+
+class UnsupportedEncoding(ValueError):
+    """Raised when an uploaded file cannot be decoded."""
+
+    def __init__(self):
+        super().__init__("Could not decode the CSV file; save it as UTF-8 or Windows-1252")
+
+
+def detect_encoding(head):
+    """
+    Guess the encoding of a file from its first bytes. Only the first chunk
+    is checked, so a file guessed to be UTF-8 may still fail to decode later
+    on; ``scan_csv`` handles that.
+    """
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    try:
+        head.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the chunk boundary is still UTF-8.
+        if e.reason != 'unexpected end of data':
+            return FALLBACK_ENCODING
+    return 'utf-8'
+
+
+class ChunkReader(io.RawIOBase):
+    """
+    Read-only binary stream over an iterator of byte chunks.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._pending = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def open_text(file, encoding=None, chunk_size=CHUNK_SIZE):
+    """
+    Return a text stream over ``file`` (a Django ``File``/``UploadedFile``)
+    that decodes its chunks incrementally, detecting the encoding from the
+    first chunk unless ``encoding`` is given.
+    """
+    chunks = file.chunks(chunk_size)
+    head = b''
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= 4:
+            break
+    if encoding is None:
+        encoding = detect_encoding(head)
+    raw = ChunkReader(chain([head], chunks))
+    return io.TextIOWrapper(io.BufferedReader(raw, chunk_size), encoding=encoding, newline='')
+
+
+def iter_csv_rows(file, encoding=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield each data row of an uploaded CSV file as a dict keyed by the
+    (stripped) header names.
+    """
+    reader = csv.DictReader(open_text(file, encoding, chunk_size))
+    if reader.fieldnames:
+        reader.fieldnames = [name.strip() for name in reader.fieldnames]
+    yield from reader
+
+
+def read_csv_header(file, encoding=None):
+    """
+    Return the header row of an uploaded CSV file, reading only its start.
+    """
+    header = next(csv.reader(open_text(file, encoding)), [])
+    return [name.strip() for name in header]
+
+
+def count_csv_rows(file, encoding=None):
+    """
+    Count the data rows of an uploaded CSV file in one streaming pass.
+    """
+    rows = csv.reader(open_text(file, encoding))
+    next(rows, None)
+    return sum(1 for row in rows if row)
+
+
+def scan_csv(file):
+    """
+    Decode the whole of an uploaded CSV file once, before any of it is
+    imported, and return its encoding and number of data rows. A file
+    guessed to be UTF-8 that has other bytes past the first chunk is counted
+    again as Windows-1252. Raises ``UnsupportedEncoding`` if neither works.
+    """
+    encoding = detect_encoding(next(file.chunks(CHUNK_SIZE), b''))
+    encodings = [encoding, FALLBACK_ENCODING] if encoding == 'utf-8' else [encoding]
+    for encoding in encodings:
+        try:
+            return encoding, count_csv_rows(file, encoding)
+        except UnicodeDecodeError:
+            continue
+    raise UnsupportedEncoding()
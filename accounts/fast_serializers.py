@@ -0,0 +1,135 @@
+"""
+Read-only serializers that build list responses straight from ``.values()``
+rows.
+
+Instantiating model instances and running every field of a
+``ModelSerializer`` dominates the CPU time of the busiest list GETs. These
+classes select exactly the columns (and joined names) a ``ModelSerializer``
+would read and build the same dicts, key for key and value for value, so the
+rendered JSON is byte-identical. ``accounts/tests.py`` checks the parity.
+"""
+from rest_framework import serializers
+
+
+_datetime = serializers.DateTimeField().to_representation
+_date = serializers.DateField().to_representation
+
+
+def _datetime_or_none(value):
+    return None if value is None else _datetime(value)
+
+
+def _date_or_none(value):
+    return None if value is None else _date(value)
+
+
+class ValuesSerializer:
+    """
+    Base class: ``values`` lists the lookups to select and ``to_representation``
+    turns one row into the dict the matching ``ModelSerializer`` returns.
+    """
+    values = ()
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @classmethod
+    def select(cls, queryset):
+        return queryset.values(*cls.values)
+
+    @property
+    def data(self):
+        return [self.to_representation(row) for row in self.rows]
+
+    def to_representation(self, row):
+        raise NotImplementedError
+
+
+class StudentValuesSerializer(ValuesSerializer):
+    """Same output as ``StudentSerializer``."""
+    values = (
+        'id', 'user_id', 'user__username', 'user__email', 'user__first_name',
+        'user__last_name', 'user__phone_number', 'college_id', 'college__name',
+        'batch_id', 'batch__name', 'roll_no', 'phone_number', 'date_of_birth', 'address',
+        'emergency_contact', 'emergency_contact_name', 'admission_date', 'is_active',
+        'created_at', 'updated_at',
+    )
+
+    def to_representation(self, row):
+        first_name = row['user__first_name']
+        last_name = row['user__last_name']
+        data = {
+            'id': row['id'],
+            'user': {
+                'id': row['user_id'],
+                'username': row['user__username'],
+                'email': row['user__email'],
+                'first_name': first_name,
+                'last_name': last_name,
+                'phone_number': row['user__phone_number'],
+            },
+            'college': row['college_id'],
+            'college_name': row['college__name'],
+            'batch': row['batch_id'],
+        }
+        # Like the CharField(source='batch.name'), omitted without a batch
+        if row['batch_id'] is not None:
+            data['batch_name'] = row['batch__name']
+        data.update({
+            'roll_no': row['roll_no'],
+            'phone_number': row['phone_number'],
+            'date_of_birth': _date_or_none(row['date_of_birth']),
+            'address': row['address'],
+            'emergency_contact': row['emergency_contact'],
+            'emergency_contact_name': row['emergency_contact_name'],
+            'admission_date': _date_or_none(row['admission_date']),
+            'is_active': row['is_active'],
+            'full_name': f'{first_name} {last_name}'.strip(),
+            'created_at': _datetime_or_none(row['created_at']),
+            'updated_at': _datetime_or_none(row['updated_at']),
+        })
+        return data
+
+
+class SubjectValuesSerializer(ValuesSerializer):
+    """Same output as ``SubjectSerializer``; needs ``with_module_count()``."""
+    values = (
+        'id', 'name', 'code', 'description', 'college_id', 'college__name', 'is_active',
+        'module_count', 'created_at', 'updated_at',
+    )
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'code': row['code'],
+            'description': row['description'],
+            'college': row['college_id'],
+            'college_name': row['college__name'],
+            'is_active': row['is_active'],
+            'module_count': row['module_count'],
+            'created_at': _datetime_or_none(row['created_at']),
+            'updated_at': _datetime_or_none(row['updated_at']),
+        }
+
+
+class ModuleValuesSerializer(ValuesSerializer):
+    """Same output as ``ModuleSerializer``; needs ``with_question_count()``."""
+    values = (
+        'id', 'subject_id', 'subject__name', 'name', 'description', 'order', 'is_active',
+        'question_count', 'created_at', 'updated_at',
+    )
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'subject': row['subject_id'],
+            'subject_name': row['subject__name'],
+            'name': row['name'],
+            'description': row['description'],
+            'order': row['order'],
+            'is_active': row['is_active'],
+            'question_count': row['question_count'],
+            'created_at': _datetime_or_none(row['created_at']),
+            'updated_at': _datetime_or_none(row['updated_at']),
+        }
@@ -0,0 +1,106 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import User, College, Batch, Student, Subject, Module, QuestionBank
+from accounts.parsers import FastJSONParser
+from accounts.renderers import FastJSONRenderer, orjson
+from accounts.serializers import StudentSerializer, QuestionBankSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the stock JSON renderer/parser with the orjson-backed ones on '
+        'serialized QuestionBank and Student payloads'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=1000,
+            help='Rows per payload'
+        )
+        parser.add_argument(
+            '--iterations', type=int, default=10,
+            help='Runs per backend; the best run is reported'
+        )
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING(
+                'orjson is not installed; FastJSONRenderer falls back to the stdlib encoder.'
+            ))
+
+        rows, iterations = options['rows'], options['iterations']
+        payloads = [
+            ('questions', QuestionBankSerializer(self.build_questions(rows), many=True).data),
+            ('students', StudentSerializer(self.build_students(rows), many=True).data),
+        ]
+        for name, data in payloads:
+            body = JSONRenderer().render(data)
+            if FastJSONRenderer().render(data) != body:
+                self.stdout.write(self.style.ERROR(f'{name}: renderers produced different output'))
+
+            render = self.best_time(lambda: JSONRenderer().render(data), iterations)
+            fast_render = self.best_time(lambda: FastJSONRenderer().render(data), iterations)
+            parse = self.best_time(lambda: JSONParser().parse(io.BytesIO(body)), iterations)
+            fast_parse = self.best_time(lambda: FastJSONParser().parse(io.BytesIO(body)), iterations)
+
+            self.stdout.write(
+                f'{name}: {rows} rows, {len(body) / 1024:,.0f} KiB\n'
+                f'  render: stdlib {render * 1000:.1f} ms, fast {fast_render * 1000:.1f} ms '
+                f'({render / fast_render:.1f}x)\n'
+                f'  parse:  stdlib {parse * 1000:.1f} ms, fast {fast_parse * 1000:.1f} ms '
+                f'({parse / fast_parse:.1f}x)'
+            )
+
+    def best_time(self, func, iterations):
+        best = None
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    # Payloads are built from unsaved instances, so no database is needed
+
+    def build_questions(self, rows):
+        now = timezone.now()
+        college = College(id=1, name='Government Medical College')
+        subject = Subject(id=1, college=college, name='Anatomy')
+        module = Module(id=1, subject=subject, name='Upper limb')
+        author = User(id=1, first_name='Priya', last_name='Raman')
+        return [
+            QuestionBank(
+                id=i, college=college, subject=subject, module=module, created_by=author,
+                question_text=f'Which nerve supplies the muscle described in case {i}? ' * 3,
+                option_a='Median nerve', option_b='Ulnar nerve', option_c='Radial nerve',
+                option_d='Axillary nerve', correct_answer='B',
+                explanation='The ulnar nerve supplies most intrinsic muscles of the hand. ' * 2,
+                video_url='https://example.com/videos/anatomy/upper-limb',
+                created_at=now, updated_at=now,
+            )
+            for i in range(rows)
+        ]
+
+    def build_students(self, rows):
+        now = timezone.now()
+        college = College(id=1, name='Government Medical College')
+        batch = Batch(id=1, college=college, name='2024 Batch', year_of_joining=2024)
+        return [
+            Student(
+                id=i, college=college, batch=batch, roll_no=f'GMC2024{i:05d}',
+                user=User(
+                    id=i, username=f'student{i}', email=f'student{i}@example.com',
+                    first_name='Arjun', last_name=f'Kumar {i}', phone_number='9876543210',
+                ),
+                phone_number='9876543210', date_of_birth=now.date(), admission_date=now.date(),
+                address='12 Anna Salai, Chennai', emergency_contact='9123456780',
+                emergency_contact_name='Lakshmi', created_at=now, updated_at=now,
+            )
+            for i in range(rows)
+        ]
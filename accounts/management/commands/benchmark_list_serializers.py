@@ -0,0 +1,90 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.fast_serializers import StudentValuesSerializer, SubjectValuesSerializer, ModuleValuesSerializer
+from accounts.models import User, College, Student, Subject, Module
+from accounts.serializers import StudentSerializer, SubjectSerializer, ModuleSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the throughput of the ModelSerializer and values() list '
+        'serializers for students, subjects and modules'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=0,
+            help='Create this many throwaway rows of each kind first (rolled back afterwards)'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=1000,
+            help='Rows serialized per run'
+        )
+        parser.add_argument(
+            '--iterations', type=int, default=5,
+            help='Runs per serializer; the best run is reported'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['rows']:
+                self.create_rows(options['rows'])
+
+            limit = options['limit']
+            cases = [
+                ('students', StudentSerializer, StudentValuesSerializer,
+                 Student.objects.select_related('user', 'college', 'batch')),
+                ('subjects', SubjectSerializer, SubjectValuesSerializer,
+                 Subject.objects.with_module_count().select_related('college')),
+                ('modules', ModuleSerializer, ModuleValuesSerializer,
+                 Module.objects.with_question_count().select_related('subject')),
+            ]
+            for name, serializer_class, values_serializer_class, queryset in cases:
+                queryset = queryset.order_by('id')[:limit]
+                model_time, count = self.best_time(
+                    lambda: serializer_class(queryset.all(), many=True).data, options['iterations']
+                )
+                values_time, _ = self.best_time(
+                    lambda: values_serializer_class(values_serializer_class.select(queryset.all())).data,
+                    options['iterations']
+                )
+                if not count:
+                    self.stdout.write(f'{name}: no rows')
+                    continue
+                self.stdout.write(
+                    f'{name}: {count} rows, ModelSerializer {count / model_time:,.0f} rows/s, '
+                    f'values() {count / values_time:,.0f} rows/s ({model_time / values_time:.1f}x)'
+                )
+
+            transaction.set_rollback(True)
+
+    def best_time(self, serialize, iterations):
+        best, count = None, 0
+        for _ in range(iterations):
+            start = time.perf_counter()
+            count = len(serialize())
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, count
+
+    def create_rows(self, rows):
+        college = College.objects.create(name='Benchmark college', code='BENCHMARK')
+        users = User.objects.bulk_create([
+            User(username=f'benchmark-{i}', first_name='Bench', last_name=str(i), role='student')
+            for i in range(rows)
+        ])
+        if users[0].pk is None:
+            users = User.objects.filter(username__startswith='benchmark-')
+        Student.objects.bulk_create([
+            Student(user=user, college=college, roll_no=f'BENCHMARK-{user.username}') for user in users
+        ])
+        Subject.objects.bulk_create([
+            Subject(college=college, name=f'Benchmark subject {i}') for i in range(rows)
+        ])
+        subject = Subject.objects.filter(college=college).first()
+        Module.objects.bulk_create([
+            Module(subject=subject, name=f'Benchmark module {i}', order=i) for i in range(rows)
+        ])
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from accounts.rollups import build_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        'Update the daily analytics rollups behind the trend endpoints with the '
+        'rows created since the last run'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Rebuild every bucket, e.g. after deleting or editing students or questions'
+        )
+
+    def handle(self, *args, **options):
+        for name, days in build_rollups(full=options['full']).items():
+            self.stdout.write(f'{name}: {days} days recounted')
+
+        self.stdout.write(self.style.SUCCESS('Analytics rollups are up to date.'))
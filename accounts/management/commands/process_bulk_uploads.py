@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.bulk_jobs import claim_next_job, process_job
+
+
+class Command(BaseCommand):
+    help = 'Process pending bulk upload jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling for new jobs instead of exiting when the queue is empty'
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=5.0,
+            help='Seconds to wait between polls when running with --loop'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if not options['loop']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            self.stdout.write(f'Processing {job.template_type} upload #{job.id} for {job.college.name}')
+            process_job(job)
+            job.refresh_from_db()
+            self.stdout.write(
+                f'  {job.status}: {job.processed_rows} rows processed, {job.failed_rows} failed'
+            )
+
+        self.stdout.write(self.style.SUCCESS('No pending bulk uploads.'))
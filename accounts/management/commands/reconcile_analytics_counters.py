@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from accounts.analytics import METRIC_NAMES
+from accounts.counters import reconcile_counters
+from accounts.models import CollegeCounters
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the analytics counters from the student, faculty, batch, subject '
+        'and question tables, correcting any drift'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--college', type=int, action='append', dest='college_ids',
+            help='Only rebuild this college (may be repeated)'
+        )
+
+    def handle(self, *args, **options):
+        college_ids = options['college_ids']
+        stored = CollegeCounters.objects.all()
+        if college_ids:
+            stored = stored.filter(college_id__in=college_ids)
+        before = {row.pop('college_id'): row for row in stored.values('college_id', *METRIC_NAMES)}
+
+        metrics = reconcile_counters(college_ids)
+        for college_id, values in sorted(metrics.items()):
+            if college_id in before and before[college_id] != values:
+                changes = ', '.join(
+                    f'{name} {before[college_id][name]} -> {values[name]}'
+                    for name in METRIC_NAMES if before[college_id][name] != values[name]
+                )
+                self.stdout.write(f'College #{college_id}: {changes}')
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt analytics counters for {len(metrics)} colleges.'))
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_bulkuploadtemplate_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bulkuploadtemplate',
+            name='password_mode',
+            field=models.CharField(choices=[('password', 'Password from file'), ('invite', 'Invite with activation token')], default='password', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='ActivationToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token_hash', models.CharField(blank=True, max_length=64, null=True, unique=True)),
+                ('issued_at', models.DateTimeField(blank=True, null=True)),
+                ('used_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, null=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='activation_token', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
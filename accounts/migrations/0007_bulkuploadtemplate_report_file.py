@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_activation_tokens'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bulkuploadtemplate',
+            name='report_file',
+            field=models.FileField(blank=True, null=True, upload_to='bulk_upload_reports/'),
+        ),
+    ]
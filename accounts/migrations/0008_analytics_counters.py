@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-16 21:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_bulkuploadtemplate_report_file'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollegeCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_students', models.IntegerField(default=0)),
+                ('active_students', models.IntegerField(default=0)),
+                ('total_faculty', models.IntegerField(default=0)),
+                ('active_faculty', models.IntegerField(default=0)),
+                ('total_batches', models.IntegerField(default=0)),
+                ('total_subjects', models.IntegerField(default=0)),
+                ('total_questions', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('college', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='counters', to='accounts.college')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='QuestionCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('difficulty', models.CharField(choices=[('easy', 'Easy'), ('medium', 'Medium'), ('hard', 'Hard')], max_length=10)),
+                ('count', models.IntegerField(default=0)),
+                ('college', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_counters', to='accounts.college')),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_counters', to='accounts.subject')),
+            ],
+            options={
+                'unique_together': {('college', 'subject', 'difficulty')},
+            },
+        ),
+    ]
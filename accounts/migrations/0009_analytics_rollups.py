@@ -0,0 +1,56 @@
+# Generated by Django 4.2.30 on 2026-10-16 21:07
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_analytics_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('built_until', models.DateTimeField()),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='questionbank',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='QuestionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('difficulty', models.CharField(choices=[('easy', 'Easy'), ('medium', 'Medium'), ('hard', 'Hard')], max_length=10)),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('college', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_rollups', to='accounts.college')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='question_rollups', to=settings.AUTH_USER_MODEL)),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_rollups', to='accounts.subject')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['college', 'day'], name='accounts_qu_college_07a79b_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='AdmissionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('batch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='admission_rollups', to='accounts.batch')),
+                ('college', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='admission_rollups', to='accounts.college')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['college', 'day'], name='accounts_ad_college_7cea8d_idx')],
+            },
+        ),
+    ]
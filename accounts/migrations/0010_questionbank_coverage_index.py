@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-16 21:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_analytics_rollups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='questionbank',
+            index=models.Index(fields=['college', 'subject', 'module', 'difficulty', 'question_type'], name='accounts_qu_college_f901b5_idx'),
+        ),
+    ]
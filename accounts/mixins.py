@@ -0,0 +1,170 @@
+"""
+Reusable mixins for the generic API views.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Subquery, Value
+from django.utils.cache import get_conditional_response, patch_vary_headers, quote_etag
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .cache import curriculum_cache_key
+from .tenancy import get_tenant
+
+
+class SparseFieldsetMixin:
+    """
+    Honour ``?fields=`` and ``?exclude=`` (comma-separated field names) on GET
+    requests and load only the columns the remaining fields read. The
+    serializer must use ``DynamicFieldsMixin``.
+    """
+
+    def get_field_selection(self):
+        if self.request.method != 'GET':
+            return {}
+        selection = {}
+        for param in ('fields', 'exclude'):
+            value = self.request.query_params.get(param)
+            if value:
+                selection[param] = [name.strip() for name in value.split(',') if name.strip()]
+        return selection
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.update(self.get_field_selection())
+        return super().get_serializer(*args, **kwargs)
+
+    def narrow_queryset(self, queryset):
+        """
+        Restrict ``queryset`` to the columns and joins the GET serializer needs.
+        """
+        if self.request.method != 'GET':
+            return queryset
+        columns = self.get_serializer().get_columns()
+        relations = {column.split('__')[0] for column in columns if '__' in column}
+        return queryset.select_related(None).select_related(*relations).only(*columns)
+
+
+class ValuesListMixin:
+    """
+    Serve list GETs from ``.values()`` rows through ``values_serializer_class``
+    (a ``fast_serializers.ValuesSerializer``) instead of model instances and
+    the ``ModelSerializer``. The output is identical; other methods are not
+    affected.
+    """
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.values_serializer_class
+        queryset = serializer_class.select(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer_class(page).data)
+        return Response(serializer_class(queryset).data)
+
+
+class ConditionalGetMixin:
+    """
+    Answer GETs with an ETag computed by one query over the plain scoped
+    (and, for detail views, single-row) rows, and with
+    304 Not Modified, without loading or serializing anything, when it
+    matches the client's If-None-Match.
+
+    The fingerprint is the row count, highest id and latest ``updated_at``
+    of ``get_scoped_queryset()``, which must return the rows of the response
+    without the annotations and joins of ``get_queryset()``: aggregating
+    over those would wrap every joined row in a subquery. Related rows that
+    appear in the response are listed in ``etag_relations`` as
+    ``name: (model, field, parent_field)`` and contribute the count and
+    latest ``updated_at`` of the ``model`` rows whose ``field`` is in the
+    ``parent_field`` values of the scoped rows, each read by an uncorrelated
+    scalar subquery of the same statement.
+    Last-Modified is sent for information only: deleting a row does not move
+    ``MAX(updated_at)``, so only the ETag is used to answer 304.
+    """
+    etag_relations = {}
+
+    def is_detail(self):
+        return (self.lookup_url_kwarg or self.lookup_field) in self.kwargs
+
+    def get_scoped_queryset(self):
+        return self.get_queryset()
+
+    def get_fingerprint(self):
+        queryset = self.filter_queryset(self.get_scoped_queryset())
+        if self.is_detail():
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+
+        aggregates = {}
+        for name, (model, field, parent_field) in self.etag_relations.items():
+            # Grouping by a constant aggregates every matching row into one
+            related = model.objects.filter(
+                **{'%s__in' % field: queryset.values(parent_field)}
+            ).order_by().annotate(group=Value(1)).values('group')
+            aggregates['%s_rows' % name] = Max(Subquery(related.annotate(rows=Count('pk')).values('rows')))
+            aggregates['%s_updated_at' % name] = Max(Subquery(
+                related.annotate(updated=Max('updated_at')).values('updated')
+            ))
+        return queryset.aggregate(
+            rows=Count('pk'),
+            last_id=Max('pk'),
+            updated_at=Max('updated_at'),
+            **aggregates
+        )
+
+    def get(self, request, *args, **kwargs):
+        fingerprint = self.get_fingerprint()
+        if not fingerprint['rows'] and self.is_detail():
+            # Let the detail view answer 404
+            return super().get(request, *args, **kwargs)
+
+        state = [request.get_full_path(), request.user.pk] + [
+            fingerprint[key] for key in sorted(fingerprint)
+        ]
+        etag = quote_etag(hashlib.md5(repr(state).encode()).hexdigest())
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        response['ETag'] = etag
+        if fingerprint['updated_at']:
+            response['Last-Modified'] = http_date(fingerprint['updated_at'].timestamp())
+        # Responses are scoped to the authenticated user
+        patch_vary_headers(response, ('Authorization',))
+        return response
+
+
+class CurriculumCacheMixin:
+    """
+    Cache list GET responses per college under the college's curriculum
+    version (see ``cache``), so repeat page loads skip the database until a
+    subject, module or question of the college changes.
+    """
+    cache_namespace = None
+
+    def get_cache_college_id(self):
+        """
+        Return the college whose rows the response holds, or None to skip
+        the cache (product owners see every college). Views whose other
+        roles read a single college's rows override this.
+        """
+        tenant = get_tenant(self.request)
+        if tenant.role == 'college_admin':
+            return tenant.college_id
+        return None
+
+    def list(self, request, *args, **kwargs):
+        college_id = self.get_cache_college_id()
+        if college_id is None:
+            return super().list(request, *args, **kwargs)
+
+        # Pagination links are absolute, so key on the full URL
+        key = curriculum_cache_key(self.cache_namespace, college_id, request.build_absolute_uri())
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, settings.CURRICULUM_CACHE_TIMEOUT)
+        return Response(data)
@@ -73,6 +73,11 @@ class AcademicYear(models.Model):
 # -------------------------------------------------
 # 5. BATCH
 # -------------------------------------------------
+class BatchQuerySet(models.QuerySet):
+    def with_student_count(self):
+        return self.annotate(student_count=models.Count('students'))
+
+
 class Batch(models.Model):
     college = models.ForeignKey(College, on_delete=models.CASCADE, related_name="batches")
     course = models.CharField(max_length=255, default="NEET-PG")  # redundant for quick access
@@ -86,6 +91,8 @@ class Batch(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True, null=True, blank=True)
 
+    objects = BatchQuerySet.as_manager()
+
     class Meta:
         unique_together = ("college", "year_of_joining", "name")
 
@@ -161,6 +168,11 @@ class Faculty(models.Model):
 # -------------------------------------------------
 # 8. SUBJECT (NEET PG subjects)
 # -------------------------------------------------
+class SubjectQuerySet(models.QuerySet):
+    def with_module_count(self):
+        return self.annotate(module_count=models.Count('modules'))
+
+
 class Subject(models.Model):
     college = models.ForeignKey(College, on_delete=models.CASCADE, related_name="subjects")
     name = models.CharField(max_length=255)
@@ -171,6 +183,8 @@ class Subject(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True, null=True, blank=True)
 
+    objects = SubjectQuerySet.as_manager()
+
     class Meta:
         unique_together = ("college", "name")
 
@@ -181,6 +195,11 @@ class Subject(models.Model):
 # -------------------------------------------------
 # 8. MODULE (Sub-topics within subjects)
 # -------------------------------------------------
+class ModuleQuerySet(models.QuerySet):
+    def with_question_count(self):
+        return self.annotate(question_count=models.Count('questions'))
+
+
 class Module(models.Model):
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name="modules")
     name = models.CharField(max_length=255)
@@ -191,6 +210,8 @@ class Module(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True, null=True, blank=True)
 
+    objects = ModuleQuerySet.as_manager()
+
     class Meta:
         unique_together = ("subject", "name")
         ordering = ["subject", "order"]
@@ -239,9 +260,16 @@ class QuestionBank(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="created_questions")
     is_active = models.BooleanField(default=True)
     
-    created_at = models.DateTimeField(auto_now_add=True, null=True, blank=True)
+    # Indexed for the incremental analytics rollups
+    created_at = models.DateTimeField(auto_now_add=True, null=True, blank=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Covers the coverage matrix GROUP BY (see accounts.coverage)
+            models.Index(fields=["college", "subject", "module", "difficulty", "question_type"]),
+        ]
+
     def __str__(self):
         return f"{self.subject.name} - {self.question_text[:50]}..."
 
@@ -256,14 +284,125 @@ class BulkUploadTemplate(models.Model):
         ("question", "Question"),
     ]
 
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("processing", "Processing"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    PASSWORD_MODE_CHOICES = [
+        ("password", "Password from file"),
+        ("invite", "Invite with activation token"),
+    ]
+
     template_type = models.CharField(max_length=20, choices=TEMPLATE_TYPE_CHOICES)
     college = models.ForeignKey(College, on_delete=models.CASCADE, related_name="upload_templates")
+    uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="bulk_uploads")
     file_path = models.FileField(upload_to="bulk_uploads/")
-    status = models.CharField(max_length=20, default="pending")  # pending, processing, completed, failed
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
     error_log = models.TextField(blank=True, null=True)
+    password_mode = models.CharField(max_length=20, choices=PASSWORD_MODE_CHOICES, default="password")
+    report_file = models.FileField(upload_to="bulk_upload_reports/", blank=True, null=True)
+
+    # Progress, updated by the worker after every chunk
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    failed_rows = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
     
     created_at = models.DateTimeField(auto_now_add=True, null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True, null=True, blank=True)
 
     def __str__(self):
-        return f"{self.template_type} - {self.college.name}"
\ No newline at end of file
+        return f"{self.template_type} - {self.college.name}"
+
+
+# -------------------------------------------------
+# 11. ACTIVATION TOKEN (for invited accounts)
+# -------------------------------------------------
+class ActivationToken(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="activation_token")
+    # SHA-256 of the token; the token itself is only ever shown once, in the
+    # pending activations download that issues it. Empty until issued.
+    token_hash = models.CharField(max_length=64, unique=True, blank=True, null=True)
+    issued_at = models.DateTimeField(blank=True, null=True)
+    used_at = models.DateTimeField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True, null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.user.username} - {'used' if self.used_at else 'pending'}"
+
+
+# -------------------------------------------------
+# 12. ANALYTICS COUNTERS (maintained by accounts.counters)
+# -------------------------------------------------
+class CollegeCounters(models.Model):
+    college = models.OneToOneField(College, on_delete=models.CASCADE, related_name="counters")
+    total_students = models.IntegerField(default=0)
+    active_students = models.IntegerField(default=0)
+    total_faculty = models.IntegerField(default=0)
+    active_faculty = models.IntegerField(default=0)
+    total_batches = models.IntegerField(default=0)
+    total_subjects = models.IntegerField(default=0)
+    total_questions = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Counters - {self.college.name}"
+
+
+class QuestionCounter(models.Model):
+    college = models.ForeignKey(College, on_delete=models.CASCADE, related_name="question_counters")
+    subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name="question_counters")
+    difficulty = models.CharField(max_length=10, choices=QuestionBank.DIFFICULTY_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("college", "subject", "difficulty")
+
+    def __str__(self):
+        return f"{self.subject.name} ({self.difficulty}): {self.count}"
+
+
+# -------------------------------------------------
+# 13. ANALYTICS ROLLUPS (daily buckets built by accounts.rollups)
+# -------------------------------------------------
+class AdmissionRollup(models.Model):
+    college = models.ForeignKey(College, on_delete=models.CASCADE, related_name="admission_rollups")
+    batch = models.ForeignKey(Batch, on_delete=models.SET_NULL, null=True, blank=True, related_name="admission_rollups")
+    day = models.DateField()  # admission_date, or the day the student was added
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["college", "day"])]
+
+    def __str__(self):
+        return f"{self.college_id} {self.day}: {self.count} admitted"
+
+
+class QuestionRollup(models.Model):
+    college = models.ForeignKey(College, on_delete=models.CASCADE, related_name="question_rollups")
+    subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name="question_rollups")
+    difficulty = models.CharField(max_length=10, choices=QuestionBank.DIFFICULTY_CHOICES)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="question_rollups")
+    day = models.DateField()  # the day the questions were created
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["college", "day"])]
+
+    def __str__(self):
+        return f"{self.college_id} {self.day}: {self.count} questions"
+
+
+class RollupWatermark(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    # Rows created before this time are already in the rollup
+    built_until = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} built until {self.built_until}"
@@ -0,0 +1,33 @@
+"""
+Opt-in keyset pagination for large lists.
+
+The default ``PageNumberPagination`` runs a ``COUNT(*)`` and an ``OFFSET``
+query, both of which get slower the deeper the page. Views using
+``CursorPaginationMixin`` switch to cursor pagination on the primary key when
+the client asks for it with ``?pagination=cursor``; every page then costs one
+indexed range query and there is no total count.
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    ordering = '-id'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class CursorPaginationMixin:
+    cursor_pagination_class = IdCursorPagination
+
+    def use_cursor_pagination(self):
+        params = self.request.query_params
+        return params.get('pagination') == 'cursor' or 'cursor' in params
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.use_cursor_pagination():
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
@@ -0,0 +1,65 @@
+"""
+Password hashing for mass account creation.
+
+PBKDF2 is deliberately slow, so hashing thousands of passwords on one core
+dominates a bulk import. ``PasswordHasher`` spreads the work over a process
+pool that lives for the duration of an import. Inside web requests it uses
+threads instead, which need no fork: ``hashlib.pbkdf2_hmac`` releases the GIL.
+"""
+import hashlib
+import os
+import secrets
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+
+# Below this many passwords the cost of shipping work to the pool outweighs
+# the parallel speed-up.
+PARALLEL_THRESHOLD = 32
+
+
+def generate_activation_token():
+    return secrets.token_urlsafe(32)
+
+
+def hash_activation_token(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class PasswordHasher:
+    """
+    Hash batches of raw passwords, in parallel when there are enough of them.
+
+    Use as a context manager so the pool is shut down when the import ends.
+    With ``threads`` a thread pool is used instead of a process pool.
+    """
+
+    def __init__(self, workers=None, threads=False):
+        if workers is None:
+            workers = getattr(settings, 'BULK_IMPORT_HASH_WORKERS', None) or os.cpu_count() or 1
+        self.workers = workers
+        self.threads = threads
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def hash_many(self, passwords):
+        if self.workers <= 1 or len(passwords) < PARALLEL_THRESHOLD:
+            return [make_password(password) for password in passwords]
+
+        if self._pool is None:
+            executor_class = ThreadPoolExecutor if self.threads else ProcessPoolExecutor
+            self._pool = executor_class(max_workers=self.workers)
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(self._pool.map(make_password, passwords, chunksize=chunksize))
@@ -0,0 +1,42 @@
+"""
+JSON rendering with orjson when it is installed.
+
+``FastJSONRenderer`` produces the same bytes as DRF's ``JSONRenderer``:
+compact separators, UTF-8 output, U+2028/U+2029 escaped, and dates, times,
+datetimes, decimals and lazy strings converted by DRF's own encoder. It falls
+back to the stdlib for anything orjson cannot express the same way (indented
+output, ASCII-only output, integers wider than 64 bits), and everywhere when
+orjson is not installed.
+
+Known differences: orjson writes very large or very small floats as ``1e16``
+rather than ``1e+16``, and NaN/Infinity as ``null`` instead of raising. No
+model here has a float field and decimals are rendered as strings.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+
+if orjson is not None:
+    # Send dates and times to DRF's encoder, which formats UTC as 'Z'
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Like JSONRenderer, keep the output a strict JavaScript subset
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -0,0 +1,138 @@
+"""
+Daily rollups behind the analytics trend endpoints.
+
+Each ``Rollup`` keeps one row per day and dimension combination (college,
+batch, subject, difficulty, author, ...) with the number of source rows in
+that bucket. ``build`` is incremental: a ``RollupWatermark`` records when the
+rollup was last built, the days touched by rows created since then are
+recounted from the source table, and all other buckets are left alone. Trend
+queries then sum a few thousand rollup rows instead of scanning the source
+tables.
+
+Deleting a source row, or editing one so that it belongs to another day or
+dimension (a student's batch or admission date, a question's subject or
+difficulty), does not touch the buckets it was counted in; run
+``build_analytics_rollups --full`` to rebuild everything. Rows without a day
+(legacy students with neither an admission date nor a created_at) are not
+counted.
+"""
+import datetime
+
+from django.db import transaction
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import Coalesce, Trunc, TruncDate
+from django.utils import timezone
+
+from .models import Student, QuestionBank, AdmissionRollup, QuestionRollup, RollupWatermark
+
+
+# Rows committed up to this long after their created_at are still picked up
+WATERMARK_OVERLAP = datetime.timedelta(minutes=10)
+
+INTERVALS = ('day', 'week', 'month')
+
+
+class Rollup:
+    """
+    Base class: counts ``source_model`` rows per ``bucket()`` day and
+    ``dimensions`` into ``rollup_model``.
+    """
+    name = None
+    source_model = None
+    rollup_model = None
+    dimensions = ()
+
+    def bucket(self):
+        """Expression for the day a source row is counted on."""
+        raise NotImplementedError
+
+    def source_rows(self, days=None):
+        rows = self.source_model.objects.annotate(bucket=self.bucket()).filter(bucket__isnull=False)
+        if days is not None:
+            rows = rows.filter(bucket__in=days)
+        return rows
+
+    def dirty_days(self, since):
+        """The days whose buckets rows created since ``since`` fall in."""
+        return set(
+            self.source_rows().filter(created_at__gte=since - WATERMARK_OVERLAP)
+            .values_list('bucket', flat=True).order_by().distinct()
+        )
+
+    def build(self, full=False):
+        """
+        Recount the buckets touched since the last build (every bucket with
+        ``full`` or on the first build). Returns the number of days recounted.
+        """
+        started_at = timezone.now()
+        watermark = RollupWatermark.objects.filter(name=self.name).first()
+        days = None if full or watermark is None else self.dirty_days(watermark.built_until)
+
+        counts = self.source_rows(days).values('bucket', *self.dimensions).annotate(
+            count=Count('id')
+        ).order_by()
+        with transaction.atomic():
+            stale = self.rollup_model.objects.all()
+            if days is not None:
+                stale = stale.filter(day__in=days)
+            stale.delete()
+            self.rollup_model.objects.bulk_create(
+                (self.rollup_model(day=row.pop('bucket'), **row) for row in counts.iterator()),
+                batch_size=1000
+            )
+            RollupWatermark.objects.update_or_create(name=self.name, defaults={'built_until': started_at})
+
+        if days is None:
+            return self.rollup_model.objects.values('day').distinct().count()
+        return len(days)
+
+
+class AdmissionRollupBuilder(Rollup):
+    """Students admitted per day and batch."""
+    name = 'admissions'
+    source_model = Student
+    rollup_model = AdmissionRollup
+    dimensions = ('college_id', 'batch_id')
+
+    def bucket(self):
+        # Students without an admission date count on the day they were added
+        return Coalesce('admission_date', TruncDate('created_at'), output_field=DateField())
+
+
+class QuestionRollupBuilder(Rollup):
+    """Questions created per day, subject, difficulty and author."""
+    name = 'questions'
+    source_model = QuestionBank
+    rollup_model = QuestionRollup
+    dimensions = ('college_id', 'subject_id', 'difficulty', 'created_by_id')
+
+    def bucket(self):
+        return TruncDate('created_at')
+
+    def source_rows(self, days=None):
+        rows = super().source_rows(days)
+        if days:
+            # Lets the database use the created_at index
+            start = datetime.datetime.combine(
+                min(days), datetime.time.min, tzinfo=timezone.get_current_timezone()
+            )
+            rows = rows.filter(created_at__gte=start)
+        return rows
+
+
+ROLLUPS = (AdmissionRollupBuilder, QuestionRollupBuilder)
+
+
+def build_rollups(full=False):
+    """Build every rollup; returns ``{name: days recounted}``."""
+    return {rollup_class.name: rollup_class().build(full=full) for rollup_class in ROLLUPS}
+
+
+def series(queryset, interval, *dimensions):
+    """
+    Sum the rollup rows of ``queryset`` per ``interval`` ('day', 'week' or
+    'month') and ``dimensions``, in period order.
+    """
+    return queryset.annotate(
+        period=Trunc('day', interval, output_field=DateField())
+    ).values('period', *dimensions).annotate(count=Sum('count')).order_by('period', *dimensions)
@@ -1,10 +1,18 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from django.conf import settings
 from django.contrib.auth.password_validation import validate_password
+from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.text import Truncator
 from .models import (
     User, College, CollegeAdmin, Batch, AcademicYear, Student, Faculty, Subject, 
-    Module, QuestionBank, BulkUploadTemplate
+    Module, QuestionBank, BulkUploadTemplate, ActivationToken
 )
+from .passwords import hash_activation_token
+from .tenancy import get_tenant
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -118,7 +126,10 @@ class BatchSerializer(serializers.ModelSerializer):
         ]
     
     def get_student_count(self, obj):
-        return obj.students.count()
+        # Annotated by Batch.objects.with_student_count() in list/detail views
+        if hasattr(obj, 'student_count'):
+            return obj.student_count
+        return Batch.objects.with_student_count().values_list('student_count', flat=True).get(pk=obj.pk)
 
 class BatchCreateSerializer(serializers.ModelSerializer):
     academic_years = AcademicYearSerializer(many=True, write_only=True)
@@ -172,7 +183,10 @@ class SubjectSerializer(serializers.ModelSerializer):
         ]
     
     def get_module_count(self, obj):
-        return obj.modules.count()
+        # Annotated by Subject.objects.with_module_count() in list/detail views
+        if hasattr(obj, 'module_count'):
+            return obj.module_count
+        return Subject.objects.with_module_count().values_list('module_count', flat=True).get(pk=obj.pk)
 
 
 class UserNestedSerializer(serializers.ModelSerializer):
@@ -203,6 +217,13 @@ class StudentSerializer(serializers.ModelSerializer):
         return obj.user.get_full_name() if obj.user else ''
 
 
+def faculty_subjects_prefetch(lookup='subjects'):
+    """
+    Prefetch of faculty subjects with only the columns FacultySerializer shows.
+    """
+    return Prefetch(lookup, queryset=Subject.objects.only('id', 'name'))
+
+
 class FacultySerializer(serializers.ModelSerializer):
     user = UserNestedSerializer(read_only=True)
     college_name = serializers.CharField(source='college.name', read_only=True)
@@ -219,10 +240,16 @@ class FacultySerializer(serializers.ModelSerializer):
         ]
 
     def get_subjects(self, obj):
-        return [s.name for s in obj.subjects.all()]
+        return [s.name for s in self.get_prefetched_subjects(obj)]
     
     def get_subjects_list(self, obj):
-        return [{'id': s.id, 'name': s.name} for s in obj.subjects.all()]
+        return [{'id': s.id, 'name': s.name} for s in self.get_prefetched_subjects(obj)]
+
+    def get_prefetched_subjects(self, obj):
+        # Both subject fields read one prefetch; load it if the view did not
+        if 'subjects' not in getattr(obj, '_prefetched_objects_cache', {}):
+            prefetch_related_objects([obj], faculty_subjects_prefetch())
+        return obj.subjects.all()
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
@@ -270,10 +297,37 @@ class ModuleSerializer(serializers.ModelSerializer):
         ]
     
     def get_question_count(self, obj):
-        return obj.questions.count()
-
-
-class QuestionBankSerializer(serializers.ModelSerializer):
+        # Annotated by Module.objects.with_question_count() in list/detail views
+        if hasattr(obj, 'question_count'):
+            return obj.question_count
+        return Module.objects.with_question_count().values_list('question_count', flat=True).get(pk=obj.pk)
+
+
+class DynamicFieldsMixin:
+    """
+    Serializer mixin that keeps only the fields named in the ``fields``
+    keyword argument and drops those named in ``exclude``.
+    """
+    # Model columns read by fields whose name is not a column, for only()
+    field_columns = {}
+
+    def __init__(self, *args, fields=None, exclude=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for name in exclude or ():
+            self.fields.pop(name, None)
+
+    def get_columns(self):
+        columns = []
+        for name, field in self.fields.items():
+            if not field.write_only:
+                columns.extend(self.field_columns.get(name, (name,)))
+        return columns
+
+
+class QuestionBankSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     subject_name = serializers.CharField(source='subject.name', read_only=True)
     module_name = serializers.CharField(source='module.name', read_only=True)
     college_name = serializers.CharField(source='college.name', read_only=True)
@@ -288,17 +342,78 @@ class QuestionBankSerializer(serializers.ModelSerializer):
             'is_active', 'created_at', 'updated_at'
         ]
 
+    field_columns = {
+        'subject_name': ('subject__name',),
+        'module_name': ('module__name',),
+        'college_name': ('college__name',),
+        'created_by_name': ('created_by__first_name', 'created_by__last_name'),
+    }
+
+
+class QuestionBankListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Compact read-only representation for browsing the question bank."""
+    subject_name = serializers.CharField(source='subject.name', read_only=True)
+    module_name = serializers.CharField(source='module.name', read_only=True)
+    question_preview = serializers.SerializerMethodField()
+
+    PREVIEW_LENGTH = 120
+
+    class Meta:
+        model = QuestionBank
+        fields = [
+            'id', 'subject', 'subject_name', 'module', 'module_name', 'question_preview',
+            'question_type', 'difficulty', 'is_active', 'created_at'
+        ]
+        read_only_fields = fields
+
+    field_columns = {
+        'subject_name': ('subject__name',),
+        'module_name': ('module__name',),
+        'question_preview': ('question_text',),
+    }
+
+    def get_question_preview(self, obj):
+        return Truncator(obj.question_text).chars(self.PREVIEW_LENGTH)
+
 
 class BulkUploadTemplateSerializer(serializers.ModelSerializer):
     college_name = serializers.CharField(source='college.name', read_only=True)
+    created_rows = serializers.SerializerMethodField()
+    progress = serializers.SerializerMethodField()
+    eta_seconds = serializers.SerializerMethodField()
+    report_url = serializers.SerializerMethodField()
     
     class Meta:
         model = BulkUploadTemplate
         fields = [
             'id', 'template_type', 'college', 'college_name', 'file_path', 
-            'status', 'error_log', 'created_at', 'updated_at'
+            'status', 'error_log', 'password_mode', 'total_rows', 'processed_rows', 'failed_rows',
+            'created_rows', 'progress', 'eta_seconds', 'report_url', 'started_at', 'finished_at',
+            'created_at', 'updated_at'
         ]
 
+    def get_created_rows(self, obj):
+        return obj.processed_rows - obj.failed_rows
+
+    def get_progress(self, obj):
+        if obj.status == 'completed':
+            return 100.0
+        if not obj.total_rows:
+            return 0.0
+        return round(100.0 * obj.processed_rows / obj.total_rows, 1)
+
+    def get_eta_seconds(self, obj):
+        if obj.status != 'processing' or not obj.started_at or not obj.processed_rows:
+            return None
+        elapsed = (timezone.now() - obj.started_at).total_seconds()
+        remaining = max(obj.total_rows - obj.processed_rows, 0)
+        return round(elapsed / obj.processed_rows * remaining)
+
+    def get_report_url(self, obj):
+        if not obj.report_file:
+            return None
+        return reverse('accounts:bulk-upload-report', args=[obj.id])
+
 
 # -------------------------------------------------
 # STUDENT REGISTRATION SERIALIZER
@@ -375,6 +490,26 @@ class StudentRegistrationSerializer(serializers.ModelSerializer):
         return student
 
 
+class StudentBatchRegistrationSerializer(StudentRegistrationSerializer):
+    """
+    Validates one item of a batch registration. Uniqueness of username, email
+    and roll number is checked for the whole batch by ``StudentImporter``.
+    """
+    college_id = serializers.IntegerField(write_only=True, required=False)
+
+    class Meta(StudentRegistrationSerializer.Meta):
+        extra_kwargs = {'roll_no': {'validators': []}}
+
+    def validate_email(self, value):
+        return value
+
+    def validate_username(self, value):
+        return value
+
+    def validate_roll_no(self, value):
+        return value
+
+
 # -------------------------------------------------
 # STUDENT UPDATE SERIALIZER
 # -------------------------------------------------
@@ -500,9 +635,9 @@ class FacultyRegistrationSerializer(serializers.ModelSerializer):
             # Get college_id from validated_data or context
             college_id = validated_data.pop('college_id', None)
             if not college_id and hasattr(self, 'context') and 'request' in self.context:
-                request = self.context['request']
-                if hasattr(request.user, 'college_admin_profile'):
-                    college_id = request.user.college_admin_profile.college.id
+                tenant = get_tenant(self.context['request'])
+                if tenant.role == 'college_admin':
+                    college_id = tenant.college_id
             
             if not college_id:
                 raise serializers.ValidationError("College ID is required")
@@ -550,6 +685,19 @@ class FacultyRegistrationSerializer(serializers.ModelSerializer):
             return faculty
 
 
+class FacultyBatchRegistrationSerializer(FacultyRegistrationSerializer):
+    """
+    Validates one item of a batch registration. Uniqueness of username and
+    email is checked for the whole batch by ``FacultyImporter``.
+    """
+
+    def validate_email(self, value):
+        return value
+
+    def validate_username(self, value):
+        return value
+
+
 # -------------------------------------------------
 # FACULTY UPDATE SERIALIZER
 # -------------------------------------------------
@@ -631,3 +779,43 @@ class FacultyUpdateSerializer(serializers.ModelSerializer):
             instance.save()
             
             return instance
+
+
+# -------------------------------------------------
+# ACCOUNT ACTIVATION SERIALIZER
+# -------------------------------------------------
+class AccountActivationSerializer(serializers.Serializer):
+    token = serializers.CharField()
+    password = serializers.CharField(write_only=True, validators=[validate_password])
+    password_confirm = serializers.CharField(write_only=True)
+
+    def validate(self, attrs):
+        if attrs['password'] != attrs['password_confirm']:
+            raise serializers.ValidationError("Passwords don't match.")
+        return attrs
+
+    def validate_token(self, value):
+        try:
+            activation = ActivationToken.objects.select_related('user').get(token_hash=hash_activation_token(value))
+        except ActivationToken.DoesNotExist:
+            raise serializers.ValidationError("Invalid activation token.")
+        if activation.used_at is not None:
+            raise serializers.ValidationError("This activation token has already been used.")
+        if activation.issued_at + settings.ACTIVATION_TOKEN_LIFETIME < timezone.now():
+            raise serializers.ValidationError("This activation token has expired.")
+        self.activation = activation
+        return value
+
+    def save(self):
+        with transaction.atomic():
+            # Claim the token first so a concurrent request cannot reuse it
+            claimed = ActivationToken.objects.filter(
+                id=self.activation.id, used_at__isnull=True
+            ).update(used_at=timezone.now())
+            if not claimed:
+                raise serializers.ValidationError({'token': ["This activation token has already been used."]})
+
+            user = self.activation.user
+            user.set_password(self.validated_data['password'])
+            user.save(update_fields=['password'])
+        return user
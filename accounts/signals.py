@@ -0,0 +1,95 @@
+"""
+Invalidate the per-college curriculum cache (see ``cache``) whenever a
+subject, module or question is saved or deleted, and keep the analytics
+counters (see ``counters``) in step with saves and deletes. Bulk inserts do
+not send these signals; the importers update both themselves.
+
+Deleting a college, subject or module cascades to its rows, which Django
+collects and deletes in batches but still signals one by one. The per-row
+receivers ignore rows deleted by such a cascade: the college's counters go
+with it, and a subject or module subtracts its questions from the counters
+with one grouped query before the delete.
+"""
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .cache import bump_curriculum_version
+from .counters import TRACKED_FIELDS, apply_deltas, counter_deltas, removed_deltas, stored_state, tracked_state
+from .models import College, Subject, Module, QuestionBank
+
+
+# Models whose deletes handle the rows they cascade to themselves
+CASCADE_ROOTS = (College, Subject, Module)
+
+
+def is_cascade(instance, origin):
+    """Whether ``instance`` is only deleted because ``origin`` of a cascade root is."""
+    if origin is None:
+        return False
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model in CASCADE_ROOTS and model is not type(instance)
+
+
+@receiver([post_save, post_delete], sender=College)
+def college_changed(sender, instance, **kwargs):
+    # Subject lists show the college name
+    bump_curriculum_version(instance.id)
+
+
+@receiver([post_save, post_delete], sender=Subject)
+@receiver([post_save, post_delete], sender=QuestionBank)
+def curriculum_changed(sender, instance, origin=None, **kwargs):
+    if not is_cascade(instance, origin):
+        bump_curriculum_version(instance.college_id)
+
+
+@receiver([post_save, post_delete], sender=Module)
+def module_changed(sender, instance, origin=None, **kwargs):
+    if is_cascade(instance, origin):
+        return
+    college_id = Subject.objects.filter(id=instance.subject_id).values_list('college_id', flat=True).first()
+    if college_id is not None:
+        bump_curriculum_version(college_id)
+
+
+@receiver(pre_delete, sender=Subject)
+@receiver(pre_delete, sender=Module)
+def questions_deleted(sender, instance, origin=None, **kwargs):
+    if not is_cascade(instance, origin):
+        field = 'subject_id' if sender is Subject else 'module_id'
+        apply_deltas(removed_deltas(QuestionBank.objects.filter(**{field: instance.pk})))
+
+
+def _affects_counters(instance, update_fields):
+    if update_fields is None:
+        return True
+    fields = {type(instance)._meta.get_field(name).attname for name in update_fields}
+    return not fields.isdisjoint(TRACKED_FIELDS[type(instance)])
+
+
+def counted_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Remember what the row counted towards before this save
+    if raw or instance._state.adding or not _affects_counters(instance, update_fields):
+        instance._counted_state = None
+    else:
+        instance._counted_state = stored_state(instance)
+
+
+def counted_post_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, '_counted_state', None)
+    if created or before is not None:
+        apply_deltas(counter_deltas(sender, before, tracked_state(instance)))
+
+
+def counted_post_delete(sender, instance, origin=None, **kwargs):
+    if not is_cascade(instance, origin):
+        apply_deltas(counter_deltas(sender, before=tracked_state(instance)))
+
+
+for model in TRACKED_FIELDS:
+    pre_save.connect(counted_pre_save, sender=model, dispatch_uid=f'counters_pre_save_{model.__name__}')
+    post_save.connect(counted_post_save, sender=model, dispatch_uid=f'counters_post_save_{model.__name__}')
+    post_delete.connect(counted_post_delete, sender=model, dispatch_uid=f'counters_post_delete_{model.__name__}')
@@ -0,0 +1,136 @@
+"""
+TTL cache with stampede protection for expensive payloads such as the
+analytics dashboards.
+
+- Single flight: when an entry expires, the one worker that wins a
+  ``cache.add`` lock recomputes it while the others keep serving the stale
+  copy, which is stored for ``STALE_GRACE`` seconds beyond its TTL. If the
+  recomputation fails, the error is logged and the stale copy is served
+  instead; it only reaches the caller when nothing is cached.
+- Probabilistic early refresh (XFetch): each read recomputes early with a
+  probability that grows as expiry nears and with how long the last
+  recomputation took, so hot keys are usually refreshed before they expire.
+- Hit, stale hit, miss and recompute-time counters are kept in the cache
+  so the TTL and ``beta`` can be tuned.
+
+Only basic operations such as ``add``, ``get``, ``set`` and ``incr`` are used,
+so any backend works, including local memory (counters and locks are then
+per process).
+"""
+import logging
+import math
+import random
+import time
+
+from django.core.cache import cache
+
+
+logger = logging.getLogger(__name__)
+
+# How long a stale entry stays available to serve while it is recomputed
+STALE_GRACE = 10 * 60
+# A worker that dies while recomputing holds the lock at most this long
+LOCK_TIMEOUT = 30
+# How long a request without any cached copy waits for another worker's result
+MISS_WAIT = 5
+MISS_POLL_INTERVAL = 0.05
+
+STAT_NAMES = ('hits', 'stale_hits', 'misses', 'recomputes', 'recompute_ms')
+
+
+class SingleFlightCache:
+    """
+    Cache for values identified by ``namespace`` and a key. ``timeout`` may be
+    a number of seconds or a callable returning one (e.g. read from settings).
+    ``beta`` > 1 favours earlier refreshes, < 1 later ones.
+    """
+
+    def __init__(self, namespace, timeout, beta=1.0):
+        self.namespace = namespace
+        self.timeout = timeout
+        self.beta = beta
+
+    def get_timeout(self):
+        return self.timeout() if callable(self.timeout) else self.timeout
+
+    def make_key(self, key):
+        return f'{self.namespace}:value:{key}'
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, calling ``compute()`` when needed."""
+        cache_key = self.make_key(key)
+        lock_key = f'{self.namespace}:lock:{key}'
+        entry = cache.get(cache_key)
+
+        if entry is not None:
+            value, compute_time, expires_at = entry
+            if not self.should_refresh(compute_time, expires_at):
+                self.incr('hits')
+                return value
+            if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+                # Another worker is recomputing it
+                self.incr('stale_hits')
+                return value
+        else:
+            self.incr('misses')
+            if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+                entry = self.wait_for(cache_key)
+                if entry is not None:
+                    return entry[0]
+                # Still nothing: compute without the lock rather than fail
+
+        try:
+            return self.recompute(cache_key, compute)
+        except Exception:
+            if entry is None:
+                raise
+            logger.exception('Recomputing %s failed, serving the stale value', cache_key)
+            return entry[0]
+        finally:
+            cache.delete(lock_key)
+
+    def should_refresh(self, compute_time, expires_at):
+        # XFetch: -log(u) for u in (0, 1] is exponentially distributed
+        early = compute_time * self.beta * -math.log(1.0 - random.random())
+        return time.time() + early >= expires_at
+
+    def wait_for(self, cache_key):
+        deadline = time.monotonic() + MISS_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(MISS_POLL_INTERVAL)
+            entry = cache.get(cache_key)
+            if entry is not None:
+                return entry
+        return None
+
+    def recompute(self, cache_key, compute):
+        start = time.perf_counter()
+        value = compute()
+        compute_time = time.perf_counter() - start
+
+        timeout = self.get_timeout()
+        cache.set(cache_key, (value, compute_time, time.time() + timeout), timeout + STALE_GRACE)
+        self.incr('recomputes')
+        self.incr('recompute_ms', round(compute_time * 1000))
+        return value
+
+    def incr(self, name, delta=1):
+        key = f'{self.namespace}:stats:{name}'
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            cache.add(key, 0, None)
+            cache.incr(key, delta)
+
+    def stats(self):
+        """Return the counters and the average recompute time in ms."""
+        keys = {f'{self.namespace}:stats:{name}': name for name in STAT_NAMES}
+        values = cache.get_many(keys)
+        stats = {name: values.get(key, 0) for key, name in keys.items()}
+        stats['avg_recompute_ms'] = (
+            round(stats['recompute_ms'] / stats['recomputes'], 1) if stats['recomputes'] else None
+        )
+        return stats
+
+    def reset_stats(self):
+        cache.delete_many([f'{self.namespace}:stats:{name}' for name in STAT_NAMES])
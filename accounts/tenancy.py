@@ -0,0 +1,112 @@
+"""
+Request-scoped tenant resolution.
+
+Views used to test ``user.role`` and ``hasattr(user, '<role>_profile')`` and
+then dereference ``profile.college`` on every call, costing a query or two
+each time. ``get_tenant`` resolves the user's role, profile id and college id
+with one query the first time it is called for a request and reuses the
+result for the rest of it, so querysets can filter on ``college_id`` without
+loading the profile or the ``College`` row.
+"""
+from rest_framework.exceptions import PermissionDenied
+
+from .models import College, CollegeAdmin, Faculty, Student
+
+
+# The profile model that ties each role to a college
+PROFILE_MODELS = {
+    'college_admin': CollegeAdmin,
+    'faculty': Faculty,
+    'student': Student,
+}
+
+
+class Tenant:
+    """
+    The role of the requesting user and, for roles tied to a college, the
+    ids of their profile and college (None if the user has no profile).
+    """
+
+    def __init__(self, role, profile_id=None, college_id=None):
+        self.role = role
+        self.profile_id = profile_id
+        self.college_id = college_id
+
+    @property
+    def is_product_owner(self):
+        return self.role == 'product_owner'
+
+    def __repr__(self):
+        return f'Tenant(role={self.role!r}, profile_id={self.profile_id!r}, college_id={self.college_id!r})'
+
+
+def resolve_tenant(user):
+    role = getattr(user, 'role', None)
+    model = PROFILE_MODELS.get(role)
+    if model is None:
+        return Tenant(role)
+    profile = model.objects.filter(user_id=user.pk).values_list('id', 'college_id').first()
+    if profile is None:
+        return Tenant(role)
+    return Tenant(role, *profile)
+
+
+def get_tenant(request):
+    """
+    Return the ``Tenant`` of ``request.user``, resolving it at most once per
+    request. Accepts a DRF ``Request`` or a Django ``HttpRequest``.
+    """
+    http_request = getattr(request, '_request', request)
+    tenant = getattr(http_request, '_tenant', None)
+    if tenant is None:
+        tenant = http_request._tenant = resolve_tenant(request.user)
+    return tenant
+
+
+class TenantScopedMixin:
+    """
+    Scope a generic view's queryset to the requesting user's college.
+
+    Product owners see every row; users whose role is in ``tenant_roles`` see
+    the rows whose ``tenant_field`` equals their college id; everyone else
+    sees nothing. Call ``scope_queryset`` from ``get_queryset``.
+    """
+    tenant_field = 'college_id'
+    tenant_roles = ('college_admin',)
+
+    @property
+    def tenant(self):
+        return get_tenant(self.request)
+
+    def is_scoped_tenant(self):
+        tenant = self.tenant
+        return tenant.role in self.tenant_roles and tenant.college_id is not None
+
+    def scope_queryset(self, queryset):
+        if self.tenant.is_product_owner:
+            return queryset
+        if self.is_scoped_tenant():
+            return queryset.filter(**{self.tenant_field: self.tenant.college_id})
+        return queryset.none()
+
+    def get_tenant_college(self, serializer):
+        """
+        The tenant's ``College``, reusing the instance the serializer already
+        loaded for a posted ``college`` when it is the same one.
+        """
+        college = serializer.validated_data.get('college')
+        if college is None or college.pk != self.tenant.college_id:
+            college = College.objects.get(pk=self.tenant.college_id)
+        return college
+
+    def save_for_tenant(self, serializer, **kwargs):
+        """
+        Save a new row into the tenant's college; product owners save the
+        college they posted. Call from ``perform_create``.
+        """
+        if self.is_scoped_tenant():
+            serializer.save(college=self.get_tenant_college(serializer), **kwargs)
+        elif self.tenant.is_product_owner:
+            serializer.save(**kwargs)
+        else:
+            raise PermissionDenied('You cannot create this resource')
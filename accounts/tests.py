@@ -1,3 +1,1483 @@
-from django.test import TestCase
+import codecs
+import csv
+import datetime
+import decimal
+import io
+import json
+import tempfile
+import time
+import uuid
+from unittest import mock
 
-# Create your tests here.
+import openpyxl
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DataError, DatabaseError, connection
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from .models import (
+    User, College, CollegeAdmin, Batch, Student, Faculty, Subject, Module, QuestionBank, BulkUploadTemplate,
+    ActivationToken
+)
+from . import bulk_jobs, csv_stream, renderers, rollups, views
+from .analytics import college_metrics
+from .bulk_import import FacultyImporter, QuestionImporter, StudentImporter
+from .counters import college_counters, question_breakdown
+from .parsers import FastJSONParser
+from .passwords import hash_activation_token
+from .renderers import FastJSONRenderer
+from .tenancy import get_tenant
+from .stampede import SingleFlightCache
+from .serializers import (
+    BatchSerializer, StudentSerializer, SubjectSerializer, ModuleSerializer, QuestionBankListSerializer
+)
+from .fast_serializers import StudentValuesSerializer, SubjectValuesSerializer, ModuleValuesSerializer
+
+
+def student_row(i, **values):
+    row = {
+        'username': f'bulk{i}', 'email': f'bulk{i}@example.com', 'first_name': 'Bulk',
+        'last_name': str(i), 'password': 'Passw0rd!23', 'roll_no': f'BULK{i}',
+    }
+    row.update(values)
+    return row
+
+
+class BulkImporterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.college = College.objects.create(name='College', code='COL')
+        self.subject = Subject.objects.create(college=self.college, name='Anatomy')
+
+    def test_student_rows_are_validated(self):
+        batch = Batch.objects.create(college=self.college, name='2024', year_of_joining=2024)
+        other = Batch.objects.create(
+            college=College.objects.create(name='Other', code='OTH'), name='2024', year_of_joining=2024
+        )
+        rows = [
+            student_row(0, batch_id=str(batch.id), date_of_birth='2001-02-03'),
+            student_row(1, roll_no=''),
+            student_row(2, email='not-an-email'),
+            student_row(3, admission_date='03/02/2024'),
+            student_row(4, batch_id=str(other.id)),
+            student_row(5, password=''),
+        ]
+        result = StudentImporter(self.college).run(rows)
+        self.assertEqual(result.error_messages, [
+            'Row 3: roll_no is required',
+            'Row 4: Enter a valid email address.',
+            'Row 5: admission_date must be a date in YYYY-MM-DD format',
+            f'Row 6: Batch {other.id} does not exist in your college',
+            'Row 7: password is required',
+        ])
+        student = Student.objects.select_related('user').get()
+        self.assertEqual(result.created, [(2, student.id)])
+        self.assertEqual((student.batch_id, student.date_of_birth), (batch.id, datetime.date(2001, 2, 3)))
+        self.assertEqual((student.user.role, student.user.email), ('student', 'bulk0@example.com'))
+        self.assertTrue(student.user.check_password('Passw0rd!23'))
+
+    def test_duplicates_in_file_and_database(self):
+        StudentImporter(self.college).run([student_row(0)])
+        rows = [
+            student_row(1),
+            student_row(1, email='other@example.com', roll_no='OTHER'),
+            student_row(2, email='bulk1@example.com', roll_no='OTHER2'),
+            student_row(3, roll_no='BULK1'),
+            student_row(0, email='new@example.com', roll_no='NEW'),
+            student_row(4, email='bulk0@example.com'),
+            student_row(5, roll_no='BULK0'),
+        ]
+        result = StudentImporter(self.college).run(rows)
+        self.assertEqual(result.error_messages, [
+            "Row 3: Duplicate username 'bulk1'",
+            "Row 4: Duplicate email 'bulk1@example.com'",
+            "Row 5: Duplicate roll number 'BULK1'",
+            'Row 6: A user with this username already exists.',
+            'Row 7: A user with this email already exists.',
+            'Row 8: A student with this roll number already exists.',
+        ])
+        self.assertEqual(result.created_count, 1)
+
+    def test_integrity_error_falls_back_to_row_by_row_writes(self):
+        # Another request creates a clashing user after check_existing ran
+        User.objects.create_user(username='bulk1', role='student')
+        with mock.patch.object(StudentImporter, 'existing_values', return_value=[]):
+            result = StudentImporter(self.college, chunk_size=10).run([student_row(i) for i in range(3)])
+        self.assertEqual(result.created_count, 2)
+        self.assertEqual([row_num for row_num, _ in result.errors], [3])
+        self.assertEqual(sorted(Student.objects.values_list('roll_no', flat=True)), ['BULK0', 'BULK2'])
+
+    def test_faculty_rows(self):
+        Subject.objects.create(college=self.college, name='Physiology')
+        rows = [
+            {**student_row(0), 'designation': 'Professor', 'subjects': 'anatomy; Physiology;',
+             'experience_years': '4', 'phone_number': '9876543210'},
+            {**student_row(1), 'designation': 'janitor'},
+            {**student_row(2), 'designation': 'hod', 'subjects': 'Surgery'},
+            {**student_row(3), 'designation': 'dean', 'experience_years': '-1'},
+            {**student_row(4), 'designation': 'dean', 'status': 'retired'},
+        ]
+        result = FacultyImporter(self.college).run(rows)
+        designations = ', '.join(dict(Faculty.DESIGNATION_CHOICES))
+        self.assertEqual(result.error_messages, [
+            f'Row 3: designation must be one of: {designations}',
+            "Row 4: Subject 'Surgery' does not exist in your college",
+            'Row 5: experience_years must not be negative',
+            'Row 6: status must be one of: active, inactive',
+        ])
+        faculty = Faculty.objects.select_related('user').get()
+        self.assertEqual((faculty.designation, faculty.status, faculty.experience_years), ('professor', 'active', 4))
+        self.assertEqual((faculty.user.role, faculty.user.phone_number), ('faculty', '9876543210'))
+        self.assertEqual(sorted(faculty.subjects.values_list('name', flat=True)), ['Anatomy', 'Physiology'])
+
+    def test_question_rows(self):
+        module = Module.objects.create(subject=self.subject, name='Upper limb')
+        Subject.objects.create(college=self.college, name='Physiology')
+        rows = [
+            {'subject': 'anatomy', 'module': 'upper LIMB', 'question_text': 'Q1', 'correct_answer': 'b',
+             'difficulty': 'Hard', 'image_url': 'https://example.com/q1.png'},
+            {'subject': 'Surgery', 'question_text': 'Q2'},
+            {'subject': 'Physiology', 'module': 'Upper limb', 'question_text': 'Q3'},
+            {'subject': 'Anatomy', 'question_text': 'Q4', 'correct_answer': 'E'},
+            {'subject': 'Anatomy', 'question_text': 'Q5', 'video_url': 'not a url'},
+            {'subject': 'Anatomy', 'question_text': ''},
+        ]
+        result = QuestionImporter(self.college).run(rows)
+        self.assertEqual(result.error_messages, [
+            "Row 3: Subject 'Surgery' does not exist in your college",
+            "Row 4: Module 'Upper limb' does not exist in subject 'Physiology'",
+            'Row 5: correct_answer must be one of: A, B, C, D',
+            'Row 6: video_url must be a valid URL',
+            'Row 7: question_text is required',
+        ])
+        question = QuestionBank.objects.get()
+        self.assertEqual(
+            (question.subject_id, question.module_id, question.correct_answer, question.difficulty, question.question_type),
+            (self.subject.id, module.id, 'B', 'hard', 'mcq')
+        )
+
+    def test_question_ids_without_bulk_insert_returning(self):
+        # MySQL returns no primary keys from bulk inserts
+        QuestionBank.objects.create(college=self.college, subject=self.subject, question_text='Same')
+        rows = [{'subject': 'Anatomy', 'question_text': text} for text in ('Same', 'Other', 'Same')]
+        with mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False):
+            result = QuestionImporter(self.college).run(rows)
+        ids = list(QuestionBank.objects.order_by('id').values_list('id', flat=True))[1:]
+        self.assertEqual(result.created, list(zip([2, 3, 4], ids)))
+
+    def test_values_longer_than_their_column_fail_the_row(self):
+        rows = [
+            student_row(0, phone_number='1' * 16),
+            student_row(1, roll_no='R' * 51),
+            student_row(2, emergency_contact='9' * 15),
+        ]
+        result = StudentImporter(self.college, hash_workers=1).run(rows)
+        self.assertEqual(result.error_messages, [
+            'Row 2: phone_number must be at most 15 characters',
+            'Row 3: roll_no must be at most 50 characters',
+        ])
+        self.assertEqual(list(Student.objects.values_list('roll_no', flat=True)), ['BULK2'])
+
+        rows = [{'subject': 'Anatomy', 'question_text': 'Q', 'video_url': 'https://example.com/' + 'v' * 200}]
+        result = QuestionImporter(self.college).run(rows)
+        self.assertEqual(result.error_messages, ['Row 2: video_url must be at most 200 characters'])
+
+    def test_database_errors_fail_only_their_row(self):
+        rows = [student_row(i) for i in range(3)]
+        save = User.save
+
+        def reject_second_row(user, *args, **kwargs):
+            if user.username == 'bulk1':
+                raise DataError('Data too long for column')
+            return save(user, *args, **kwargs)
+
+        with mock.patch.object(User.objects, 'bulk_create', side_effect=DataError('Data too long')), \
+                mock.patch.object(User, 'save', reject_second_row):
+            result = StudentImporter(self.college, hash_workers=1).run(rows)
+        self.assertEqual(result.error_messages, ['Row 3: Data too long for column'])
+        self.assertEqual(
+            sorted(Student.objects.values_list('roll_no', flat=True)), ['BULK0', 'BULK2']
+        )
+
+
+class ActivationTests(TestCase):
+    def setUp(self):
+        self.college = College.objects.create(name='College', code='COL')
+        self.admin = User.objects.create_user(username='admin', password='x', role='college_admin')
+        CollegeAdmin.objects.create(user=self.admin, college=self.college)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        rows = [student_row(i, password='') for i in range(2)]
+        result = StudentImporter(self.college, password_mode='invite').run(rows)
+        self.assertEqual(result.failed_count, 0, result.error_messages)
+
+    def download(self, **params):
+        response = self.client.get('/api/students/pending-activations/', params)
+        self.assertEqual(response.status_code, 200)
+        rows = list(csv.DictReader(io.StringIO(response.content.decode())))
+        return {row['username']: row['activation_token'] for row in rows}
+
+    def activate(self, token):
+        return APIClient().post('/api/activate/', {
+            'token': token, 'password': 'N3w-Passw0rd!', 'password_confirm': 'N3w-Passw0rd!'
+        })
+
+    def test_tokens_are_stored_hashed_and_shown_once(self):
+        tokens = self.download()
+        self.assertEqual(set(tokens), {'bulk0', 'bulk1'})
+        stored = set(ActivationToken.objects.values_list('token_hash', flat=True))
+        self.assertEqual(stored, {hash_activation_token(token) for token in tokens.values()})
+        self.assertEqual(self.download(), {'bulk0': '', 'bulk1': ''})
+
+        reissued = self.download(reissue=1)
+        self.assertEqual(self.activate(tokens['bulk0']).status_code, 400)
+        self.assertEqual(self.activate(reissued['bulk0']).status_code, 200)
+        self.assertTrue(User.objects.get(username='bulk0').check_password('N3w-Passw0rd!'))
+
+    def test_invited_accounts_cannot_log_in_until_activated(self):
+        user = User.objects.get(username='bulk0')
+        self.assertFalse(user.has_usable_password())
+        self.assertEqual(user.student_profile.college_id, self.college.id)
+
+    def test_tokens_are_single_use(self):
+        token = self.download()['bulk0']
+        self.assertEqual(self.activate(token).status_code, 200)
+        response = self.activate(token)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('already been used', str(response.data['details']))
+        # Used tokens are no longer pending
+        self.assertEqual(set(self.download()), {'bulk1'})
+
+    def test_tokens_expire(self):
+        token = self.download()['bulk0']
+        ActivationToken.objects.update(
+            issued_at=timezone.now() - settings.ACTIVATION_TOKEN_LIFETIME - datetime.timedelta(minutes=1)
+        )
+        response = self.activate(token)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('expired', str(response.data['details']))
+        self.assertEqual(self.activate('not-a-token').status_code, 400)
+
+
+class CsvStreamTests(TestCase):
+    def read(self, data):
+        upload = SimpleUploadedFile('rows.csv', data)
+        return csv_stream.read_csv_header(upload), list(csv_stream.iter_csv_rows(upload, chunk_size=8))
+
+    def test_detects_boms_and_windows_1252(self):
+        text = ' name ,city\nJos\xe9,Chennai\n'
+        for data, encoding in [
+            (text.encode('utf-8'), 'utf-8'),
+            (codecs.BOM_UTF8 + text.encode('utf-8'), 'utf-8-sig'),
+            (text.encode('utf-16'), 'utf-16'),
+            (codecs.BOM_UTF16_BE + text.encode('utf-16-be'), 'utf-16'),
+            (text.encode('cp1252'), 'cp1252'),
+        ]:
+            self.assertEqual(csv_stream.detect_encoding(data), encoding)
+            self.assertEqual(
+                self.read(data), (['name', 'city'], [{'name': 'Jos\xe9', 'city': 'Chennai'}]), encoding
+            )
+
+    def test_character_split_by_chunk_boundary_is_still_utf8(self):
+        data = 'name\n\u0905\u0930\u094d\u091c\u0941\u0928\n'.encode('utf-8')
+        self.assertEqual(csv_stream.detect_encoding(data[:6]), 'utf-8')
+        self.assertEqual(self.read(data)[1], [{'name': '\u0905\u0930\u094d\u091c\u0941\u0928'}])
+        self.assertEqual(csv_stream.count_csv_rows(SimpleUploadedFile('rows.csv', data + b'\n')), 1)
+
+    def test_late_windows_1252_bytes_fall_back_from_utf8(self):
+        # The first non-ASCII byte is well past the chunk used for detection
+        text = 'name\n' + 'Arjun\n' * 20000 + 'Andr\xe9\n'
+        upload = SimpleUploadedFile('names.csv', text.encode('cp1252'))
+        self.assertEqual(csv_stream.detect_encoding(text.encode('cp1252')[:csv_stream.CHUNK_SIZE]), 'utf-8')
+        self.assertEqual(csv_stream.scan_csv(upload), ('cp1252', 20001))
+        rows = list(csv_stream.iter_csv_rows(upload, 'cp1252'))
+        self.assertEqual(rows[-1], {'name': 'Andr\xe9'})
+
+    def test_undecodable_file_is_rejected(self):
+        upload = SimpleUploadedFile('names.csv', b'\xff\xfename\n' + b'\x00\xd8' * 3)
+        with self.assertRaises(csv_stream.UnsupportedEncoding):
+            csv_stream.scan_csv(upload)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), BULK_IMPORT_HASH_WORKERS=1)
+class BulkJobTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.college = College.objects.create(name='College', code='COL')
+        self.admin = User.objects.create_user(username='admin', password='x', role='college_admin')
+        CollegeAdmin.objects.create(user=self.admin, college=self.college)
+
+    def create_job(self, rows, **fields):
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+        return BulkUploadTemplate.objects.create(
+            template_type='student', college=self.college, uploaded_by=self.admin,
+            file_path=SimpleUploadedFile('students.csv', output.getvalue().encode()), **fields
+        )
+
+    def upload(self, rows, query=''):
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        upload = SimpleUploadedFile('students.csv', output.getvalue().encode())
+        return client.post(f'/api/students/bulk-upload/{query}', {'file': upload}, format='multipart')
+
+    def report(self, job):
+        with job.report_file.open('rb') as f:
+            return list(csv.reader(io.TextIOWrapper(f, encoding='utf-8')))
+
+    def test_upload_is_queued_and_processed(self):
+        response = self.upload([student_row(0), student_row(1, email='bad'), student_row(2)])
+        self.assertEqual(response.status_code, 202, response.data)
+        job = BulkUploadTemplate.objects.get(id=response.data['job_id'])
+        self.assertEqual((job.status, job.uploaded_by_id), ('pending', self.admin.id))
+        self.assertFalse(Student.objects.exists())
+
+        call_command('process_bulk_uploads', stdout=io.StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual((job.total_rows, job.processed_rows, job.failed_rows), (3, 3, 1))
+        self.assertIsNotNone(job.finished_at)
+        ids = dict(Student.objects.values_list('roll_no', 'id'))
+        self.assertEqual(self.report(job), [
+            ['row', 'status', 'id', 'error'],
+            ['2', 'created', str(ids['BULK0']), ''],
+            ['3', 'failed', '', 'Enter a valid email address.'],
+            ['4', 'created', str(ids['BULK2']), ''],
+        ])
+
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        job_status = client.get(f'/api/bulk-uploads/{job.id}/').data
+        self.assertEqual((job_status['created_rows'], job_status['progress']), (2, 100.0))
+        response = client.get(job_status['report_url'])
+        self.assertEqual(b''.join(response.streaming_content).decode().splitlines()[2], '3,failed,,Enter a valid email address.')
+
+    def test_progress_is_recorded_after_every_chunk(self):
+        job = self.create_job([student_row(i) for i in range(3)])
+        BulkUploadTemplate.objects.filter(id=job.id).update(status='processing')
+        progress = []
+        importer = StudentImporter(self.college, chunk_size=2)
+        original_write = bulk_jobs.ReportWriter.write
+
+        def write(report, result):
+            progress.append((result.total_rows, result.created_count))
+            original_write(report, result)
+
+        with mock.patch.object(StudentImporter, 'from_job', return_value=importer), \
+                mock.patch.object(bulk_jobs.ReportWriter, 'write', write):
+            bulk_jobs.process_job(job)
+        self.assertEqual(progress, [(2, 2), (3, 3)])
+        self.assertEqual(len(self.report(job)), 4)
+
+    def test_failed_job_keeps_its_report(self):
+        job = self.create_job([student_row(0)])
+        with mock.patch.object(StudentImporter, 'write_chunk', side_effect=RuntimeError('disk full')):
+            bulk_jobs.process_job(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error_log), ('failed', 'disk full'))
+        self.assertEqual(self.report(job), [['row', 'status', 'id', 'error']])
+
+    def test_missing_columns_are_rejected_at_upload(self):
+        response = self.upload([{'username': 'bulk0', 'email': 'bulk0@example.com'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['details'], ['first_name', 'last_name', 'roll_no', 'password'])
+        self.assertFalse(BulkUploadTemplate.objects.exists())
+
+        CollegeAdmin.objects.filter(user=self.admin).delete()
+        self.assertEqual(self.upload([student_row(0)]).status_code, 403)
+
+    def test_dry_run_writes_nothing(self):
+        StudentImporter(self.college).run([student_row(0)])
+        rows = [student_row(1), student_row(1), student_row(0, email='new@example.com', roll_no='NEW')]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.upload(rows, '?dry_run=1')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data, {
+            'dry_run': True, 'total_rows': 3, 'valid_rows': 1, 'failed_rows': 2,
+            'errors': ["Row 3: Duplicate username 'bulk1'", 'Row 4: A user with this username already exists.'],
+        })
+        self.assertFalse(any(
+            query['sql'].startswith(('INSERT', 'UPDATE', 'DELETE')) for query in queries.captured_queries
+        ))
+        self.assertEqual(Student.objects.count(), 1)
+        self.assertFalse(BulkUploadTemplate.objects.exists())
+
+    def test_stale_job_is_requeued_and_resumes(self):
+        rows = [student_row(i) for i in range(4)]
+        StudentImporter(self.college, hash_workers=1).run(rows[:2])
+        job = self.create_job(rows, status='processing', processed_rows=2, failed_rows=0)
+        BulkUploadTemplate.objects.filter(id=job.id).update(
+            updated_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+
+        # A job with a recent heartbeat is left alone
+        busy = self.create_job(rows, status='processing')
+        claimed = bulk_jobs.claim_next_job()
+        self.assertEqual(claimed.id, job.id)
+        bulk_jobs.process_job(claimed)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed_rows, job.failed_rows), ('completed', 4, 0))
+        self.assertEqual(Student.objects.count(), 4)
+        self.assertEqual([row[:2] for row in self.report(job)[1:]], [['4', 'created'], ['5', 'created']])
+        self.assertEqual(BulkUploadTemplate.objects.get(id=busy.id).status, 'processing')
+        self.assertIsNone(bulk_jobs.claim_next_job())
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.college = College.objects.create(name='College', code='COL')
+        self.admin = User.objects.create_user(username='admin', password='x', role='college_admin')
+        CollegeAdmin.objects.create(user=self.admin, college=self.college)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def export(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_students_csv_with_filters(self):
+        other = College.objects.create(name='Other', code='OTH')
+        batch = Batch.objects.create(college=self.college, name='2024', year_of_joining=2024)
+        for i, (college, student_batch, is_active) in enumerate([
+            (self.college, batch, True), (self.college, batch, False), (self.college, None, True), (other, batch, True)
+        ]):
+            user = User.objects.create_user(username=f's{i}', email=f's{i}@example.com', role='student')
+            Student.objects.create(
+                user=user, college=college, batch=student_batch, roll_no=f'R{i}', is_active=is_active
+            )
+
+        rows = list(csv.DictReader(io.StringIO(self.export('/api/students/export/'))))
+        self.assertEqual([row['roll_no'] for row in rows], ['R0', 'R1', 'R2'])
+        self.assertEqual((rows[0]['username'], rows[0]['batch'], rows[2]['batch']), ('s0', '2024', ''))
+
+        rows = csv.DictReader(io.StringIO(self.export(f'/api/students/export/?batch_id={batch.id}&is_active=true')))
+        self.assertEqual([row['roll_no'] for row in rows], ['R0'])
+
+    def test_questions_ndjson_with_filters(self):
+        subject = Subject.objects.create(college=self.college, name='Anatomy')
+        module = Module.objects.create(subject=subject, name='Upper limb')
+        for i, difficulty in enumerate(['easy', 'hard', 'hard']):
+            QuestionBank.objects.create(
+                college=self.college, subject=subject, module=module if i else None,
+                question_text=f'Q{i}', difficulty=difficulty
+            )
+
+        lines = self.export('/api/questions/export/?file_format=ndjson&difficulty=hard').splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row['question_text'] for row in rows], ['Q1', 'Q2'])
+        self.assertEqual(list(rows[0]), list(views.QUESTION_EXPORT_COLUMNS))
+        self.assertEqual((rows[0]['subject'], rows[0]['module']), ('Anatomy', 'Upper limb'))
+
+        rows = csv.DictReader(io.StringIO(self.export(f'/api/questions/export/?module_id={module.id}')))
+        self.assertEqual([row['question_text'] for row in rows], ['Q1', 'Q2'])
+
+    def test_faculty_csv(self):
+        anatomy = Subject.objects.create(college=self.college, name='Anatomy')
+        physiology = Subject.objects.create(college=self.college, name='Physiology')
+        for i, department in enumerate(['Anatomy', 'Surgery']):
+            user = User.objects.create_user(username=f'f{i}', role='faculty')
+            faculty = Faculty.objects.create(
+                user=user, college=self.college, designation='professor', department=department
+            )
+            faculty.subjects.set([physiology, anatomy])
+
+        rows = list(csv.DictReader(io.StringIO(self.export('/api/faculties/export/?department=Anatomy'))))
+        self.assertEqual([(row['username'], row['subjects']) for row in rows], [('f0', 'Anatomy;Physiology')])
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.client.get('/api/students/export/?file_format=pdf').status_code, 400)
+        student = User.objects.create_user(username='student', role='student')
+        client = APIClient()
+        client.force_authenticate(student)
+        self.assertEqual(client.get('/api/students/export/').status_code, 403)
+
+    def test_xlsx(self):
+        user = User.objects.create_user(username='s1', email='s1@example.com', role='student')
+        Student.objects.create(user=user, college=self.college, roll_no='R1')
+        response = self.client.get('/api/students/export/?file_format=xlsx')
+        self.assertEqual(response.status_code, 200)
+        workbook = openpyxl.load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        rows = list(workbook.active.values)
+        self.assertEqual(rows[0], views.STUDENT_EXPORT_COLUMNS)
+        self.assertEqual(rows[1][:4], (user.student_profile.id, 'R1', 's1', 's1@example.com'))
+
+    def test_non_integer_ids_are_rejected(self):
+        for url in ('/api/questions/export/?subject_id=abc', '/api/questions/export/?module_id=1.5',
+                    '/api/students/export/?batch_id=abc'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 400, url)
+
+
+class BatchRegistrationTests(TestCase):
+    def setUp(self):
+        self.college = College.objects.create(name='College', code='COL')
+        self.admin = User.objects.create_user(username='admin', password='x', role='college_admin')
+        CollegeAdmin.objects.create(user=self.admin, college=self.college)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def register(self, items):
+        return self.client.post('/api/students/register/batch/', items, format='json')
+
+    def item(self, i, **values):
+        item = student_row(i, password_confirm='Passw0rd!23')
+        item.update(values)
+        return item
+
+    def test_all_created(self):
+        response = self.register([self.item(0), self.item(1)])
+        self.assertEqual(response.status_code, 201, response.data)
+        ids = dict(Student.objects.filter(college=self.college).values_list('roll_no', 'id'))
+        self.assertEqual(response.data, {
+            'created_count': 2, 'failed_count': 0,
+            'results': [
+                {'index': 0, 'status': 'created', 'id': ids['BULK0']},
+                {'index': 1, 'status': 'created', 'id': ids['BULK1']},
+            ],
+        })
+
+    def test_partial_failure_reports_each_index(self):
+        self.register([self.item(0)])
+        response = self.register([
+            self.item(1), self.item(2, password_confirm='other'), self.item(3, email='bulk0@example.com'),
+            self.item(1, email='again@example.com', roll_no='AGAIN'),
+        ])
+        self.assertEqual(response.status_code, 207, response.data)
+        self.assertEqual(response.data['created_count'], 1)
+        results = response.data['results']
+        self.assertEqual([result['status'] for result in results], ['created', 'failed', 'failed', 'failed'])
+        self.assertEqual(results[2]['details'], ['A user with this email already exists.'])
+        self.assertEqual(results[3]['details'], ["Duplicate username 'bulk1'"])
+
+    def test_passwords_are_hashed_in_threads(self):
+        with mock.patch('accounts.passwords.PARALLEL_THRESHOLD', 1), \
+                mock.patch('accounts.passwords.ProcessPoolExecutor', side_effect=AssertionError('forked')):
+            response = self.register([self.item(0), self.item(1)])
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertTrue(User.objects.get(username='bulk1').check_password('Passw0rd!23'))
+
+    def test_admin_without_college(self):
+        admin = User.objects.create_user(username='orphan', password='x', role='college_admin')
+        client = APIClient()
+        client.force_authenticate(admin)
+        response = client.post('/api/students/register/batch/', [self.item(0)], format='json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_nothing_created(self):
+        response = self.register([self.item(0, email='bad')])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['failed_count'], 1)
+        self.assertIn('email', response.data['results'][0]['details'])
+
+        for body in ({}, [], [self.item(i) for i in range(views.MAX_REGISTRATION_BATCH + 1)]):
+            self.assertEqual(self.register(body).status_code, 400)
+        self.assertFalse(Student.objects.exists())
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Every list and detail view declares ``max_queries``, the most queries a
+    GET may run (authentication aside) whatever the page size. The fixtures
+    hold more rows than one page so that a per-row query would blow it.
+    """
+    rows = 25
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.college = College.objects.create(name='College', code='COL')
+        cls.admin = User.objects.create_user(username='admin', password='x', role='college_admin')
+        CollegeAdmin.objects.create(user=cls.admin, college=cls.college)
+
+        cls.batch = Batch.objects.create(college=cls.college, year_of_joining=2024, name='Batch')
+        cls.subject = Subject.objects.create(college=cls.college, name='Anatomy', code='ANA')
+        cls.module = Module.objects.create(subject=cls.subject, name='Upper limb')
+        other_subject = Subject.objects.create(college=cls.college, name='Physiology', code='PHY')
+
+        for i in range(cls.rows):
+            batch = Batch.objects.create(college=cls.college, year_of_joining=2000 + i, name=f'Batch {i}')
+            batch.academic_years.create(year=1, start_date='2024-01-01', end_date='2024-12-31')
+            subject = Subject.objects.create(college=cls.college, name=f'Subject {i}')
+            Module.objects.create(subject=subject, name='Module')
+            Module.objects.create(subject=cls.subject, name=f'Module {i}')
+
+        for i in range(cls.rows):
+            user = User.objects.create_user(username=f'student{i}', role='student')
+            cls.student = Student.objects.create(
+                user=user, college=cls.college, batch=cls.batch, roll_no=f'R{i}'
+            )
+
+            user = User.objects.create_user(username=f'faculty{i}', role='faculty')
+            cls.faculty = Faculty.objects.create(user=user, college=cls.college, designation='professor')
+            cls.faculty.subjects.set([cls.subject, other_subject])
+
+            cls.question = QuestionBank.objects.create(
+                college=cls.college, subject=cls.subject, module=cls.module,
+                question_text=f'Question {i}', correct_answer='A', created_by=cls.admin
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def assertWithinBudget(self, view_class, url):
+        client = APIClient()
+        # A fresh instance, so no relation is cached from an earlier request
+        client.force_authenticate(User.objects.get(pk=self.admin.pk))
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertLessEqual(
+            len(queries), view_class.max_queries,
+            f'{view_class.__name__} ran {len(queries)} queries:\n'
+            + '\n'.join(query['sql'] for query in queries.captured_queries)
+        )
+
+    def test_college_views(self):
+        self.assertWithinBudget(views.CollegeListCreateView, '/api/colleges/')
+        self.assertWithinBudget(views.CollegeDetailView, f'/api/colleges/{self.college.id}/')
+
+    def test_student_views(self):
+        self.assertWithinBudget(views.StudentListCreateView, '/api/students/')
+        self.assertWithinBudget(views.StudentDetailView, f'/api/students/{self.student.id}/')
+
+    def test_faculty_views(self):
+        self.assertWithinBudget(views.FacultyListCreateView, '/api/faculties/')
+        self.assertWithinBudget(views.FacultyDetailView, f'/api/faculties/{self.faculty.id}/')
+
+    def test_faculty_profile(self):
+        # The user with every profile joined, plus one query for subjects
+        client = APIClient()
+        client.force_authenticate(self.faculty.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/profile/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(response.data['faculty_profile']['subjects'], ['Anatomy', 'Physiology'])
+        self.assertEqual(
+            [subject['name'] for subject in response.data['faculty_profile']['subjects_list']],
+            ['Anatomy', 'Physiology']
+        )
+
+    def test_question_views(self):
+        self.assertWithinBudget(views.QuestionBankListCreateView, '/api/questions/')
+        self.assertWithinBudget(views.QuestionBankDetailView, f'/api/questions/{self.question.id}/')
+
+    def test_batch_views(self):
+        self.assertWithinBudget(views.BatchListCreateView, '/api/batches/')
+        self.assertWithinBudget(views.BatchDetailView, f'/api/batches/{self.batch.id}/')
+
+    def test_subject_views(self):
+        self.assertWithinBudget(views.SubjectListCreateView, '/api/subjects/')
+        self.assertWithinBudget(views.SubjectDetailView, f'/api/subjects/{self.subject.id}/')
+
+    def test_module_views(self):
+        self.assertWithinBudget(views.ModuleListCreateView, '/api/modules/')
+        self.assertWithinBudget(views.ModuleDetailView, f'/api/modules/{self.module.id}/')
+
+
+class AnnotatedCountTests(TestCase):
+    def setUp(self):
+        college = College.objects.create(name='College', code='COL')
+        self.batch = Batch.objects.create(college=college, year_of_joining=2024, name='Batch')
+        self.subject = Subject.objects.create(college=college, name='Anatomy')
+        self.module = Module.objects.create(subject=self.subject, name='Upper limb')
+        for i in range(3):
+            user = User.objects.create_user(username=f'student{i}', role='student')
+            Student.objects.create(user=user, college=college, batch=self.batch, roll_no=f'R{i}')
+            QuestionBank.objects.create(
+                college=college, subject=self.subject, module=self.module, question_text=f'Q{i}'
+            )
+        Module.objects.create(subject=self.subject, name='Lower limb')
+
+    def test_annotated_and_live_counts_match(self):
+        cases = [
+            (BatchSerializer, Batch.objects.with_student_count(), self.batch, 'student_count', 3),
+            (SubjectSerializer, Subject.objects.with_module_count(), self.subject, 'module_count', 2),
+            (ModuleSerializer, Module.objects.with_question_count(), self.module, 'question_count', 3),
+        ]
+        for serializer_class, queryset, instance, field, expected in cases:
+            annotated = queryset.get(pk=instance.pk)
+            self.assertEqual(serializer_class(annotated).data[field], expected)
+            self.assertEqual(serializer_class(instance).data[field], expected)
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        college = College.objects.create(name='College', code='COL')
+        admin = User.objects.create_user(username='admin', password='x', role='college_admin')
+        CollegeAdmin.objects.create(user=admin, college=college)
+        for i in range(45):
+            user = User.objects.create_user(username=f'student{i}', role='student')
+            Student.objects.create(user=user, college=college, roll_no=f'R{i}')
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def test_walks_every_row_once_without_counting(self):
+        ids = []
+        url = '/api/students/?pagination=cursor'
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            self.assertFalse(any('COUNT(' in query['sql'] for query in queries.captured_queries))
+            ids += [student['id'] for student in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(ids, sorted(Student.objects.values_list('id', flat=True), reverse=True))
+
+    def test_page_numbers_by_default(self):
+        response = self.client.get('/api/students/')
+        self.assertEqual(response.data['count'], 45)
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        college = College.objects.create(name='College', code='COL')
+        admin = User.objects.create_user(username='admin', password='x', role='college_admin')
+        CollegeAdmin.objects.create(user=admin, college=college)
+        subject = Subject.objects.create(college=college, name='Anatomy')
+        self.question = QuestionBank.objects.create(
+            college=college, subject=subject, question_text='Q' * 500, explanation='Because', created_by=admin
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, queries.captured_queries[-1]['sql']
+
+    def test_fields_narrow_payload_and_query(self):
+        response, sql = self.get('/api/questions/?fields=id,difficulty,subject_name')
+        self.assertEqual(response.data['results'], [{'id': self.question.id, 'difficulty': 'medium', 'subject_name': 'Anatomy'}])
+        self.assertNotIn('explanation', sql)
+        self.assertNotIn('accounts_user', sql)
+
+    def test_exclude(self):
+        response, sql = self.get(f'/api/questions/{self.question.id}/?exclude=explanation,created_by_name')
+        self.assertNotIn('explanation', response.data)
+        self.assertEqual(response.data['college_name'], 'College')
+        self.assertNotIn('"explanation"', sql)
+
+    def test_compact_list(self):
+        response, sql = self.get('/api/questions/?compact=1')
+        item = response.data['results'][0]
+        self.assertEqual(item['subject_name'], 'Anatomy')
+        self.assertEqual(len(item['question_preview']), QuestionBankListSerializer.PREVIEW_LENGTH)
+        self.assertNotIn('option_a', item)
+        self.assertNotIn('option_a', sql)
+
+
+class ValuesSerializerParityTests(TestCase):
+    """
+    The values() fast path must render exactly the bytes the ModelSerializer
+    renders, including nulls, missing relations and non-ASCII text.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        college = College.objects.create(name='Collège Ünïon', code='CU')
+        admin = User.objects.create_user(username='admin', password='x', role='college_admin')
+        CollegeAdmin.objects.create(user=admin, college=college)
+        cls.admin = admin
+        batch = Batch.objects.create(college=college, year_of_joining=2024, name='Batch “A”')
+
+        for i in range(25):
+            user = User.objects.create_user(
+                username=f'student{i}', email=f's{i}@example.com', role='student',
+                first_name='Ана' if i % 2 else '', last_name=f'Lée {i}' if i % 3 else '',
+                phone_number=f'98{i}' if i % 4 else None,
+            )
+            Student.objects.create(
+                user=user, college=college, batch=batch if i % 5 else None, roll_no=f'R{i}',
+                phone_number='123' if i % 2 else None,
+                date_of_birth=datetime.date(2000, 1, i + 1) if i % 3 else None,
+                address='Line 1\nLine 2 \u2028' if i % 2 else None,
+                admission_date=datetime.date(2024, 6, 1),
+            )
+
+        for i in range(5):
+            subject = Subject.objects.create(
+                college=college, name=f'Subject {i}', code=f'S{i}' if i % 2 else None,
+                description='Δ' if i % 2 else None, is_active=bool(i % 2),
+            )
+            for j in range(i):
+                module = Module.objects.create(subject=subject, name=f'Module {j}', order=j)
+                for k in range(j):
+                    QuestionBank.objects.create(college=college, subject=subject, module=module, question_text='Q')
+
+    def setUp(self):
+        cache.clear()
+
+    def assertSameBytes(self, serializer_class, values_serializer_class, queryset):
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        actual = JSONRenderer().render(values_serializer_class(values_serializer_class.select(queryset)).data)
+        self.assertEqual(actual, expected)
+
+    def test_students(self):
+        queryset = Student.objects.select_related('user', 'college', 'batch').order_by('id')
+        self.assertSameBytes(StudentSerializer, StudentValuesSerializer, queryset)
+
+    def test_subjects(self):
+        queryset = Subject.objects.with_module_count().select_related('college').order_by('id')
+        self.assertSameBytes(SubjectSerializer, SubjectValuesSerializer, queryset)
+
+    def test_modules(self):
+        queryset = Module.objects.with_question_count().select_related('subject')
+        self.assertSameBytes(ModuleSerializer, ModuleValuesSerializer, queryset)
+
+    def test_list_endpoints(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        cases = [
+            ('/api/students/?pagination=cursor', StudentSerializer, Student.objects.order_by('-id')[:20]),
+            ('/api/subjects/', SubjectSerializer, Subject.objects.with_module_count()),
+            ('/api/modules/', ModuleSerializer, Module.objects.with_question_count()),
+        ]
+        for url, serializer_class, queryset in cases:
+            response = client.get(url)
+            self.assertEqual(
+                JSONRenderer().render(response.data['results']),
+                JSONRenderer().render(serializer_class(queryset, many=True).data),
+                url
+            )
+
+
+class FastJSONTests(TestCase):
+    payload = {
+        'aware': datetime.datetime(2024, 5, 1, 10, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        'offset': datetime.datetime(2024, 5, 1, 10, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=5, minutes=30))),
+        'naive': datetime.datetime(2024, 5, 1, 10, 30),
+        'now': timezone.now(),
+        'date': datetime.date(2024, 5, 1),
+        'time': datetime.time(9, 15, 0, 500),
+        'duration': datetime.timedelta(hours=1, seconds=1),
+        'decimal': decimal.Decimal('12.50'),
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'lazy': gettext_lazy('Invalid data'),
+        'errors': {'email': [ErrorDetail('A user with this email already exists.', code='invalid')]},
+        'text': 'Ünïcode “quotes” \u2028 \u2029 \x01 </script>',
+        'numbers': [0, -1, 2 ** 63 - 1, 1.5, 0.1, -0.0, True, False, None],
+        'nested': [{'id': 1, 'items': []}, {}],
+        2: 'int key',
+    }
+
+    def test_renders_same_bytes_as_json_renderer(self):
+        self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    def test_falls_back_for_indent_and_wide_integers(self):
+        for payload, media_type in [(self.payload, 'application/json; indent=4'), ({'big': 2 ** 70}, None)]:
+            self.assertEqual(
+                FastJSONRenderer().render(payload, media_type),
+                JSONRenderer().render(payload, media_type)
+            )
+
+    def test_without_orjson(self):
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    def test_parses_like_json_parser(self):
+        body = JSONRenderer().render({'a': [1, 2.5, 'é', None, {'b': 2 ** 70}], 'c': '\u2028'})
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+
+    def test_rejects_what_json_parser_rejects(self):
+        for body in [b'{"a": NaN}', b'{"a": 1', b'\xff']:
+            with self.assertRaises(ParseError) as expected:
+                JSONParser().parse(io.BytesIO(body))
+            with self.assertRaises(ParseError) as actual:
+                FastJSONParser().parse(io.BytesIO(body))
+            self.assertEqual(str(actual.exception), str(expected.exception))
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        college = College.objects.create(name='College', code='COL')
+        admin = User.objects.create_user(username='admin', password='x', role='college_admin')
+        CollegeAdmin.objects.create(user=admin, college=college)
+        self.subject = Subject.objects.create(college=college, name='Anatomy')
+        self.module = Module.objects.create(subject=self.subject, name='Upper limb')
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_not_modified_without_serializing(self):
+        for url in ['/api/subjects/', f'/api/subjects/{self.subject.id}/', '/api/modules/', '/api/batches/']:
+            etag = self.client.get(url)['ETag']
+            with CaptureQueriesContext(connection) as queries:
+                response = self.revalidate(url, etag)
+            self.assertEqual(response.status_code, 304, url)
+            self.assertEqual(response['ETag'], etag)
+            # The admin profile and the fingerprint
+            self.assertLessEqual(len(queries), 2, url)
+            # The fingerprint reads related rows through subqueries, not joins
+            fingerprint = queries.captured_queries[-1]['sql']
+            self.assertNotIn('GROUP BY', fingerprint, url)
+            self.assertNotRegex(fingerprint, 'JOIN "accounts_(student|academicyear|module|questionbank)"', url)
+
+    def test_related_changes_invalidate(self):
+        url = '/api/subjects/'
+        etag = self.client.get(url)['ETag']
+
+        other = Module.objects.create(subject=self.subject, name='Lower limb')
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+        etag = self.client.get(url)['ETag']
+
+        other.delete()
+        response = self.revalidate(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['module_count'], 1)
+
+    def test_academic_year_changes_invalidate_batches(self):
+        batch = Batch.objects.create(college=self.subject.college, name='2024', year_of_joining=2024)
+        year = batch.academic_years.create(year=1, start_date='2024-01-01', end_date='2024-12-31')
+        for url in ['/api/batches/', f'/api/batches/{batch.id}/']:
+            etag = self.client.get(url)['ETag']
+            year.label = f'First year {url}'
+            year.save()
+            self.assertEqual(self.revalidate(url, etag).status_code, 200, url)
+
+        etag = self.client.get('/api/batches/')['ETag']
+        year.delete()
+        self.assertEqual(self.revalidate('/api/batches/', etag).status_code, 200)
+
+    def test_rows_and_query_params_invalidate(self):
+        etag = self.client.get('/api/modules/')['ETag']
+        self.assertEqual(self.revalidate(f'/api/modules/?subject_id={self.subject.id}', etag).status_code, 200)
+
+        module_url = f'/api/modules/{self.module.id}/'
+        etag = self.client.get(module_url)['ETag']
+        self.module.name = 'Thorax'
+        self.module.save()
+        self.assertEqual(self.revalidate(module_url, etag).status_code, 200)
+
+    def test_missing_detail_is_404(self):
+        self.assertEqual(self.client.get('/api/subjects/999/').status_code, 404)
+
+
+class CurriculumCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.college = College.objects.create(name='College', code='COL')
+        admin = User.objects.create_user(username='admin', password='x', role='college_admin')
+        CollegeAdmin.objects.create(user=admin, college=self.college)
+        self.subject = Subject.objects.create(college=self.college, name='Anatomy')
+        self.module = Module.objects.create(subject=self.subject, name='Upper limb')
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def list_modules(self):
+        return self.client.get('/api/modules/').data['results']
+
+    def test_repeat_loads_are_cached(self):
+        self.list_modules()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/modules/')
+        # The admin profile and the ETag fingerprint, but not the list itself
+        self.assertFalse(any('"accounts_module"."name"' in query['sql'] for query in queries.captured_queries))
+
+    def test_saves_and_deletes_invalidate(self):
+        self.assertEqual(self.list_modules()[0]['question_count'], 0)
+
+        question = QuestionBank.objects.create(
+            college=self.college, subject=self.subject, module=self.module, question_text='Q'
+        )
+        self.assertEqual(self.list_modules()[0]['question_count'], 1)
+
+        question.delete()
+        self.assertEqual(self.list_modules()[0]['question_count'], 0)
+
+        self.subject.name = 'Gross anatomy'
+        self.subject.save()
+        self.assertEqual(self.list_modules()[0]['subject_name'], 'Gross anatomy')
+
+        Module.objects.create(subject=self.subject, name='Lower limb')
+        self.assertEqual(len(self.list_modules()), 2)
+        self.assertEqual(self.client.get('/api/subjects/').data['results'][0]['module_count'], 2)
+
+    def test_bulk_question_import_invalidates(self):
+        self.list_modules()
+        rows = [{
+            'subject': 'Anatomy', 'module': 'Upper limb', 'question_text': 'Q',
+            'option_a': 'a', 'option_b': 'b', 'correct_answer': 'A',
+        }]
+        result = QuestionImporter(self.college).run(rows)
+        self.assertEqual(result.failed_count, 0, result.error_messages)
+        self.assertEqual(self.list_modules()[0]['question_count'], 1)
+
+    def test_student_and_faculty_module_lists_are_cached(self):
+        for role in ('student', 'faculty'):
+            user = User.objects.create_user(username=role, password='x', role=role)
+            profile = {'roll_no': 'R1'} if role == 'student' else {'designation': 'professor'}
+            (Student if role == 'student' else Faculty).objects.create(user=user, college=self.college, **profile)
+            client = APIClient()
+            client.force_authenticate(user)
+            url = f'/api/modules/?subject_id={self.subject.id}'
+
+            self.assertEqual(len(client.get(url).data['results']), 1)
+            with CaptureQueriesContext(connection) as queries:
+                client.get(url)
+            self.assertFalse(any('"accounts_module"."name"' in query['sql'] for query in queries.captured_queries))
+
+            module = Module.objects.create(subject=self.subject, name=f'Module for {role}')
+            self.assertEqual(len(client.get(url).data['results']), 2)
+            module.delete()
+
+    def test_admin_cannot_list_another_colleges_modules(self):
+        other = College.objects.create(name='Other', code='OTH')
+        subject = Subject.objects.create(college=other, name='Physiology')
+        Module.objects.create(subject=subject, name='Renal')
+        response = self.client.get(f'/api/modules/?subject_id={subject.id}')
+        self.assertEqual(response.data['results'], [])
+
+
+class TenantScopingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.college = College.objects.create(name='College', code='COL')
+        self.other = College.objects.create(name='Other', code='OTH')
+        self.admin = User.objects.create_user(username='admin', password='x', role='college_admin')
+        CollegeAdmin.objects.create(user=self.admin, college=self.college)
+        self.faculty = User.objects.create_user(username='faculty', password='x', role='faculty')
+        Faculty.objects.create(user=self.faculty, college=self.college)
+        for college in (self.college, self.other):
+            subject = Subject.objects.create(college=college, name='Anatomy')
+            QuestionBank.objects.create(college=college, subject=subject, question_text='Q')
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(User.objects.get(pk=user.pk))
+        return client
+
+    def test_resolved_once_per_request(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client_for(self.admin).get('/api/subjects/')
+        self.assertEqual(len(response.data['results']), 1)
+        profile_queries = [query for query in queries.captured_queries if 'accounts_collegeadmin' in query['sql']]
+        self.assertEqual(len(profile_queries), 1)
+
+    def test_roles(self):
+        tenant = get_tenant(mock.Mock(spec=['user'], user=self.faculty))
+        self.assertEqual((tenant.role, tenant.college_id), ('faculty', self.college.id))
+        owner = User.objects.create_user(username='owner', password='x', role='product_owner')
+        self.assertTrue(get_tenant(mock.Mock(spec=['user'], user=owner)).is_product_owner)
+
+    def test_faculty_sees_own_college_questions(self):
+        response = self.client_for(self.faculty).get('/api/questions/')
+        self.assertEqual([item['college'] for item in response.data['results']], [self.college.id])
+        self.assertEqual(self.client_for(self.faculty).get('/api/subjects/').data['results'], [])
+
+    def test_create_saves_into_own_college(self):
+        client = self.client_for(self.admin)
+        response = client.post('/api/subjects/', {'name': 'Physiology', 'college': self.other.id})
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['college'], self.college.id)
+        self.assertEqual(response.data['college_name'], 'College')
+
+        # The posted college is reused rather than loaded again
+        with CaptureQueriesContext(connection) as queries:
+            client.post('/api/subjects/', {'name': 'Pathology', 'college': self.college.id})
+        college_queries = [query for query in queries.captured_queries if 'FROM "accounts_college"' in query['sql']]
+        self.assertEqual(len(college_queries), 1)
+
+    def test_students_cannot_create(self):
+        student = User.objects.create_user(username='student', password='x', role='student')
+        response = self.client_for(student).post('/api/subjects/', {'name': 'Physiology', 'college': self.college.id})
+        self.assertEqual(response.status_code, 403)
+
+
+class AnalyticsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.college = College.objects.create(name='College', code='COL')
+        self.empty = College.objects.create(name='Empty', code='EMP')
+        self.admin = User.objects.create_user(username='admin', password='x', role='college_admin')
+        CollegeAdmin.objects.create(user=self.admin, college=self.college)
+        batch = Batch.objects.create(college=self.college, name='B', year_of_joining=2024)
+        for i in range(3):
+            user = User.objects.create_user(username=f's{i}', password='x', role='student')
+            Student.objects.create(user=user, college=self.college, batch=batch, roll_no=f'R{i}', is_active=i > 0)
+        user = User.objects.create_user(username='f', password='x', role='faculty')
+        Faculty.objects.create(user=user, college=self.college, status='inactive')
+        self.subject = Subject.objects.create(college=self.college, name='Anatomy')
+        QuestionBank.objects.create(college=self.college, subject=self.subject, question_text='Q')
+        self.expected = {
+            'total_students': 3, 'total_faculty': 1, 'total_batches': 1, 'total_subjects': 1,
+            'total_questions': 1, 'active_students': 2, 'active_faculty': 0,
+        }
+
+    def get(self, user, url, max_queries):
+        client = APIClient()
+        client.force_authenticate(User.objects.get(pk=user.pk))
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertLessEqual(len(queries), max_queries)
+        return response.data
+
+    def test_college_analytics(self):
+        # The first load builds the counters from the source tables
+        data = self.get(self.admin, '/api/analytics/', 20)
+        # Later loads read the tenant, the counters and the question breakdown
+        self.assertEqual(self.get(self.admin, '/api/analytics/', 3), data)
+        self.assertEqual(data.pop('questions_by_subject'), [
+            {'subject': self.subject.id, 'subject_name': 'Anatomy', 'difficulty': 'medium', 'count': 1},
+        ])
+        self.assertEqual(data, self.expected)
+
+    def test_all_colleges_analytics(self):
+        owner = User.objects.create_user(username='owner', password='x', role='product_owner')
+        self.get(owner, '/api/analytics/colleges/', 20)
+        data = self.get(owner, '/api/analytics/colleges/', 2)
+        self.assertEqual(data, [
+            {'college': self.college.id, 'college_name': 'College', **self.expected},
+            {'college': self.empty.id, 'college_name': 'Empty', **dict.fromkeys(self.expected, 0)},
+        ])
+
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        self.assertEqual(client.get('/api/analytics/colleges/').status_code, 403)
+
+    def assertCountersMatchSource(self):
+        self.assertEqual(college_counters(self.college.id), college_metrics(self.college.id))
+        expected = QuestionBank.objects.filter(college=self.college).values(
+            'subject_id', 'difficulty'
+        ).annotate(count=Count('id')).order_by()
+        self.assertCountEqual(
+            [(row['subject'], row['difficulty'], row['count']) for row in question_breakdown(self.college.id)],
+            [(row['subject_id'], row['difficulty'], row['count']) for row in expected]
+        )
+
+    def test_counters_follow_saves_and_deletes(self):
+        college_counters(self.college.id)
+
+        student = Student.objects.get(roll_no='R1')
+        student.is_active = False
+        student.save()
+        student.college = self.empty
+        student.save()
+        Student.objects.get(roll_no='R0').delete()
+        faculty = Faculty.objects.get()
+        faculty.status = 'active'
+        faculty.save(update_fields=['status'])
+        question = QuestionBank.objects.get()
+        question.difficulty = 'hard'
+        question.save()
+        physiology = Subject.objects.create(college=self.college, name='Physiology')
+        QuestionBank.objects.create(college=self.college, subject=physiology, question_text='Q')
+        Batch.objects.create(college=self.college, name='C', year_of_joining=2025)
+        self.assertCountersMatchSource()
+
+        # Deleting a subject deletes its questions and their counters
+        physiology.delete()
+        self.assertCountersMatchSource()
+
+    def test_cascading_deletes_are_counted_in_bulk(self):
+        physiology = Subject.objects.create(college=self.college, name='Physiology')
+        module = Module.objects.create(subject=physiology, name='Heart')
+        QuestionBank.objects.bulk_create([
+            QuestionBank(college=self.college, subject=physiology, module=module, question_text=f'Q{i}',
+                         difficulty=('easy', 'hard')[i % 2])
+            for i in range(200)
+        ])
+        college_counters(self.college.id)
+
+        with CaptureQueriesContext(connection) as queries:
+            physiology.delete()
+        # Its modules and questions are counted with grouped queries, not row by row
+        self.assertLess(len(queries), 30)
+        self.assertCountersMatchSource()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.college.delete()
+        self.assertLess(len(queries), 40)
+        self.assertEqual(question_breakdown(self.college.id), [])
+
+    def test_bulk_imports_are_counted(self):
+        college_counters(self.college.id)
+        rows = [{
+            'subject': 'Anatomy', 'question_text': f'Q{i}', 'difficulty': 'easy',
+            'option_a': 'a', 'option_b': 'b', 'correct_answer': 'A',
+        } for i in range(3)]
+        result = QuestionImporter(self.college).run(rows)
+        self.assertEqual(result.failed_count, 0, result.error_messages)
+
+        rows = [{
+            'username': f'bulk{i}', 'email': f'bulk{i}@example.com', 'first_name': 'B',
+            'last_name': str(i), 'password': 'Passw0rd!23', 'roll_no': f'BULK{i}',
+        } for i in range(2)]
+        result = StudentImporter(self.college).run(rows)
+        self.assertEqual(result.failed_count, 0, result.error_messages)
+        self.assertCountersMatchSource()
+
+    def test_reconcile_command_fixes_drift(self):
+        college_counters(self.college.id)
+        # Queryset updates send no signals
+        Student.objects.update(is_active=True)
+        self.assertNotEqual(college_counters(self.college.id), college_metrics(self.college.id))
+
+        out = io.StringIO()
+        call_command('reconcile_analytics_counters', stdout=out)
+        self.assertIn('active_students 2 -> 3', out.getvalue())
+        self.assertCountersMatchSource()
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        self.college = College.objects.create(name='College', code='COL')
+        self.admin = User.objects.create_user(username='admin', password='x', role='college_admin')
+        CollegeAdmin.objects.create(user=self.admin, college=self.college)
+        self.batch = Batch.objects.create(college=self.college, name='2024', year_of_joining=2024)
+        self.subject = Subject.objects.create(college=self.college, name='Anatomy')
+        self.author = User.objects.create_user(
+            username='author', password='x', role='faculty', first_name='Priya', last_name='Raman'
+        )
+        for i, admitted in enumerate(['2024-06-03', '2024-06-20', '2024-07-01']):
+            self.add_student(i, datetime.date.fromisoformat(admitted))
+        Student.objects.update(created_at=datetime.datetime(2024, 7, 2, tzinfo=datetime.timezone.utc))
+        for created, difficulty in [('2024-06-03', 'easy'), ('2024-06-04', 'easy'), ('2024-06-12', 'hard')]:
+            self.add_question(created, difficulty)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def add_student(self, i, admission_date):
+        user = User.objects.create_user(username=f's{i}', password='x', role='student')
+        Student.objects.create(
+            user=user, college=self.college, batch=self.batch, roll_no=f'R{i}', admission_date=admission_date
+        )
+
+    def add_question(self, created, difficulty):
+        question = QuestionBank.objects.create(
+            college=self.college, subject=self.subject, question_text='Q', difficulty=difficulty,
+            created_by=self.author
+        )
+        created_at = datetime.datetime.fromisoformat(created).replace(hour=12, tzinfo=datetime.timezone.utc)
+        QuestionBank.objects.filter(pk=question.pk).update(created_at=created_at)
+
+    def trend(self, kind, **params):
+        params.setdefault('start', '2024-01-01')
+        params.setdefault('end', '2024-12-31')
+        response = self.client.get(f'/api/analytics/trends/{kind}/', params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [
+            (str(row['period']),) + tuple(value for key, value in row.items() if key != 'period')
+            for row in response.data['results']
+        ]
+
+    def test_trends(self):
+        rollups.build_rollups()
+        self.assertEqual(self.trend('admissions'), [
+            ('2024-06-01', self.batch.id, '2024', 2),
+            ('2024-07-01', self.batch.id, '2024', 1),
+        ])
+        self.assertEqual(self.trend('questions'), [
+            ('2024-06-03', self.subject.id, 'Anatomy', 'easy', 2),
+            ('2024-06-10', self.subject.id, 'Anatomy', 'hard', 1),
+        ])
+        self.assertEqual(self.trend('questions', interval='day', difficulty='hard'), [
+            ('2024-06-12', self.subject.id, 'Anatomy', 'hard', 1),
+        ])
+        self.assertEqual(self.trend('authors'), [('2024-06-01', self.author.id, 'Priya Raman', 3)])
+
+    def test_incremental_build_recounts_only_touched_days(self):
+        rollups.build_rollups()
+        # A backdated admission and a question created today
+        self.add_student(9, datetime.date(2024, 6, 3))
+        QuestionBank.objects.create(college=self.college, subject=self.subject, question_text='Q')
+
+        self.assertEqual(rollups.build_rollups(), {'admissions': 1, 'questions': 1})
+        self.assertEqual(self.trend('admissions')[0][-1], 3)
+        today = timezone.localdate()
+        self.assertEqual(
+            self.trend('questions', start=str(today), end=str(today), interval='day'),
+            [(str(today), self.subject.id, 'Anatomy', 'medium', 1)]
+        )
+
+    def test_full_rebuild_drops_deleted_rows(self):
+        rollups.build_rollups()
+        QuestionBank.objects.filter(difficulty='hard').delete()
+        call_command('build_analytics_rollups', '--full', stdout=io.StringIO())
+        self.assertEqual(self.trend('questions'), [('2024-06-03', self.subject.id, 'Anatomy', 'easy', 2)])
+
+    def test_students_without_a_day_are_skipped(self):
+        # Legacy rows may have neither an admission date nor a created_at
+        self.add_student(9, None)
+        Student.objects.filter(roll_no='R9').update(created_at=None)
+        self.assertEqual(rollups.build_rollups(), {'admissions': 3, 'questions': 3})
+        call_command('build_analytics_rollups', '--full', stdout=io.StringIO())
+        self.assertEqual(self.trend('admissions'), [
+            ('2024-06-01', self.batch.id, '2024', 2),
+            ('2024-07-01', self.batch.id, '2024', 1),
+        ])
+
+    def test_invalid_requests(self):
+        for params in ({'interval': 'year'}, {'start': '2024-13-01'}, {'start': '2025-01-01'}):
+            response = self.client.get('/api/analytics/trends/questions/', {'end': '2024-12-31', **params})
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get('/api/analytics/trends/admissions/?batch_id=abc').status_code, 400)
+        self.assertEqual(self.client.get('/api/analytics/trends/questions/?subject_id=abc').status_code, 400)
+
+        client = APIClient()
+        client.force_authenticate(self.author)
+        self.assertEqual(client.get('/api/analytics/trends/authors/').status_code, 403)
+
+
+class CoverageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.college = College.objects.create(name='College', code='COL')
+        admin = User.objects.create_user(username='admin', password='x', role='college_admin')
+        CollegeAdmin.objects.create(user=admin, college=self.college)
+        self.anatomy = Subject.objects.create(college=self.college, name='Anatomy')
+        self.physiology = Subject.objects.create(college=self.college, name='Physiology')
+        self.upper_limb = Module.objects.create(subject=self.anatomy, name='Upper limb', order=1)
+        self.lower_limb = Module.objects.create(subject=self.anatomy, name='Lower limb', order=2)
+        for module, difficulty, question_type in [
+            (self.upper_limb, 'easy', 'mcq'), (self.upper_limb, 'easy', 'mcq'),
+            (self.upper_limb, 'hard', 'true_false'), (None, 'medium', 'fill_blank'),
+        ]:
+            QuestionBank.objects.create(
+                college=self.college, subject=self.anatomy, module=module, question_text='Q',
+                difficulty=difficulty, question_type=question_type
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.get(pk=admin.pk))
+
+    def get(self, max_queries):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/questions/coverage/')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertLessEqual(len(queries), max_queries)
+        return response.data
+
+    def test_matrix(self):
+        data = self.get(4)
+        self.assertEqual(data['difficulties'], ['easy', 'medium', 'hard'])
+        self.assertEqual(data['question_types'], ['mcq', 'true_false', 'fill_blank'])
+        self.assertEqual(data['total'], 4)
+        anatomy, physiology = data['subjects']
+        self.assertEqual(anatomy['counts'], [[2, 0, 0], [0, 0, 1], [0, 1, 0]])
+        self.assertEqual(
+            [(module['id'], module['name'], module['total']) for module in anatomy['modules']],
+            [(self.upper_limb.id, 'Upper limb', 3), (self.lower_limb.id, 'Lower limb', 0), (None, None, 1)]
+        )
+        self.assertEqual(anatomy['modules'][0]['counts'], [[2, 0, 0], [0, 0, 0], [0, 1, 0]])
+        self.assertEqual((physiology['name'], physiology['total'], physiology['modules']), ('Physiology', 0, []))
+
+    def test_cached_until_questions_change(self):
+        self.get(4)
+        # Only the tenant lookup
+        self.assertEqual(self.get(1)['total'], 4)
+
+        QuestionBank.objects.create(college=self.college, subject=self.physiology, question_text='Q')
+        data = self.get(4)
+        self.assertEqual((data['total'], data['subjects'][1]['total']), (5, 1))
+
+    def test_access(self):
+        owner = User.objects.create_user(username='owner', password='x', role='product_owner')
+        student = User.objects.create_user(username='student', password='x', role='student')
+        client = APIClient()
+        client.force_authenticate(owner)
+        self.assertEqual(client.get('/api/questions/coverage/').status_code, 400)
+        response = client.get('/api/questions/coverage/', {'college_id': self.college.id})
+        self.assertEqual(response.data['total'], 4)
+        client.force_authenticate(student)
+        self.assertEqual(client.get('/api/questions/coverage/').status_code, 403)
+
+
+class SingleFlightCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cache = SingleFlightCache('test', timeout=60)
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return {'calls': self.calls}
+
+    def expire(self, key):
+        value, compute_time, _ = cache.get(self.cache.make_key(key))
+        cache.set(self.cache.make_key(key), (value, compute_time, time.time() - 1))
+
+    def test_hits_and_misses(self):
+        self.assertEqual(self.cache.get_or_compute('k', self.compute), {'calls': 1})
+        self.assertEqual(self.cache.get_or_compute('k', self.compute), {'calls': 1})
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['recomputes']), (1, 1, 1))
+        self.assertIsNotNone(stats['avg_recompute_ms'])
+
+        self.expire('k')
+        self.assertEqual(self.cache.get_or_compute('k', self.compute), {'calls': 2})
+
+    def test_serves_stale_value_while_another_worker_recomputes(self):
+        self.cache.get_or_compute('k', self.compute)
+        self.expire('k')
+        cache.add('test:lock:k', 1)
+        self.assertEqual(self.cache.get_or_compute('k', self.compute), {'calls': 1})
+        self.assertEqual(self.cache.stats()['stale_hits'], 1)
+
+        cache.delete('test:lock:k')
+        self.assertEqual(self.cache.get_or_compute('k', self.compute), {'calls': 2})
+        # The lock is released after recomputing
+        self.assertTrue(cache.add('test:lock:k', 1))
+
+    def test_serves_stale_value_when_recomputing_fails(self):
+        self.cache.get_or_compute('k', self.compute)
+        self.expire('k')
+
+        def fail():
+            raise DatabaseError('gone away')
+
+        with self.assertLogs('accounts.stampede', 'ERROR'):
+            self.assertEqual(self.cache.get_or_compute('k', fail), {'calls': 1})
+        # The lock is released, so the next request tries again
+        self.assertEqual(self.cache.get_or_compute('k', self.compute), {'calls': 2})
+
+        # Without a cached copy the error is raised
+        with self.assertRaises(DatabaseError):
+            self.cache.get_or_compute('other', fail)
+        self.assertTrue(cache.add('test:lock:other', 1))
+
+    def test_early_refresh(self):
+        self.cache.get_or_compute('k', self.compute)
+        # Expires in 5 seconds and took 10 seconds to compute last time
+        cache.set(self.cache.make_key('k'), ({'calls': 1}, 10.0, time.time() + 5))
+        with mock.patch('accounts.stampede.random.random', return_value=0.0):
+            self.assertEqual(self.cache.get_or_compute('k', self.compute), {'calls': 1})
+        with mock.patch('accounts.stampede.random.random', return_value=0.5):
+            self.assertEqual(self.cache.get_or_compute('k', self.compute), {'calls': 2})
+
+    def test_stats_endpoint(self):
+        owner = User.objects.create_user(username='owner', password='x', role='product_owner')
+        client = APIClient()
+        client.force_authenticate(owner)
+        client.get('/api/analytics/colleges/')
+        client.get('/api/analytics/colleges/')
+        stats = client.get('/api/analytics/cache-stats/').data
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(client.delete('/api/analytics/cache-stats/').status_code, 204)
+        self.assertEqual(client.get('/api/analytics/cache-stats/').data['hits'], 0)
+
+        student = User.objects.create_user(username='student', password='x', role='student')
+        client.force_authenticate(student)
+        self.assertEqual(client.get('/api/analytics/cache-stats/').status_code, 403)
@@ -12,6 +12,7 @@ urlpatterns = [
     path('logout/', views.logout_user, name='logout'),
     path('profile/', views.user_profile, name='profile'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('activate/', views.activate_account, name='activate-account'),
     
     # College management
     path('colleges/', views.CollegeListCreateView.as_view(), name='college-list'),
@@ -24,14 +25,25 @@ urlpatterns = [
     # Student management
     path('students/', views.StudentListCreateView.as_view(), name='student-list'),
     path('students/<int:pk>/', views.StudentDetailView.as_view(), name='student-detail'),
+    path('students/export/', views.export_students, name='export-students'),
     path('students/register/', views.register_student, name='register-student'),
+    path('students/register/batch/', views.register_students_batch, name='register-students-batch'),
     path('students/bulk-upload/', views.bulk_upload_students, name='bulk-upload-students'),
     path('students/download-template/', views.download_student_template, name='download-student-template'),
+    path('students/pending-activations/', views.download_pending_activations, name='pending-activations'),
+    
+    # Bulk upload jobs
+    path('bulk-uploads/<int:pk>/', views.bulk_upload_status, name='bulk-upload-status'),
+    path('bulk-uploads/<int:pk>/report/', views.bulk_upload_report, name='bulk-upload-report'),
     
     # Faculty management
     path('faculties/', views.FacultyListCreateView.as_view(), name='faculty-list'),
     path('faculties/<int:pk>/', views.FacultyDetailView.as_view(), name='faculty-detail'),
+    path('faculties/export/', views.export_faculty, name='export-faculty'),
     path('faculties/register/', views.register_faculty, name='register-faculty'),
+    path('faculties/register/batch/', views.register_faculty_batch, name='register-faculty-batch'),
+    path('faculties/bulk-upload/', views.bulk_upload_faculty, name='bulk-upload-faculty'),
+    path('faculties/download-template/', views.download_faculty_template, name='download-faculty-template'),
     
     # Subject management
     path('subjects/', views.SubjectListCreateView.as_view(), name='subject-list'),
@@ -44,7 +56,16 @@ urlpatterns = [
     # Question Bank management
     path('questions/', views.QuestionBankListCreateView.as_view(), name='question-list'),
     path('questions/<int:pk>/', views.QuestionBankDetailView.as_view(), name='question-detail'),
+    path('questions/export/', views.export_questions, name='export-questions'),
+    path('questions/coverage/', views.question_coverage, name='question-coverage'),
+    path('questions/bulk-upload/', views.bulk_upload_questions, name='bulk-upload-questions'),
+    path('questions/download-template/', views.download_question_template, name='download-question-template'),
     
     # Analytics
     path('analytics/', views.college_analytics, name='college-analytics'),
+    path('analytics/colleges/', views.all_colleges_analytics, name='all-colleges-analytics'),
+    path('analytics/cache-stats/', views.analytics_cache_stats, name='analytics-cache-stats'),
+    path('analytics/trends/admissions/', views.admissions_trend, name='admissions-trend'),
+    path('analytics/trends/questions/', views.questions_trend, name='questions-trend'),
+    path('analytics/trends/authors/', views.question_authors_trend, name='question-authors-trend'),
 ]
@@ -1,24 +1,43 @@
-from rest_framework import status, generics, permissions
+from rest_framework import status, generics, permissions, serializers
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
+from django.conf import settings
 from django.contrib.auth import authenticate
 from django.db import transaction
-from django.http import HttpResponse
+from django.db.models import Prefetch, Q
+from django.http import HttpResponse, FileResponse
+from django.utils import timezone
 import csv
-import io
+import datetime
 from .models import (
     User, College, CollegeAdmin, Batch, AcademicYear, Student, Faculty, Subject, 
-    Module, QuestionBank, BulkUploadTemplate
+    Module, QuestionBank, BulkUploadTemplate, ActivationToken, AdmissionRollup, QuestionRollup
 )
 from .serializers import (
     UserRegistrationSerializer, UserLoginSerializer, UserProfileSerializer,
     CollegeSerializer, BatchSerializer, BatchCreateSerializer, AcademicYearSerializer,
     StudentSerializer, StudentUpdateSerializer, FacultySerializer, SubjectSerializer,
-    ModuleSerializer, QuestionBankSerializer, BulkUploadTemplateSerializer,
-    StudentRegistrationSerializer, FacultyRegistrationSerializer, FacultyUpdateSerializer
+    ModuleSerializer, QuestionBankSerializer, QuestionBankListSerializer, BulkUploadTemplateSerializer,
+    StudentRegistrationSerializer, FacultyRegistrationSerializer, FacultyUpdateSerializer,
+    StudentBatchRegistrationSerializer, FacultyBatchRegistrationSerializer,
+    AccountActivationSerializer, faculty_subjects_prefetch
 )
+from .coverage import college_coverage
+from .counters import college_counters, counters_by_college, question_breakdown
+from .bulk_import import DEFAULT_CHUNK_SIZE, StudentImporter, FacultyImporter, QuestionImporter
+from .bulk_jobs import IMPORTERS
+from .exports import export_format_error, export_response, iterate_in_chunks
+from .csv_stream import UnsupportedEncoding, read_csv_header, iter_csv_rows, scan_csv
+from .fast_serializers import StudentValuesSerializer, SubjectValuesSerializer, ModuleValuesSerializer
+from .mixins import ConditionalGetMixin, CurriculumCacheMixin, SparseFieldsetMixin, ValuesListMixin
+from .pagination import CursorPaginationMixin
+from .passwords import PasswordHasher, generate_activation_token, hash_activation_token
+from .rollups import INTERVALS, series
+from .stampede import SingleFlightCache
+from .tenancy import TenantScopedMixin, get_tenant
 
 
 @api_view(['POST'])
@@ -106,7 +125,13 @@ def user_profile(request):
     """
     Get current user profile
     """
-    serializer = UserProfileSerializer(request.user)
+    user = User.objects.select_related(
+        'college_admin_profile__college', 'student_profile__college', 'student_profile__batch',
+        'faculty_profile__college'
+    ).prefetch_related(
+        faculty_subjects_prefetch('faculty_profile__subjects')
+    ).get(pk=request.user.pk)
+    serializer = UserProfileSerializer(user)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -133,84 +158,104 @@ def logout_user(request):
         }, status=status.HTTP_200_OK)
 
 
+def _integer_param_error(request, *names):
+    """
+    Return a 400 response if one of the query params ``names`` is given but
+    is not an integer id, else None.
+    """
+    for name in names:
+        value = request.query_params.get(name)
+        if value and not value.isdigit():
+            return Response({
+                'error': f'{name} must be an integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+    return None
+
+
 # College Management Views
-class CollegeListCreateView(generics.ListCreateAPIView):
+class CollegeListCreateView(TenantScopedMixin, generics.ListCreateAPIView):
     queryset = College.objects.all()
     serializer_class = CollegeSerializer
     permission_classes = [permissions.IsAuthenticated]
+    max_queries = 3
+    # College admins can only see their own college
+    tenant_field = 'id'
 
     def get_queryset(self):
-        # Only product owners can see all colleges
-        if self.request.user.role == 'product_owner':
-            return College.objects.all()
-        # College admins can only see their own college
-        elif self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            return College.objects.filter(id=self.request.user.college_admin_profile.college.id)
-        return College.objects.none()
+        return self.scope_queryset(College.objects.all())
 
 
 class CollegeDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = College.objects.all()
     serializer_class = CollegeSerializer
     permission_classes = [permissions.IsAuthenticated]
+    max_queries = 1
 
 
 # Batch Management Views
-class BatchListCreateView(generics.ListCreateAPIView):
+# Related rows shown in batch responses (student_count, college_name, academic_years)
+BATCH_ETAG_RELATIONS = {
+    'students': (Student, 'batch_id', 'pk'),
+    'academic_years': (AcademicYear, 'batch_id', 'pk'),
+    'college': (College, 'pk', 'college_id'),
+}
+
+
+class BatchListCreateView(TenantScopedMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    max_queries = 5
+    etag_relations = BATCH_ETAG_RELATIONS
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return BatchCreateSerializer
         return BatchSerializer
 
+    def get_scoped_queryset(self):
+        return self.scope_queryset(Batch.objects.all())
+
     def get_queryset(self):
-        if self.request.user.role == 'product_owner':
-            return Batch.objects.all()
-        elif self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            return Batch.objects.filter(college=self.request.user.college_admin_profile.college)
-        return Batch.objects.none()
+        return self.get_scoped_queryset().with_student_count().select_related('college').prefetch_related('academic_years')
 
     def perform_create(self, serializer):
-        if self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            serializer.save(college=self.request.user.college_admin_profile.college)
+        self.save_for_tenant(serializer)
 
 
-class BatchDetailView(generics.RetrieveUpdateDestroyAPIView):
+class BatchDetailView(TenantScopedMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    max_queries = 4
+    etag_relations = BATCH_ETAG_RELATIONS
 
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
             return BatchCreateSerializer
         return BatchSerializer
 
+    def get_scoped_queryset(self):
+        return self.scope_queryset(Batch.objects.all())
+
     def get_queryset(self):
-        if self.request.user.role == 'product_owner':
-            return Batch.objects.all()
-        elif self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            return Batch.objects.filter(college=self.request.user.college_admin_profile.college)
-        return Batch.objects.none()
+        return self.get_scoped_queryset().with_student_count().select_related('college').prefetch_related('academic_years')
 
 
 # Student Management Views
-class StudentListCreateView(generics.ListCreateAPIView):
+class StudentListCreateView(TenantScopedMixin, ValuesListMixin, CursorPaginationMixin, generics.ListCreateAPIView):
     serializer_class = StudentSerializer
+    values_serializer_class = StudentValuesSerializer
     permission_classes = [permissions.IsAuthenticated]
+    max_queries = 3
 
     def get_queryset(self):
-        if self.request.user.role == 'product_owner':
-            return Student.objects.all()
-        elif self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            return Student.objects.filter(college=self.request.user.college_admin_profile.college)
-        return Student.objects.none()
+        students = Student.objects.select_related('user', 'college', 'batch')
+        return self.scope_queryset(students)
 
     def perform_create(self, serializer):
-        if self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            serializer.save(college=self.request.user.college_admin_profile.college)
+        self.save_for_tenant(serializer)
 
 
-class StudentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class StudentDetailView(TenantScopedMixin, generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    max_queries = 2
 
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
@@ -218,11 +263,8 @@ class StudentDetailView(generics.RetrieveUpdateDestroyAPIView):
         return StudentSerializer
 
     def get_queryset(self):
-        if self.request.user.role == 'product_owner':
-            return Student.objects.all()
-        elif self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            return Student.objects.filter(college=self.request.user.college_admin_profile.college)
-        return Student.objects.none()
+        students = Student.objects.select_related('user', 'college', 'batch')
+        return self.scope_queryset(students)
     
     def perform_destroy(self, instance):
         """Custom delete to properly handle user and student deletion"""
@@ -239,9 +281,65 @@ class StudentDetailView(generics.RetrieveUpdateDestroyAPIView):
             raise Exception(f"Failed to delete student: {str(e)}")
 
 
+STUDENT_EXPORT_COLUMNS = (
+    'id', 'roll_no', 'username', 'email', 'first_name', 'last_name', 'phone_number',
+    'batch_id', 'batch', 'date_of_birth', 'admission_date', 'address',
+    'emergency_contact', 'emergency_contact_name', 'is_active', 'created_at'
+)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def export_students(request):
+    """
+    Stream the student roster as CSV (default), NDJSON or XLSX, optionally
+    filtered by batch_id and is_active
+    """
+    tenant = get_tenant(request)
+    if tenant.is_product_owner:
+        students = Student.objects.all()
+    elif tenant.role == 'college_admin' and tenant.college_id:
+        students = Student.objects.filter(college_id=tenant.college_id)
+    else:
+        return Response({
+            'error': 'Only college admins can export students'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    file_format = request.query_params.get('file_format', 'csv')
+    format_error = export_format_error(file_format)
+    if format_error:
+        return Response({
+            'error': format_error
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    param_error = _integer_param_error(request, 'batch_id')
+    if param_error:
+        return param_error
+    
+    if request.query_params.get('batch_id'):
+        students = students.filter(batch_id=request.query_params['batch_id'])
+    if request.query_params.get('is_active') in ('true', 'false'):
+        students = students.filter(is_active=request.query_params['is_active'] == 'true')
+    
+    students = students.select_related('user', 'batch')
+    rows = (
+        [
+            student.id, student.roll_no, student.user.username, student.user.email,
+            student.user.first_name, student.user.last_name, student.phone_number,
+            student.batch_id, student.batch.name if student.batch else '',
+            student.date_of_birth, student.admission_date, student.address,
+            student.emergency_contact, student.emergency_contact_name,
+            student.is_active, student.created_at,
+        ]
+        for student in iterate_in_chunks(students)
+    )
+    return export_response(STUDENT_EXPORT_COLUMNS, rows, 'students', file_format)
+
+
 # Faculty Management Views
-class FacultyListCreateView(generics.ListCreateAPIView):
+class FacultyListCreateView(TenantScopedMixin, CursorPaginationMixin, generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    max_queries = 4
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -249,22 +347,20 @@ class FacultyListCreateView(generics.ListCreateAPIView):
         return FacultySerializer
 
     def get_queryset(self):
-        if self.request.user.role == 'product_owner':
-            return Faculty.objects.all()
-        elif self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            return Faculty.objects.filter(college=self.request.user.college_admin_profile.college)
-        return Faculty.objects.none()
+        faculties = Faculty.objects.select_related('user', 'college').prefetch_related(faculty_subjects_prefetch())
+        return self.scope_queryset(faculties)
 
     def perform_create(self, serializer):
-        if self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
+        if self.is_scoped_tenant():
             # The FacultyRegistrationSerializer will get college_id from context
             serializer.save()
         else:
-            raise PermissionError("Only college admins can create faculty")
+            raise PermissionDenied("Only college admins can create faculty")
 
 
-class FacultyDetailView(generics.RetrieveUpdateDestroyAPIView):
+class FacultyDetailView(TenantScopedMixin, generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    max_queries = 3
 
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
@@ -272,11 +368,8 @@ class FacultyDetailView(generics.RetrieveUpdateDestroyAPIView):
         return FacultySerializer
 
     def get_queryset(self):
-        if self.request.user.role == 'product_owner':
-            return Faculty.objects.all()
-        elif self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            return Faculty.objects.filter(college=self.request.user.college_admin_profile.college)
-        return Faculty.objects.none()
+        faculties = Faculty.objects.select_related('user', 'college').prefetch_related(faculty_subjects_prefetch())
+        return self.scope_queryset(faculties)
     
     def perform_destroy(self, instance):
         """Custom delete to properly handle user and faculty deletion"""
@@ -293,33 +386,96 @@ class FacultyDetailView(generics.RetrieveUpdateDestroyAPIView):
             raise Exception(f"Failed to delete faculty: {str(e)}")
 
 
+FACULTY_EXPORT_COLUMNS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'phone_number', 'designation',
+    'status', 'department', 'specialization', 'experience_years', 'education_details',
+    'subjects', 'created_at'
+)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def export_faculty(request):
+    """
+    Stream the faculty roster as CSV (default), NDJSON or XLSX, optionally
+    filtered by status and department. Subjects are joined with semicolons.
+    """
+    tenant = get_tenant(request)
+    if tenant.is_product_owner:
+        faculties = Faculty.objects.all()
+    elif tenant.role == 'college_admin' and tenant.college_id:
+        faculties = Faculty.objects.filter(college_id=tenant.college_id)
+    else:
+        return Response({
+            'error': 'Only college admins can export faculty'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    file_format = request.query_params.get('file_format', 'csv')
+    format_error = export_format_error(file_format)
+    if format_error:
+        return Response({
+            'error': format_error
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    for param in ('status', 'department'):
+        value = request.query_params.get(param)
+        if value:
+            faculties = faculties.filter(**{param: value})
+    
+    # Subjects are prefetched once per chunk of faculty rows
+    faculties = faculties.select_related('user').prefetch_related(
+        Prefetch('subjects', queryset=Subject.objects.only('id', 'name').order_by('name'))
+    )
+    rows = (
+        [
+            faculty.id, faculty.user.username, faculty.user.email, faculty.user.first_name,
+            faculty.user.last_name, faculty.user.phone_number, faculty.designation,
+            faculty.status, faculty.department, faculty.specialization,
+            faculty.experience_years, faculty.education_details,
+            ';'.join(subject.name for subject in faculty.subjects.all()), faculty.created_at,
+        ]
+        for faculty in iterate_in_chunks(faculties)
+    )
+    return export_response(FACULTY_EXPORT_COLUMNS, rows, 'faculty', file_format)
+
+
 # Subject Management Views
-class SubjectListCreateView(generics.ListCreateAPIView):
+# Related rows shown in subject responses (module_count, college_name)
+SUBJECT_ETAG_RELATIONS = {
+    'modules': (Module, 'subject_id', 'pk'),
+    'college': (College, 'pk', 'college_id'),
+}
+
+
+class SubjectListCreateView(TenantScopedMixin, ConditionalGetMixin, CurriculumCacheMixin, ValuesListMixin, generics.ListCreateAPIView):
     serializer_class = SubjectSerializer
+    values_serializer_class = SubjectValuesSerializer
+    cache_namespace = 'subjects'
     permission_classes = [permissions.IsAuthenticated]
+    max_queries = 4
+    etag_relations = SUBJECT_ETAG_RELATIONS
+
+    def get_scoped_queryset(self):
+        return self.scope_queryset(Subject.objects.all())
 
     def get_queryset(self):
-        if self.request.user.role == 'product_owner':
-            return Subject.objects.all()
-        elif self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            return Subject.objects.filter(college=self.request.user.college_admin_profile.college)
-        return Subject.objects.none()
+        return self.get_scoped_queryset().with_module_count().select_related('college')
 
     def perform_create(self, serializer):
-        if self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            serializer.save(college=self.request.user.college_admin_profile.college)
+        self.save_for_tenant(serializer)
 
 
-class SubjectDetailView(generics.RetrieveUpdateDestroyAPIView):
+class SubjectDetailView(TenantScopedMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = SubjectSerializer
     permission_classes = [permissions.IsAuthenticated]
+    max_queries = 3
+    etag_relations = SUBJECT_ETAG_RELATIONS
+
+    def get_scoped_queryset(self):
+        return self.scope_queryset(Subject.objects.all())
 
     def get_queryset(self):
-        if self.request.user.role == 'product_owner':
-            return Subject.objects.all()
-        elif self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            return Subject.objects.filter(college=self.request.user.college_admin_profile.college)
-        return Subject.objects.none()
+        return self.get_scoped_queryset().with_module_count().select_related('college')
 
 
 # -------------------------------------------------
@@ -327,75 +483,182 @@ class SubjectDetailView(generics.RetrieveUpdateDestroyAPIView):
 # -------------------------------------------------
 
 # Module Management Views
-class ModuleListCreateView(generics.ListCreateAPIView):
+# Related rows shown in module responses (question_count, subject_name)
+MODULE_ETAG_RELATIONS = {
+    'questions': (QuestionBank, 'module_id', 'pk'),
+    'subject': (Subject, 'pk', 'subject_id'),
+}
+
+
+class ModuleListCreateView(TenantScopedMixin, ConditionalGetMixin, CurriculumCacheMixin, ValuesListMixin, generics.ListCreateAPIView):
     serializer_class = ModuleSerializer
+    values_serializer_class = ModuleValuesSerializer
+    cache_namespace = 'modules'
     permission_classes = [permissions.IsAuthenticated]
+    # Students and faculty also look up the college of the subject
+    max_queries = 5
+    etag_relations = MODULE_ETAG_RELATIONS
+    tenant_field = 'subject__college_id'
 
-    def get_queryset(self):
+    def get_scoped_queryset(self):
+        modules = Module.objects.all()
         subject_id = self.request.query_params.get('subject_id')
-        if subject_id:
-            return Module.objects.filter(subject_id=subject_id)
         
-        if self.request.user.role == 'product_owner':
-            return Module.objects.all()
-        elif self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            return Module.objects.filter(subject__college=self.request.user.college_admin_profile.college)
-        return Module.objects.none()
+        # College admins only ever see their own college's modules; other
+        # roles may list the modules of a given subject
+        if self.is_scoped_tenant():
+            modules = self.scope_queryset(modules)
+        elif not self.tenant.is_product_owner and not subject_id:
+            return Module.objects.none()
+        
+        if subject_id:
+            modules = modules.filter(subject_id=subject_id)
+        return modules
+
+    def get_queryset(self):
+        return self.get_scoped_queryset().with_question_count().select_related('subject')
+
+    def get_cache_college_id(self):
+        college_id = super().get_cache_college_id()
+        subject_id = self.request.query_params.get('subject_id', '')
+        if college_id is None and self.tenant.role in ('faculty', 'student') and subject_id.isdigit():
+            # Other roles list the modules of one subject: cache them under its college
+            college_id = Subject.objects.filter(id=subject_id).values_list('college_id', flat=True).first()
+        return college_id
 
     def perform_create(self, serializer):
-        if self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            college = self.request.user.college_admin_profile.college
+        if self.is_scoped_tenant():
             subject = serializer.validated_data.get('subject')
-            if subject.college != college:
+            if subject.college_id != self.tenant.college_id:
                 raise serializers.ValidationError("Subject must belong to your college.")
         serializer.save()
 
 
-class ModuleDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ModuleDetailView(TenantScopedMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ModuleSerializer
     permission_classes = [permissions.IsAuthenticated]
+    max_queries = 3
+    etag_relations = MODULE_ETAG_RELATIONS
+    tenant_field = 'subject__college_id'
+
+    def get_scoped_queryset(self):
+        return self.scope_queryset(Module.objects.all())
 
     def get_queryset(self):
-        if self.request.user.role == 'product_owner':
-            return Module.objects.all()
-        elif self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            return Module.objects.filter(subject__college=self.request.user.college_admin_profile.college)
-        return Module.objects.none()
+        return self.get_scoped_queryset().with_question_count().select_related('subject')
 
 
 # Question Bank Management Views
-class QuestionBankListCreateView(generics.ListCreateAPIView):
-    serializer_class = QuestionBankSerializer
+class QuestionBankListCreateView(TenantScopedMixin, SparseFieldsetMixin, CursorPaginationMixin, generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    max_queries = 3
+    tenant_roles = ('college_admin', 'faculty')
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET' and self.request.query_params.get('compact') in ('1', 'true', 'True'):
+            return QuestionBankListSerializer
+        return QuestionBankSerializer
 
     def get_queryset(self):
-        if self.request.user.role == 'product_owner':
-            return QuestionBank.objects.all()
-        elif self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            return QuestionBank.objects.filter(college=self.request.user.college_admin_profile.college)
-        elif self.request.user.role == 'faculty' and hasattr(self.request.user, 'faculty_profile'):
-            return QuestionBank.objects.filter(college=self.request.user.faculty_profile.college)
-        return QuestionBank.objects.none()
+        questions = self.narrow_queryset(
+            QuestionBank.objects.select_related('college', 'subject', 'module', 'created_by')
+        )
+        return self.scope_queryset(questions)
 
     def perform_create(self, serializer):
-        if self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            serializer.save(college=self.request.user.college_admin_profile.college, created_by=self.request.user)
-        elif self.request.user.role == 'faculty' and hasattr(self.request.user, 'faculty_profile'):
-            serializer.save(college=self.request.user.faculty_profile.college, created_by=self.request.user)
+        self.save_for_tenant(serializer, created_by=self.request.user)
 
 
-class QuestionBankDetailView(generics.RetrieveUpdateDestroyAPIView):
+class QuestionBankDetailView(TenantScopedMixin, SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = QuestionBankSerializer
     permission_classes = [permissions.IsAuthenticated]
+    max_queries = 2
+    tenant_roles = ('college_admin', 'faculty')
 
     def get_queryset(self):
-        if self.request.user.role == 'product_owner':
-            return QuestionBank.objects.all()
-        elif self.request.user.role == 'college_admin' and hasattr(self.request.user, 'college_admin_profile'):
-            return QuestionBank.objects.filter(college=self.request.user.college_admin_profile.college)
-        elif self.request.user.role == 'faculty' and hasattr(self.request.user, 'faculty_profile'):
-            return QuestionBank.objects.filter(college=self.request.user.faculty_profile.college)
-        return QuestionBank.objects.none()
+        questions = self.narrow_queryset(
+            QuestionBank.objects.select_related('college', 'subject', 'module', 'created_by')
+        )
+        return self.scope_queryset(questions)
+
+
+QUESTION_EXPORT_COLUMNS = ('id',) + QuestionImporter.template_columns + ('is_active', 'created_at')
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def export_questions(request):
+    """
+    Stream the question bank as CSV (default), NDJSON or XLSX, optionally filtered
+    by subject_id, module_id, difficulty and question_type
+    """
+    tenant = get_tenant(request)
+    if tenant.is_product_owner:
+        questions = QuestionBank.objects.all()
+    elif tenant.role in ('college_admin', 'faculty') and tenant.college_id:
+        questions = QuestionBank.objects.filter(college_id=tenant.college_id)
+    else:
+        return Response({
+            'error': 'You do not have access to the question bank'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    file_format = request.query_params.get('file_format', 'csv')
+    format_error = export_format_error(file_format)
+    if format_error:
+        return Response({
+            'error': format_error
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    param_error = _integer_param_error(request, 'subject_id', 'module_id')
+    if param_error:
+        return param_error
+    
+    for param in ('subject_id', 'module_id', 'difficulty', 'question_type'):
+        value = request.query_params.get(param)
+        if value:
+            questions = questions.filter(**{param: value})
+    
+    questions = questions.select_related('subject', 'module').only(
+        *[column for column in QUESTION_EXPORT_COLUMNS if column not in ('subject', 'module')],
+        'subject__name', 'module__name'
+    )
+    rows = (
+        [
+            question.id, question.subject.name, question.module.name if question.module else '',
+            question.question_text, question.question_type, question.difficulty,
+            question.option_a, question.option_b, question.option_c, question.option_d,
+            question.correct_answer, question.explanation, question.video_url, question.image_url,
+            question.is_active, question.created_at,
+        ]
+        for question in iterate_in_chunks(questions)
+    )
+    return export_response(QUESTION_EXPORT_COLUMNS, rows, 'questions', file_format)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def question_coverage(request):
+    """
+    Question counts per subject, module, difficulty and question type for
+    one college, including subjects and modules without questions. Product
+    owners choose the college with ?college_id=.
+    """
+    tenant = get_tenant(request)
+    if tenant.is_product_owner:
+        college_id = request.query_params.get('college_id', '')
+        if not college_id.isdigit():
+            return Response({
+                'error': 'college_id is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        college_id = int(college_id)
+    elif tenant.role in ('college_admin', 'faculty') and tenant.college_id:
+        college_id = tenant.college_id
+    else:
+        return Response({
+            'error': 'You do not have access to the question bank'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    return Response(college_coverage(college_id), status=status.HTTP_200_OK)
 
 
 # Student Registration View
@@ -466,16 +729,108 @@ def register_faculty(request):
         }, status=status.HTTP_400_BAD_REQUEST)
 
 
-# Bulk Upload Views
+# Batch Registration Views
+MAX_REGISTRATION_BATCH = DEFAULT_CHUNK_SIZE
+
+
+def _register_batch(request, serializer_class, importer_class):
+    """
+    Validate a JSON list of registrations item by item, then create all valid
+    items with ``importer_class``, which checks uniqueness for the whole batch
+    with one query per unique field and inserts in bulk. Returns one result
+    per item, in request order.
+    """
+    college = College.objects.filter(pk=get_tenant(request).college_id).first()
+    if college is None:
+        return Response({
+            'error': 'College admin profile not found'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    items = request.data
+    if not isinstance(items, list) or not items:
+        return Response({
+            'error': 'Expected a non-empty list of records'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > MAX_REGISTRATION_BATCH:
+        return Response({
+            'error': f'At most {MAX_REGISTRATION_BATCH} records can be registered per request'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    results = {}
+    valid = []
+    for index, item in enumerate(items):
+        serializer = serializer_class(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index] = {'index': index, 'status': 'failed', 'details': serializer.errors}
+    
+    if valid:
+        # Hash in a few threads: forking a process pool from a web worker is unsafe
+        hasher = PasswordHasher(workers=settings.BATCH_REGISTRATION_HASH_THREADS, threads=True)
+        importer = importer_class(college, uploaded_by=request.user, hasher=hasher)
+        result = importer.run_validated(valid)
+        for index, pk in result.created:
+            results[index] = {'index': index, 'status': 'created', 'id': pk}
+        for index, message in result.errors:
+            results[index] = {'index': index, 'status': 'failed', 'details': [str(message)]}
+    
+    results = [results[index] for index in range(len(items))]
+    created_count = sum(1 for item in results if item['status'] == 'created')
+    if created_count == len(results):
+        response_status = status.HTTP_201_CREATED
+    elif created_count:
+        response_status = status.HTTP_207_MULTI_STATUS
+    else:
+        response_status = status.HTTP_400_BAD_REQUEST
+    
+    return Response({
+        'created_count': created_count,
+        'failed_count': len(results) - created_count,
+        'results': results
+    }, status=response_status)
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
-def bulk_upload_students(request):
+def register_students_batch(request):
     """
-    Bulk upload students from CSV file
+    Register a list of students in one request (only college admins can do this)
     """
     if request.user.role != 'college_admin':
         return Response({
-            'error': 'Only college admins can bulk upload students'
+            'error': 'Only college admins can register students'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    return _register_batch(request, StudentBatchRegistrationSerializer, StudentImporter)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def register_faculty_batch(request):
+    """
+    Register a list of faculty members in one request (only college admins can do this)
+    """
+    if request.user.role != 'college_admin':
+        return Response({
+            'error': 'Only college admins can register faculty'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    return _register_batch(request, FacultyBatchRegistrationSerializer, FacultyImporter)
+
+
+# Bulk Upload Views
+def _queue_bulk_upload(request, template_type):
+    """
+    Validate an uploaded CSV file and queue it as a BulkUploadTemplate job
+    for the process_bulk_uploads command. With ?dry_run=1 the whole file is
+    validated in the request instead and every error is returned, without
+    writing anything.
+    """
+    college_id = get_tenant(request).college_id
+    if college_id is None:
+        return Response({
+            'error': 'College admin profile not found'
         }, status=status.HTTP_403_FORBIDDEN)
     
     if 'file' not in request.FILES:
@@ -489,63 +844,163 @@ def bulk_upload_students(request):
             'error': 'File must be a CSV file'
         }, status=status.HTTP_400_BAD_REQUEST)
     
+    password_mode = request.data.get('password_mode', 'password')
+    if password_mode not in dict(BulkUploadTemplate.PASSWORD_MODE_CHOICES):
+        return Response({
+            'error': 'password_mode must be "password" or "invite"'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
     try:
-        # Read CSV file
-        decoded_file = file.read().decode('utf-8')
-        csv_data = csv.DictReader(io.StringIO(decoded_file))
-        
-        college = request.user.college_admin_profile.college
-        created_students = []
-        errors = []
-        
-        with transaction.atomic():
-            for row_num, row in enumerate(csv_data, start=2):  # Start from 2 because of header
-                try:
-                    # Create user
-                    user = User.objects.create_user(
-                        username=row['username'],
-                        email=row['email'],
-                        first_name=row['first_name'],
-                        last_name=row['last_name'],
-                        password=row['password'],
-                        role='student'
-                    )
-                    
-                    # Get batch if provided
-                    batch = None
-                    if row.get('batch_id'):
-                        batch = Batch.objects.get(id=row['batch_id'], college=college)
-                    
-                    # Create student
-                    student = Student.objects.create(
-                        user=user,
-                        college=college,
-                        batch=batch,
-                        roll_no=row['roll_no'],
-                        phone_number=row.get('phone_number', ''),
-                        date_of_birth=row.get('date_of_birth'),
-                        address=row.get('address', ''),
-                        emergency_contact=row.get('emergency_contact', ''),
-                        emergency_contact_name=row.get('emergency_contact_name', ''),
-                        admission_date=row.get('admission_date')
-                    )
-                    
-                    created_students.append(StudentSerializer(student).data)
-                    
-                except Exception as e:
-                    errors.append(f"Row {row_num}: {str(e)}")
-        
+        header = read_csv_header(file)
+    except UnicodeDecodeError:
         return Response({
-            'message': f'Successfully created {len(created_students)} students',
-            'created_students': created_students,
-            'errors': errors
-        }, status=status.HTTP_201_CREATED)
-        
-    except Exception as e:
+            'error': 'Could not decode the CSV file'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    required_columns = IMPORTERS[template_type].get_required_columns(password_mode=password_mode)
+    missing = [column for column in required_columns if column not in header]
+    if missing:
         return Response({
-            'error': 'Bulk upload failed',
-            'details': str(e)
+            'error': 'CSV file is missing required columns',
+            'details': missing
         }, status=status.HTTP_400_BAD_REQUEST)
+    
+    job = BulkUploadTemplate(
+        template_type=template_type,
+        college_id=college_id,
+        uploaded_by=request.user,
+        file_path=file,
+        password_mode=password_mode,
+    )
+    
+    if request.query_params.get('dry_run') in ('1', 'true', 'True'):
+        try:
+            encoding, _ = scan_csv(file)
+        except UnsupportedEncoding as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        importer = IMPORTERS[template_type].from_job(job)
+        result = importer.run(iter_csv_rows(file, encoding), dry_run=True)
+        return Response({
+            'dry_run': True,
+            'total_rows': result.total_rows,
+            'valid_rows': result.total_rows - result.failed_count,
+            'failed_rows': result.failed_count,
+            'errors': result.error_messages
+        }, status=status.HTTP_200_OK)
+    
+    job.save()
+    
+    return Response({
+        'message': 'Upload received and queued for processing',
+        'job_id': job.id,
+        'status': job.status,
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+def _csv_template_response(template_type):
+    response = HttpResponse(content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{template_type}_template.csv"'
+    
+    writer = csv.writer(response)
+    writer.writerow(IMPORTERS[template_type].template_columns)
+    
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_upload_students(request):
+    """
+    Bulk upload students from CSV file. The file is queued as a
+    BulkUploadTemplate job and processed by the process_bulk_uploads command.
+    """
+    if request.user.role != 'college_admin':
+        return Response({
+            'error': 'Only college admins can bulk upload students'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    return _queue_bulk_upload(request, 'student')
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_upload_faculty(request):
+    """
+    Bulk upload faculty from CSV file
+    """
+    if request.user.role != 'college_admin':
+        return Response({
+            'error': 'Only college admins can bulk upload faculty'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    return _queue_bulk_upload(request, 'faculty')
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_upload_questions(request):
+    """
+    Bulk upload question bank entries from CSV file
+    """
+    if request.user.role != 'college_admin':
+        return Response({
+            'error': 'Only college admins can bulk upload questions'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    return _queue_bulk_upload(request, 'question')
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_upload_status(request, pk):
+    """
+    Get progress of a bulk upload job
+    """
+    if request.user.role != 'college_admin':
+        return Response({
+            'error': 'Only college admins can view bulk uploads'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        job = BulkUploadTemplate.objects.select_related('college').get(
+            id=pk, college_id=get_tenant(request).college_id
+        )
+    except BulkUploadTemplate.DoesNotExist:
+        return Response({
+            'error': 'Bulk upload not found'
+        }, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response(BulkUploadTemplateSerializer(job).data, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_upload_report(request, pk):
+    """
+    Download the per-row report of a finished bulk upload job as CSV:
+    the id created for each row, or the reason it failed
+    """
+    if request.user.role != 'college_admin':
+        return Response({
+            'error': 'Only college admins can view bulk uploads'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    job = BulkUploadTemplate.objects.filter(
+        id=pk, college_id=get_tenant(request).college_id
+    ).only('id', 'report_file').first()
+    if job is None or not job.report_file:
+        return Response({
+            'error': 'Report not available'
+        }, status=status.HTTP_404_NOT_FOUND)
+    
+    return FileResponse(
+        job.report_file.open('rb'),
+        as_attachment=True,
+        filename=f'upload_{job.id}_report.csv',
+        content_type='text/csv'
+    )
 
 
 @api_view(['GET'])
@@ -559,20 +1014,121 @@ def download_student_template(request):
             'error': 'Only college admins can download templates'
         }, status=status.HTTP_403_FORBIDDEN)
     
+    return _csv_template_response('student')
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def download_faculty_template(request):
+    """
+    Download CSV template for faculty bulk upload
+    """
+    if request.user.role != 'college_admin':
+        return Response({
+            'error': 'Only college admins can download templates'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    return _csv_template_response('faculty')
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def download_question_template(request):
+    """
+    Download CSV template for question bank bulk upload
+    """
+    if request.user.role != 'college_admin':
+        return Response({
+            'error': 'Only college admins can download templates'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    return _csv_template_response('question')
+
+
+ACTIVATION_PAGE_SIZE = 2000
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def download_pending_activations(request):
+    """
+    Download a CSV of invited students and faculty who have not activated
+    their account yet. Only hashes of activation tokens are stored, so each
+    token is issued by the download that first lists it and appears in that
+    download only; ?reissue=1 issues new tokens for every pending account,
+    invalidating the old ones.
+    """
+    if request.user.role != 'college_admin':
+        return Response({
+            'error': 'Only college admins can download activation tokens'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    college_id = get_tenant(request).college_id
+    reissue = request.query_params.get('reissue') in ('1', 'true', 'True')
+    tokens = ActivationToken.objects.filter(
+        Q(user__student_profile__college_id=college_id) | Q(user__faculty_profile__college_id=college_id),
+        used_at__isnull=True,
+    ).values_list(
+        'id', 'token_hash', 'issued_at', 'user__username', 'user__email', 'user__role',
+        'user__student_profile__roll_no'
+    ).order_by('id')
+    
     response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="student_template.csv"'
+    response['Content-Disposition'] = 'attachment; filename="pending_activations.csv"'
     
     writer = csv.writer(response)
-    writer.writerow([
-        'username', 'email', 'first_name', 'last_name', 'password', 
-        'roll_no', 'phone_number', 'date_of_birth', 'address', 
-        'emergency_contact', 'emergency_contact_name', 'admission_date', 'batch_id'
-    ])
+    writer.writerow(['username', 'email', 'role', 'roll_no', 'activation_token', 'issued_at'])
+    last_id = 0
+    while True:
+        page = list(tokens.filter(id__gt=last_id)[:ACTIVATION_PAGE_SIZE])
+        if not page:
+            break
+        last_id = page[-1][0]
+        
+        now = timezone.now()
+        issued = {
+            token_id: generate_activation_token()
+            for token_id, token_hash, *_ in page if reissue or token_hash is None
+        }
+        ActivationToken.objects.bulk_update([
+            ActivationToken(id=token_id, token_hash=hash_activation_token(token), issued_at=now)
+            for token_id, token in issued.items()
+        ], ['token_hash', 'issued_at'])
+        
+        for token_id, _, issued_at, *user in page:
+            if token_id in issued:
+                writer.writerow(user + [issued[token_id], now])
+            else:
+                writer.writerow(user + ['', issued_at])
     
     return response
 
 
+@api_view(['POST'])
+@permission_classes([permissions.AllowAny])
+def activate_account(request):
+    """
+    Set the password of an invited account using its one-time activation token
+    """
+    serializer = AccountActivationSerializer(data=request.data)
+    if serializer.is_valid():
+        user = serializer.save()
+        return Response({
+            'message': 'Account activated successfully',
+            'username': user.username
+        }, status=status.HTTP_200_OK)
+    else:
+        return Response({
+            'error': 'Invalid data',
+            'details': serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+
 # Analytics Views
+# Dashboard payloads, recomputed by one worker at a time (see accounts/stampede.py)
+ANALYTICS_CACHE = SingleFlightCache('analytics', timeout=lambda: settings.ANALYTICS_CACHE_TIMEOUT)
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def college_analytics(request):
@@ -584,16 +1140,202 @@ def college_analytics(request):
             'error': 'Only college admins can access analytics'
         }, status=status.HTTP_403_FORBIDDEN)
     
-    college = request.user.college_admin_profile.college
+    college_id = get_tenant(request).college_id
+    
+    def compute():
+        analytics = college_counters(college_id)
+        analytics['questions_by_subject'] = question_breakdown(college_id)
+        return analytics
+    
+    analytics = ANALYTICS_CACHE.get_or_compute(f'college:{college_id}', compute)
+    
+    return Response(analytics, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def all_colleges_analytics(request):
+    """
+    Get the college dashboard analytics of every college at once (only
+    product owners can do this)
+    """
+    if request.user.role != 'product_owner':
+        return Response({
+            'error': 'Only product owners can access analytics for all colleges'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    def compute():
+        colleges = list(College.objects.order_by('name').values_list('id', 'name'))
+        metrics = counters_by_college([college_id for college_id, _ in colleges])
+        return [
+            {'college': college_id, 'college_name': name, **metrics[college_id]}
+            for college_id, name in colleges
+        ]
     
-    analytics = {
-        'total_students': Student.objects.filter(college=college).count(),
-        'total_faculty': Faculty.objects.filter(college=college).count(),
-        'total_batches': Batch.objects.filter(college=college).count(),
-        'total_subjects': Subject.objects.filter(college=college).count(),
-        'total_questions': QuestionBank.objects.filter(college=college).count(),
-        'active_students': Student.objects.filter(college=college, is_active=True).count(),
-        'active_faculty': Faculty.objects.filter(college=college, status='active').count(),
-    }
+    return Response(ANALYTICS_CACHE.get_or_compute('all-colleges', compute), status=status.HTTP_200_OK)
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([permissions.IsAuthenticated])
+def analytics_cache_stats(request):
+    """
+    Hit, miss and recompute-time counters of the analytics cache (only
+    product owners can see them); DELETE resets them
+    """
+    if request.user.role != 'product_owner':
+        return Response({
+            'error': 'Only product owners can view cache statistics'
+        }, status=status.HTTP_403_FORBIDDEN)
     
-    return Response(analytics, status=status.HTTP_200_OK)
\ No newline at end of file
+    if request.method == 'DELETE':
+        ANALYTICS_CACHE.reset_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    return Response(ANALYTICS_CACHE.stats(), status=status.HTTP_200_OK)
+
+
+# Trend Views (served from the daily rollups, see accounts/rollups.py)
+TREND_DEFAULT_DAYS = 365
+
+
+def _trend_filters(request, default_interval):
+    """
+    Resolve the college scope, date range and interval of a trend request.
+    Returns ``(filters, interval, None)``, or ``(None, None, error response)``.
+    """
+    tenant = get_tenant(request)
+    params = request.query_params
+    if tenant.is_product_owner:
+        filters = {}
+        if params.get('college_id'):
+            if not params['college_id'].isdigit():
+                return None, None, Response({
+                    'error': 'college_id must be an integer'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            filters['college_id'] = int(params['college_id'])
+    elif tenant.role == 'college_admin' and tenant.college_id:
+        filters = {'college_id': tenant.college_id}
+    else:
+        return None, None, Response({
+            'error': 'Only college admins can access analytics'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        end = datetime.date.fromisoformat(params['end']) if params.get('end') else timezone.localdate()
+        start = (
+            datetime.date.fromisoformat(params['start']) if params.get('start')
+            else end - datetime.timedelta(days=TREND_DEFAULT_DAYS)
+        )
+    except ValueError:
+        return None, None, Response({
+            'error': 'start and end must be dates in YYYY-MM-DD format'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    if start > end:
+        return None, None, Response({
+            'error': 'start must not be after end'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    interval = params.get('interval', default_interval)
+    if interval not in INTERVALS:
+        return None, None, Response({
+            'error': f'interval must be one of: {", ".join(INTERVALS)}'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    filters.update(day__gte=start, day__lte=end)
+    return filters, interval, None
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def admissions_trend(request):
+    """
+    Students admitted per month (or ?interval=day/week) and batch between
+    ?start= and ?end=, optionally for one batch_id
+    """
+    filters, interval, error = _trend_filters(request, 'month')
+    if error:
+        return error
+    
+    param_error = _integer_param_error(request, 'batch_id')
+    if param_error:
+        return param_error
+    
+    if request.query_params.get('batch_id'):
+        filters['batch_id'] = request.query_params['batch_id']
+    rows = series(AdmissionRollup.objects.filter(**filters), interval, 'batch_id', 'batch__name')
+    
+    return Response({
+        'interval': interval,
+        'results': [
+            {
+                'period': row['period'], 'batch': row['batch_id'], 'batch_name': row['batch__name'],
+                'count': row['count']
+            }
+            for row in rows
+        ]
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def questions_trend(request):
+    """
+    Questions created per week (or ?interval=day/month), subject and
+    difficulty between ?start= and ?end=, optionally filtered by subject_id
+    and difficulty
+    """
+    filters, interval, error = _trend_filters(request, 'week')
+    if error:
+        return error
+    
+    param_error = _integer_param_error(request, 'subject_id')
+    if param_error:
+        return param_error
+    
+    for param in ('subject_id', 'difficulty'):
+        value = request.query_params.get(param)
+        if value:
+            filters[param] = value
+    rows = series(
+        QuestionRollup.objects.filter(**filters), interval, 'subject_id', 'subject__name', 'difficulty'
+    )
+    
+    return Response({
+        'interval': interval,
+        'results': [
+            {
+                'period': row['period'], 'subject': row['subject_id'], 'subject_name': row['subject__name'],
+                'difficulty': row['difficulty'], 'count': row['count']
+            }
+            for row in rows
+        ]
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def question_authors_trend(request):
+    """
+    Questions created per month (or ?interval=day/week) and author between
+    ?start= and ?end=
+    """
+    filters, interval, error = _trend_filters(request, 'month')
+    if error:
+        return error
+    
+    rows = series(
+        QuestionRollup.objects.filter(**filters), interval,
+        'created_by_id', 'created_by__first_name', 'created_by__last_name'
+    )
+    
+    return Response({
+        'interval': interval,
+        'results': [
+            {
+                'period': row['period'], 'created_by': row['created_by_id'],
+                'author_name': f"{row['created_by__first_name'] or ''} {row['created_by__last_name'] or ''}".strip(),
+                'count': row['count']
+            }
+            for row in rows
+        ]
+    }, status=status.HTTP_200_OK)
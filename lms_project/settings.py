@@ -127,6 +127,10 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Uploaded files (bulk upload CSVs)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -152,7 +156,13 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        # Uses orjson when installed, else identical to rest_framework.renderers.JSONRenderer
+        'accounts.renderers.FastJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'accounts.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
@@ -166,3 +176,15 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
 }
+
+# Bulk import settings
+BULK_IMPORT_HASH_WORKERS = None  # processes used to hash passwords; None uses every core
+BATCH_REGISTRATION_HASH_THREADS = 4  # threads used to hash passwords inside batch registration requests
+ACTIVATION_TOKEN_LIFETIME = timedelta(days=30)
+BULK_UPLOAD_STALE_AFTER = timedelta(minutes=15)  # requeue processing jobs without progress for this long
+
+# Cache of the per-college subject and module lists (uses the default cache)
+CURRICULUM_CACHE_TIMEOUT = 60 * 60  # seconds
+
+# Analytics dashboard payloads, refreshed by one worker at a time (accounts.stampede)
+ANALYTICS_CACHE_TIMEOUT = 60  # seconds